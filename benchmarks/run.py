@@ -0,0 +1,254 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from linphonelib.capture import RECV, read_capture, replay
+from linphonelib.client import LinphoneClient
+from linphonelib.commands import (
+    CallStatusCommand,
+    RegisterCommand,
+    RegisterStatusesCommand,
+)
+from linphonelib.fake_daemon import FakeDaemon, FakeLinphoneServer
+from linphonelib.parser import StreamParser, parse_buffer
+from linphonelib.server import LinphoneProcessServer
+from linphonelib.session import _LinphoneWrapper
+
+SIZE_KEYS = ('count', 'bytes', 'messages')
+BACKENDS = {
+    'fake': FakeLinphoneServer,
+    'process': LinphoneProcessServer,
+    'docker': None,
+}
+STATUS_MESSAGE = (
+    b'Status: Ok\n\nState: LinphoneCallStreamsRunning\nFrom: sip:1001@host\n'
+)
+EVENT_MESSAGE = (
+    b'Event-type: call-state-changed\nEvent: LinphoneCallStreamsRunning\n'
+    b'From: sip:1001@host\nId: 1\n'
+)
+
+
+def bench_parser(messages, repeat):
+    buf = b''.join(
+        EVENT_MESSAGE if i % 4 == 3 else STATUS_MESSAGE for i in range(messages)
+    )
+    chunks = [buf[i : i + 4096] for i in range(0, len(buf), 4096)]
+
+    def count(*args):
+        pass
+
+    def parse_whole():
+        parse_buffer(buf, count)
+
+    def parse_chunks():
+        parser = StreamParser(count, count)
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.flush()
+
+    results = {}
+    for name, parse in (('buffer', parse_whole), ('stream', parse_chunks)):
+        duration = min(_timed(parse) for _ in range(repeat))
+        results[name] = {
+            'bytes': len(buf),
+            'messages': messages,
+            'mb_per_s': len(buf) / duration / 1e6,
+            'msgs_per_s': messages / duration,
+        }
+    return results
+
+
+def bench_capture(path, repeat):
+    chunks = list(read_capture(path))
+    received = [chunk.data for chunk in chunks if chunk.direction == RECV]
+    size = sum(len(data) for data in received)
+
+    def count(*args):
+        pass
+
+    def parse():
+        parser = StreamParser(count, count)
+        for data in received:
+            parser.feed(data)
+        parser.flush()
+
+    def handle():
+        for _ in replay(chunks):
+            pass
+
+    return {
+        'bytes': size,
+        'parse_mb_per_s': size / min(_timed(parse) for _ in range(repeat)) / 1e6,
+        'replay_mb_per_s': size / min(_timed(handle) for _ in range(repeat)) / 1e6,
+    }
+
+
+def bench_roundtrip(count, latency):
+    results = {}
+    tmp_dir = tempfile.mkdtemp()
+    socket_file = os.path.join(tmp_dir, 'socket')
+    try:
+        with FakeDaemon(socket_file, latency=latency) as daemon:
+            daemon.incoming_call('sip:1001@host')
+            client = LinphoneClient(socket_file)
+            client.connect()
+            try:
+                for i in range(4):
+                    RegisterCommand(f'user{i}', 'secret', 'host').execute(client)
+                for name, cmd in (
+                    ('call_status', CallStatusCommand()),
+                    ('register_statuses', RegisterStatusesCommand()),
+                ):
+                    results[f'client_{name}'] = _latencies(
+                        lambda: cmd.execute(client), count
+                    )
+            finally:
+                client.disconnect()
+
+        for persistent in (True, False):
+            wrapper = _LinphoneWrapper(
+                5060,
+                7078,
+                persistent=persistent,
+                server_factory=FakeLinphoneServer,
+            )
+            try:
+                wrapper.start()
+                name = 'persistent' if persistent else 'once'
+                results[f'wrapper_{name}'] = _latencies(
+                    lambda: wrapper.execute(CallStatusCommand()), count
+                )
+            finally:
+                wrapper.stop_and_clean()
+    finally:
+        shutil.rmtree(tmp_dir)
+    return results
+
+
+def bench_session(backends, count):
+    results = {}
+    for backend in backends:
+        starts, stops = [], []
+        for _ in range(count):
+            wrapper = _LinphoneWrapper(5060, 7078, server_factory=BACKENDS[backend])
+            try:
+                starts.append(_timed(wrapper.start))
+            finally:
+                stops.append(_timed(wrapper.stop_and_clean))
+        results[backend] = {
+            'start': _summarize(starts),
+            'stop': _summarize(stops),
+        }
+    return results
+
+
+def compare(results, baseline, prefix=''):
+    # Print the relative change of every metric present in both runs
+    for key, value in results.items():
+        if key not in baseline or key in SIZE_KEYS:
+            continue
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            compare(value, baseline[key], f'{name}.')
+        elif isinstance(value, (int, float)) and baseline[key]:
+            change = (value - baseline[key]) / baseline[key] * 100
+            print(f'{name}: {baseline[key]:.6g} -> {value:.6g} ({change:+.1f}%)')
+
+
+def _timed(f):
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+
+def _latencies(f, count):
+    f()  # warm up the connection
+    return _summarize([_timed(f) for _ in range(count)])
+
+
+def _summarize(samples):
+    samples = sorted(samples)
+
+    def percentile(p):
+        return samples[min(len(samples) - 1, int(p / 100 * len(samples)))]
+
+    return {
+        'count': len(samples),
+        'mean': sum(samples) / len(samples),
+        'min': samples[0],
+        'p50': percentile(50),
+        'p90': percentile(90),
+        'p99': percentile(99),
+        'max': samples[-1],
+    }
+
+
+def _metadata():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pylinphonelib')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with the results of this JSON file')
+    parser.add_argument('--capture', help='also measure the replay of this capture')
+    parser.add_argument('--messages', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--commands', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0)
+    parser.add_argument('--sessions', type=int, default=10)
+    parser.add_argument(
+        '--backend',
+        action='append',
+        choices=sorted(BACKENDS),
+        help='session backend to measure, may be repeated (default: fake)',
+    )
+    args = parser.parse_args()
+
+    results = {
+        'parser': bench_parser(args.messages, args.repeat),
+        'roundtrip': bench_roundtrip(args.commands, args.latency),
+        'session': bench_session(args.backend or ['fake'], args.sessions),
+    }
+    if args.capture:
+        results['capture'] = bench_capture(args.capture, args.repeat)
+    report = {'metadata': _metadata(), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f)['results'])
+
+
+if __name__ == '__main__':
+    main()
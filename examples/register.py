@@ -1,4 +1,4 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import sys
@@ -8,17 +8,18 @@ from linphonelib import Session, registering
 
 def usage():
     print('Usage:')
-    print('    python register.py name secret hostname port')
+    print('    python register.py name secret hostname [sip_port rtp_port]')
 
 
-def run(uname, secret, hostname, port):
-    with registering(Session(uname, secret, hostname, port)) as s:
+def run(uname, secret, hostname, sip_port=None, rtp_port=None):
+    # Free ports are allocated when none are given
+    with registering(Session(uname, secret, hostname, sip_port, rtp_port)) as s:
         print('registered', s)
         s.call('1001')
 
 
 def main():
-    if len(sys.argv) != 5:
+    if len(sys.argv) not in (4, 6):
         usage()
         return
     run(*sys.argv[1:])
@@ -1,19 +1,27 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from linphonelib.aio import AsyncSession, async_registering
 from linphonelib.exceptions import (
     CommandTimeoutException,
     ExtensionNotFoundException,
     LinphoneException,
     NoActiveCallException,
 )
+from linphonelib.fleet import Fleet, bulk_registering
+from linphonelib.reactor import Reactor
 from linphonelib.session import Session, registering
 
 __all__ = [
+    'AsyncSession',
     'CommandTimeoutException',
     'ExtensionNotFoundException',
     'LinphoneException',
+    'Fleet',
     'NoActiveCallException',
+    'Reactor',
     'Session',
+    'async_registering',
+    'bulk_registering',
     'registering',
 ]
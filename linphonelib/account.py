@@ -0,0 +1,44 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from linphonelib.commands import (
+    RegisterCommand,
+    RegisterStatusCommand,
+    UnregisterCommand,
+)
+from linphonelib.exceptions import LinphoneException
+
+
+class Account:
+    """A SIP identity registered on the linphone-daemon of a session.
+
+    Many accounts can share the daemon of a single session. The daemon
+    identifies each of them with the proxy ID returned by `register`.
+    """
+
+    def __init__(self, linphone_wrapper, uname, secret, hostname):
+        self._linphone_wrapper = linphone_wrapper
+        self._uname = uname
+        self._secret = secret
+        self._hostname = hostname
+        self.proxy_id = None
+
+    def __str__(self):
+        return 'Account %(_uname)s@%(_hostname)s' % self.__dict__
+
+    def register(self):
+        cmd = RegisterCommand(self._uname, self._secret, self._hostname)
+        self.proxy_id = self._linphone_wrapper.execute(cmd)
+        return self.proxy_id
+
+    def register_status(self):
+        return self._linphone_wrapper.execute(RegisterStatusCommand(self._proxy()))
+
+    def unregister(self):
+        self._linphone_wrapper.execute(UnregisterCommand(self._proxy()))
+        self.proxy_id = None
+
+    def _proxy(self):
+        if self.proxy_id is None:
+            raise LinphoneException(f'{self} is not registered')
+        return self.proxy_id
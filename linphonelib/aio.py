@@ -0,0 +1,545 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from functools import wraps
+
+from linphonelib.calls import CallRegistry, call_id_of
+from linphonelib.client import (
+    DEFAULT_SETTLE_TIME,
+    DEFAULT_TIMEOUT,
+    BaseLinphoneClient,
+    has_pending_data,
+)
+from linphonelib.commands import (
+    AnswerCommand,
+    CallStatsCommand,
+    CallStatus,
+    CallStatusCommand,
+    DTMFCommand,
+    HangupCommand,
+    IsRingingShowingCommand,
+    IsTalkingToCommand,
+    QuitCommand,
+    RegisterCommand,
+    RegisterStatusCommand,
+    ResumeCommand,
+    TransferCommand,
+    UnregisterCommand,
+)
+from linphonelib.events import DEFAULT_BUFFER_SIZE
+from linphonelib.exceptions import (
+    CommandTimeoutException,
+    LinphoneConnectionError,
+    LinphoneException,
+    NoActiveCallException,
+)
+from linphonelib.server import DEFAULT_LIVENESS_TTL
+from linphonelib.session import (
+    DEFAULT_WAIT_TIMEOUT,
+    _call_status_matcher,
+    _LinphoneWrapper,
+    _port_allocator_for,
+    _registration_matcher,
+    _SessionCallCommand,
+    _SessionHoldCommand,
+)
+from linphonelib.tracing import CONNECT, LIVENESS, NULL_TRACE
+
+
+class AsyncLinphoneClient(BaseLinphoneClient):
+    def __init__(
+        self,
+        filename,
+        logfile=None,
+        events=None,
+        timeout=DEFAULT_TIMEOUT,
+        capture=None,
+        settle_time=DEFAULT_SETTLE_TIME,
+    ):
+        super().__init__(filename, logfile, events, capture, settle_time)
+        self._timeout = timeout
+        self._reader = None
+        self._writer = None
+
+    async def connect(self):
+        if self._writer is None:
+            self._log_write(f'Connecting Linphone client to {self._filename}')
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(
+                    self._filename
+                )
+            except OSError as e:
+                raise LinphoneConnectionError(e)
+
+    async def disconnect(self):
+        if self._writer is not None:
+            self._log_write('Disconnecting Linphone client')
+            writer, self._reader, self._writer = self._writer, None, None
+            self._parser.reset()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def parse_next_status_message(self):
+        await self._wait_status_message()
+        return self._pop_message()
+
+    async def parse_next_status_messages(self):
+        await self._wait_status_message()
+        return self._pop_messages()
+
+    async def read_events(self, timeout):
+        try:
+            await self._feed_parser(timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def send_data(self, data):
+        try:
+            self._writer.write(self._encode(data))
+            await self._writer.drain()
+        except OSError as e:
+            raise LinphoneConnectionError(e)
+
+    async def _wait_status_message(self):
+        try:
+            while not self._status_queue:
+                await self._feed_parser(self._timeout)
+        except asyncio.TimeoutError:
+            raise LinphoneConnectionError('timed out')
+
+    async def _feed_parser(self, timeout):
+        try:
+            data = await asyncio.wait_for(self._recv_data(), timeout)
+        except (asyncio.TimeoutError, LinphoneConnectionError):
+            if not self.flush_incomplete():
+                raise
+            return
+        while True:
+            wait = self._handle_data(data)
+            if wait is None or self._is_pending(len(data)):
+                return
+            if not wait:
+                break
+            # Wait for the next fragment without blocking the loop
+            try:
+                data = await asyncio.wait_for(self._recv_data(), wait)
+            except (asyncio.TimeoutError, LinphoneConnectionError):
+                break
+        self._parser.flush()
+
+    def _is_pending(self, size):
+        # A full read leaves data in the reader buffer, otherwise it may still be
+        # in the socket
+        sock = self._writer.get_extra_info('socket')
+        return size == self._BUFSIZE or has_pending_data(sock)
+
+    async def _recv_data(self):
+        try:
+            data = await self._reader.read(self._BUFSIZE)
+            self._log_write(f'Received data: {data}')
+        except OSError as e:
+            raise LinphoneConnectionError(e)
+        if not data:
+            raise LinphoneConnectionError('Connection closed from remote')
+        return data
+
+
+def _execute(f):
+    @wraps(f)
+    async def func(self, *args, **kwargs):
+        return await self._linphone_wrapper.execute(f(self, *args, **kwargs))
+
+    return func
+
+
+class AsyncSession:
+    def __init__(
+        self,
+        uname,
+        secret,
+        hostname,
+        local_sip_port=None,
+        local_rtp_port=None,
+        logfile=None,
+        persistent=False,
+        liveness_ttl=DEFAULT_LIVENESS_TTL,
+        event_buffer_size=DEFAULT_BUFFER_SIZE,
+        tracer=None,
+        capture=None,
+        server_factory=None,
+        settle_time=DEFAULT_SETTLE_TIME,
+        port_allocator=None,
+    ):
+        self._uname = uname
+        self._secret = secret
+        self._hostname = hostname
+        self._linphone_wrapper = _AsyncLinphoneWrapper(
+            local_sip_port,
+            local_rtp_port,
+            logfile,
+            persistent=persistent,
+            liveness_ttl=liveness_ttl,
+            event_buffer_size=event_buffer_size,
+            tracer=tracer,
+            capture=capture,
+            server_factory=server_factory,
+            settle_time=settle_time,
+            port_allocator=_port_allocator_for(
+                local_sip_port, local_rtp_port, port_allocator
+            ),
+        )
+        self.calls = CallRegistry()
+        self.events.subscribe(self.calls.on_event)
+        self._call_id = None
+
+    def __str__(self):
+        return 'AsyncSession %(_uname)s@%(_hostname)s' % self.__dict__
+
+    @property
+    def liveness(self):
+        return self._linphone_wrapper.liveness
+
+    @property
+    def events(self):
+        return self._linphone_wrapper.events
+
+    @property
+    def tracer(self):
+        return self._linphone_wrapper.tracer
+
+    def latencies(self):
+        return self._linphone_wrapper.tracer.summary()
+
+    async def read_events(self, timeout):
+        return await self._linphone_wrapper.read_events(timeout)
+
+    async def close(self):
+        self.events.unsubscribe(self.calls.on_event)
+        await self._linphone_wrapper.stop_and_clean()
+
+    @_execute
+    def answer(self, call=None):
+        return AnswerCommand(call_id_of(call))
+
+    @_execute
+    def call(self, exten):
+        return _SessionCallCommand(self, exten)
+
+    @_execute
+    def send_dtmf(self, digit):
+        return DTMFCommand(digit)
+
+    @_execute
+    def hangup(self, call=None):
+        return HangupCommand(call_id_of(call))
+
+    async def hold(self, call=None):
+        call_id = call_id_of(call)
+        if call_id is None:
+            if self._linphone_wrapper.tracks_events:
+                current = self.calls.current()
+                call_id = current.call_id if current else None
+            else:
+                # The calls may have changed unseen between commands
+                call_id = (await self.call_stats()).call_id
+        cmd = _SessionHoldCommand(self, call_id)
+        return await self._linphone_wrapper.execute(cmd)
+
+    @_execute
+    def call_status(self):
+        return CallStatusCommand()
+
+    @_execute
+    def call_stats(self, call=None):
+        return CallStatsCommand(call_id_of(call))
+
+    @_execute
+    def register(self):
+        return RegisterCommand(self._uname, self._secret, self._hostname)
+
+    @_execute
+    def register_status(self):
+        return RegisterStatusCommand()
+
+    @_execute
+    def resume(self, call=None):
+        id_to_resume = self._call_id if call is None else call_id_of(call)
+        self._call_id = None
+        return ResumeCommand(id_to_resume)
+
+    @_execute
+    def is_talking_to(self, caller_id):
+        return IsTalkingToCommand(caller_id)
+
+    @_execute
+    def is_ringing_showing(self, caller_id):
+        return IsRingingShowingCommand(caller_id)
+
+    @_execute
+    def transfer(self, exten):
+        return TransferCommand(exten)
+
+    @_execute
+    def unregister(self):
+        return UnregisterCommand()
+
+    async def wait_for_call_status(
+        self, status, caller_id=None, timeout=DEFAULT_WAIT_TIMEOUT
+    ):
+        async def check():
+            cmd = CallStatusCommand(caller_id)
+            if await self._linphone_wrapper.execute(cmd) == status:
+                return status
+
+        return await self._wait_for(
+            check, _call_status_matcher(status, caller_id), timeout
+        )
+
+    async def wait_for_ringing(self, caller_id=None, timeout=DEFAULT_WAIT_TIMEOUT):
+        return await self.wait_for_call_status(CallStatus.RINGING, caller_id, timeout)
+
+    async def wait_for_answered(self, caller_id=None, timeout=DEFAULT_WAIT_TIMEOUT):
+        return await self.wait_for_call_status(CallStatus.ANSWERED, caller_id, timeout)
+
+    async def wait_for_hangup(self, timeout=DEFAULT_WAIT_TIMEOUT):
+        return await self.wait_for_call_status(CallStatus.OFF, timeout=timeout)
+
+    async def wait_for_registration(self, timeout=DEFAULT_WAIT_TIMEOUT):
+        return await self._wait_for(
+            self.register_status, _registration_matcher, timeout
+        )
+
+    async def _wait_for(self, check, match, timeout):
+        deadline = time.monotonic() + timeout
+        results = []
+
+        def on_event(event):
+            result = match(event)
+            if result is not None:
+                results.append(result)
+
+        self.events.subscribe(on_event)
+        try:
+            async with self._linphone_wrapper.holding_connection():
+                result = await check()
+                if result is not None:
+                    return result
+                while not results:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise CommandTimeoutException(
+                            f'No matching state after {timeout}s'
+                        )
+                    await self.read_events(remaining)
+                return results[0]
+        finally:
+            self.events.unsubscribe(on_event)
+
+
+class _AsyncLinphoneWrapper(_LinphoneWrapper):
+    _client_class = AsyncLinphoneClient
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Coroutines of a session share one connection: one reads it at a time.
+        # Created in the loop running the session
+        self._async_lock = None
+        self._reading = None
+
+    def _command_lock(self):
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        return self._async_lock
+
+    @asynccontextmanager
+    async def _locked(self):
+        # A command does not wait for the events being read: the read is
+        # cancelled, the data received stays buffered for the command
+        if self._reading is not None:
+            self._reading.cancel()
+        async with self._command_lock():
+            yield
+
+    async def start(self):
+        async with self._locked():
+            await self._ensure_started()
+
+    async def stop_and_clean(self):
+        if not self._configured:
+            return
+
+        if await self.send_quit():
+            self._log_write('Stopping Linphone container...')
+            await asyncio.to_thread(self._wait_until_server_stopped)
+
+        await self.release()
+        await asyncio.to_thread(self._remove_files)
+
+    async def send_quit(self):
+        if not self._configured or not await self._is_running():
+            return False
+        try:
+            await self.execute(QuitCommand())
+        except LinphoneException as e:
+            self._log_write(str(e))
+        return True
+
+    async def wait_until_stopped(self, timeout):
+        if not self._configured:
+            return True
+        return await asyncio.to_thread(self._server.wait_until_stopped, timeout)
+
+    async def release(self):
+        if not self._configured:
+            return None
+        async with self._locked():
+            await self._client.disconnect()
+        self._release_ports()
+        return self._mount_path
+
+    async def reset(self):
+        for _ in range(self._MAX_CALLS_TO_RESET):
+            try:
+                await self.execute(HangupCommand())
+            except NoActiveCallException:
+                break
+        await self.execute(UnregisterCommand())
+        self._client.clear_status_messages()
+        self.events.clear()
+
+    def submit(self, cmd, timeout=None):
+        """Return a task of the result of a command, in the running loop."""
+        return asyncio.ensure_future(self._execute_until(cmd, timeout))
+
+    async def _execute_until(self, cmd, timeout):
+        try:
+            return await asyncio.wait_for(self.execute(cmd), timeout)
+        except asyncio.TimeoutError:
+            # The response may still arrive later, do not mix it with the next command
+            async with self._locked():
+                await self._client.disconnect()
+            raise CommandTimeoutException(f'{cmd.__class__.__name__}: timed out')
+
+    async def _is_running(self):
+        # Only fork the docker check in a thread when the liveness is unknown
+        if self._server.liveness.is_alive():
+            return True
+        return await asyncio.to_thread(self._server.check_running)
+
+    async def _ensure_started(self):
+        if not self._configured:
+            self._configure()
+        if not await self._is_running():
+            await asyncio.to_thread(self._start_server)
+
+    async def execute(self, cmd):
+        async with self._locked():
+            trace = self.tracer.trace(cmd)
+            await self._ensure_started()
+            trace.mark(LIVENESS)
+
+            self._client.trace = trace
+            try:
+                if self._persistent:
+                    return await self._execute_persistent(cmd, trace)
+                return await self._execute_once(cmd, trace)
+            except (LinphoneConnectionError, CommandTimeoutException):
+                self._server.invalidate_liveness()
+                raise
+            finally:
+                self._client.trace = NULL_TRACE
+
+    @asynccontextmanager
+    async def holding_connection(self):
+        if self._persistent:
+            yield
+            return
+
+        async with self._locked():
+            await self._ensure_started()
+            await self._client.connect()
+            self._connection_holds += 1
+        try:
+            yield
+        finally:
+            async with self._locked():
+                self._connection_holds -= 1
+                if not self._connection_holds:
+                    await self._client.disconnect()
+
+    async def read_events(self, timeout):
+        # Concurrent waits share the read in progress
+        reading = self._reading
+        if reading is None:
+            reading = self._reading = asyncio.ensure_future(self._read_events(timeout))
+            reading.add_done_callback(self._read_done)
+        done, _ = await asyncio.wait({reading}, timeout=timeout)
+        if not done:
+            return False
+        if reading.cancelled():
+            # A command read the connection meanwhile, its events are published
+            return True
+        return reading.result()
+
+    def _read_done(self, reading):
+        if self._reading is reading:
+            self._reading = None
+
+    async def _read_events(self, timeout):
+        async with self._command_lock():
+            await self._ensure_started()
+            try:
+                await self._client.connect()
+                return await self._client.read_events(timeout)
+            except LinphoneConnectionError:
+                self._server.invalidate_liveness()
+                await self._client.disconnect()
+                raise
+            finally:
+                if not self._persistent and not self._connection_holds:
+                    await self._client.disconnect()
+
+    async def _execute_once(self, cmd, trace):
+        try:
+            await self._client.connect()
+            trace.mark(CONNECT)
+            return await cmd.execute_async(self._client, trace)
+        except CommandTimeoutException:
+            # The response may still arrive later, do not mix it with the next command
+            await self._client.disconnect()
+            raise
+        finally:
+            if not self._connection_holds:
+                await self._client.disconnect()
+
+    async def _execute_persistent(self, cmd, trace):
+        try:
+            await self._client.connect()
+            trace.mark(CONNECT)
+            return await cmd.execute_async(self._client, trace)
+        except LinphoneConnectionError as e:
+            # The command was not sent: the connection is stale, retry on a new one
+            self._log_write(f'Reconnecting Linphone client: {e}')
+            await self._client.disconnect()
+            await self._client.connect()
+            return await cmd.execute_async(self._client, trace)
+        except CommandTimeoutException:
+            # The response may still arrive later, do not mix it with the next command
+            await self._client.disconnect()
+            raise
+
+
+@asynccontextmanager
+async def async_registering(session):
+    await session.register()
+    try:
+        yield session
+    finally:
+        await session.unregister()
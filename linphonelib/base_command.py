@@ -1,19 +1,59 @@
-# Copyright 2014-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import abc
 
-from linphonelib.exceptions import CommandTimeoutException, LinphoneConnectionError
+from linphonelib.exceptions import (
+    CommandTimeoutException,
+    LinphoneConnectionError,
+    LinphoneException,
+)
+from linphonelib.tracing import HANDLED, NULL_TRACE, PARSED, SEND
 
 
 class BaseCommand(metaclass=abc.ABCMeta):
-    def execute(self, linphone_client):
+    # Whether the daemon answers with a single status, see `PipelineCommand`
+    single_response = True
+
+    def execute(self, linphone_client, trace=NULL_TRACE):
         cmd_string = self.command
         linphone_client.send_data(cmd_string)
+        trace.mark(SEND)
+        try:
+            messages = linphone_client.parse_next_status_messages()
+            while not self.has_all_responses(messages):
+                messages += linphone_client.parse_next_status_messages()
+        except LinphoneConnectionError as e:
+            raise CommandTimeoutException(f'{self.__class__.__name__}: {e}')
+        trace.mark(PARSED)
+        result = self.handle_responses(messages)
+        trace.mark(HANDLED)
+        return result
+
+    async def execute_async(self, linphone_client, trace=NULL_TRACE):
+        cmd_string = self.command
+        await linphone_client.send_data(cmd_string)
+        trace.mark(SEND)
         try:
-            message = linphone_client.parse_next_status_message()
+            messages = await linphone_client.parse_next_status_messages()
+            while not self.has_all_responses(messages):
+                messages += await linphone_client.parse_next_status_messages()
         except LinphoneConnectionError as e:
             raise CommandTimeoutException(f'{self.__class__.__name__}: {e}')
+        trace.mark(PARSED)
+        result = self.handle_responses(messages)
+        trace.mark(HANDLED)
+        return result
+
+    def has_all_responses(self, messages):
+        """Whether the statuses received for the command are all its responses."""
+        return True
+
+    def handle_responses(self, messages):
+        # Only the last status is relevant unless the command answers with several
+        return self.handle_response(messages[-1])
+
+    def handle_response(self, message):
         if message.status == 'Ok':
             return self.handle_status_ok(message.body)
         elif message.status == 'Error':
@@ -33,3 +73,55 @@ class BaseCommand(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def command(self, message):
         pass
+
+
+class PipelineCommand:
+    """Send several commands at once and match their responses in order.
+
+    The result is a list with, for each command, its result or the exception
+    raised while handling its response. Each command must be answered by a
+    single status message, the others are refused.
+    """
+
+    def __init__(self, commands):
+        self._commands = list(commands)
+        for cmd in self._commands:
+            if not cmd.single_response:
+                raise LinphoneException(
+                    f'{cmd.__class__.__name__}: several responses, cannot be pipelined'
+                )
+
+    def __len__(self):
+        return len(self._commands)
+
+    @property
+    def command(self):
+        return '\n'.join(cmd.command for cmd in self._commands)
+
+    def execute(self, linphone_client, trace=NULL_TRACE):
+        if not self._commands:
+            return []
+
+        linphone_client.clear_status_messages()
+        linphone_client.send_data(self.command)
+        trace.mark(SEND)
+        received = linphone_client.parse_status_messages(len(self))
+        messages = []
+        for cmd in self._commands:
+            try:
+                messages.append(next(received))
+            except LinphoneConnectionError as e:
+                raise CommandTimeoutException(f'{cmd.__class__.__name__}: {e}')
+        trace.mark(PARSED)
+        results = self.handle_responses(messages)
+        trace.mark(HANDLED)
+        return results
+
+    def handle_responses(self, messages):
+        results = []
+        for cmd, message in zip(self._commands, messages):
+            try:
+                results.append(cmd.handle_response(message))
+            except (LinphoneException, NotImplementedError) as e:
+                results.append(e)
+        return results
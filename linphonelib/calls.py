@@ -0,0 +1,100 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from linphonelib.events import CALL_STATE_CHANGED
+
+_ENDED_STATES = ('LinphoneCallEnd', 'LinphoneCallReleased', 'LinphoneCallError')
+# The states of a call in progress, the daemon current call
+_RUNNING_STATES = (
+    'LinphoneCallConnected',
+    'LinphoneCallStreamsRunning',
+    'LinphoneCallUpdating',
+    'LinphoneCallUpdatedByRemote',
+)
+
+
+class Call:
+    """Handle of a call of the daemon, to address commands to it."""
+
+    __slots__ = ('call_id', 'remote', 'state')
+
+    def __init__(self, call_id, remote=None, state=None):
+        self.call_id = call_id
+        self.remote = remote
+        self.state = state
+
+    def __repr__(self):
+        return f'Call({self.call_id!r}, {self.remote!r}, {self.state!r})'
+
+
+class CallRegistry:
+    """Calls of a session by daemon call ID, oldest first.
+
+    Calls are added by the commands that create them and by the
+    call-state-changed events, which also update their state and remove them
+    when they end.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    def __iter__(self):
+        return iter(list(self._calls.values()))
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __contains__(self, call_id):
+        return call_id in self._calls
+
+    def get(self, call_id):
+        return self._calls.get(call_id)
+
+    def add(self, call_id, remote=None, state=None):
+        call = self._calls.get(call_id)
+        if call is None:
+            call = self._calls[call_id] = Call(call_id, remote, state)
+        else:
+            call.remote = remote or call.remote
+            call.state = state or call.state
+        return call
+
+    def remove(self, call_id):
+        return self._calls.pop(call_id, None)
+
+    def clear(self):
+        self._calls.clear()
+
+    def current(self):
+        """Return the most recent call in progress, or None.
+
+        Ringing, outgoing and paused calls are not in progress.
+        """
+        for call in reversed(list(self._calls.values())):
+            if call.state in _RUNNING_STATES:
+                return call
+        return None
+
+    def on_event(self, event):
+        if event.type != CALL_STATE_CHANGED:
+            return
+        call_id = parse_call_id(event.body.get('Id'))
+        if call_id is None:
+            return
+        state = event.body.get('Event')
+        if state in _ENDED_STATES:
+            self.remove(call_id)
+        else:
+            self.add(call_id, event.body.get('From'), state)
+
+
+def parse_call_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def call_id_of(call):
+    """Return the call ID of a `Call` handle, or the call ID itself."""
+    return call.call_id if isinstance(call, Call) else call
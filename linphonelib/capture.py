@@ -0,0 +1,238 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import collections
+import struct
+import threading
+import time
+
+from linphonelib.base_command import PipelineCommand
+from linphonelib.client import BaseLinphoneClient
+from linphonelib.commands import (
+    END_OF_REGISTER_STATUSES,
+    AnswerCommand,
+    CallCommand,
+    CallStatsCommand,
+    CallStatusCommand,
+    DTMFCommand,
+    HangupCommand,
+    HoldCommand,
+    QuitCommand,
+    RegisterCommand,
+    RegisterStatusCommand,
+    ResumeCommand,
+    TransferCommand,
+    UnregisterCommand,
+)
+from linphonelib.exceptions import LinphoneConnectionError, LinphoneException
+
+SEND = 0
+RECV = 1
+# A capture starts with the magic, the format version and the wall clock time
+# of the capture start. Each chunk follows with its direction, its offset from
+# the capture start in microseconds and its length.
+_MAGIC = b'LPCAP'
+_VERSION = 1
+_HEADER = struct.Struct('<5sBd')
+_CHUNK_HEADER = struct.Struct('<BQI')
+
+Chunk = collections.namedtuple('Chunk', ['direction', 'timestamp', 'data'])
+
+
+class CaptureWriter:
+    """Record the data sent to and received from a linphone-daemon.
+
+    Give it to `Session(..., capture=writer)` to record a session. The caller
+    owns the file and closes the writer.
+    """
+
+    def __init__(self, file):
+        if isinstance(file, str):
+            file = open(file, 'wb')
+        self._file = file
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, time.time()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def record_send(self, data):
+        self._record(SEND, data)
+
+    def record_recv(self, data):
+        self._record(RECV, data)
+
+    def _record(self, direction, data):
+        offset = int((time.monotonic() - self._started_at) * 1e6)
+        with self._lock:
+            self._file.write(_CHUNK_HEADER.pack(direction, offset, len(data)) + data)
+
+
+def read_capture(file):
+    """Yield the chunks of a capture, with their timestamp in seconds since epoch."""
+    if isinstance(file, str):
+        with open(file, 'rb') as f:
+            yield from read_capture(f)
+        return
+
+    header = file.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise LinphoneException('Invalid capture: truncated header')
+    magic, version, started_at = _HEADER.unpack(header)
+    if magic != _MAGIC or version != _VERSION:
+        raise LinphoneException(f'Invalid capture: {magic!r} version {version}')
+
+    while chunk_header := file.read(_CHUNK_HEADER.size):
+        if len(chunk_header) < _CHUNK_HEADER.size:
+            raise LinphoneException('Invalid capture: truncated chunk')
+        direction, offset, length = _CHUNK_HEADER.unpack(chunk_header)
+        data = file.read(length)
+        if len(data) < length:
+            raise LinphoneException('Invalid capture: truncated chunk')
+        yield Chunk(direction, started_at + offset / 1e6, data)
+
+
+class ReplayClient(BaseLinphoneClient):
+    """Play the daemon side of a capture back to the commands.
+
+    Each command sent moves the replay to the next chunk sent in the capture;
+    its response is parsed from the chunks received after it, as they were
+    received, until the next chunk sent.
+    """
+
+    def __init__(self, chunks, logfile=None, events=None):
+        super().__init__('replay', logfile, events)
+        self._chunks = collections.deque(chunks)
+
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def send_data(self, data):
+        self._encode(data)
+        # The chunks received before were read by the client while it waited
+        # for another response or for events
+        while self._chunks:
+            chunk = self._chunks.popleft()
+            if chunk.direction == SEND:
+                return
+            self._settle(self._handle_data(chunk.data))
+        raise LinphoneConnectionError('End of capture')
+
+    def parse_next_status_message(self):
+        self._wait_status_message()
+        return self._pop_message()
+
+    def parse_next_status_messages(self):
+        self._wait_status_message()
+        return self._pop_messages()
+
+    def parse_status_messages(self, count):
+        for _ in range(count):
+            self._wait_status_message()
+            yield self._status_queue.popleft()
+
+    def read_events(self, timeout):
+        if not self._chunks or self._chunks[0].direction != RECV:
+            return False
+        self._settle(self._handle_data(self._chunks.popleft().data))
+        return True
+
+    def wait_readable(self, timeout):
+        return self._is_pending(timeout)
+
+    def _is_pending(self, timeout):
+        # The client read the chunks received in a row without waiting
+        return bool(self._chunks) and self._chunks[0].direction == RECV
+
+    def _wait_status_message(self):
+        while not self._status_queue:
+            if not self.read_events(0):
+                break
+        else:
+            return
+        # The client would still be waiting for the end of the last message
+        self._parser.flush()
+        if not self._status_queue:
+            raise LinphoneConnectionError('No more response in capture')
+
+
+def replay(chunks, logfile=None):
+    """Replay the commands of a capture through the parser and their handlers.
+
+    Yield, for each command sent, its text and its result or the exception
+    raised by its handler.
+    """
+    chunks = list(chunks)
+    client = ReplayClient(chunks, logfile)
+    for chunk in chunks:
+        if chunk.direction != SEND:
+            continue
+        text = chunk.data.decode('utf-8', 'replace')
+        try:
+            cmd = command_from_text(text)
+        except LinphoneException as e:
+            client.send_data(chunk.data)
+            yield text, e
+            continue
+        try:
+            yield text, cmd.execute(client)
+        except (LinphoneException, NotImplementedError) as e:
+            yield text, e
+
+
+def command_from_text(text):
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        raise LinphoneException('Empty command')
+    # The statuses of all the accounts are sent with the command ending them
+    if lines[1:] == [END_OF_REGISTER_STATUSES]:
+        return _command_from_line(lines[0])
+    if len(lines) > 1:
+        return PipelineCommand([_command_from_line(line) for line in lines])
+    return _command_from_line(lines[0])
+
+
+def _command_from_line(line):
+    name, *args = line.split()
+    if name == 'call':
+        if len(args) != 1:
+            raise LinphoneException(f'Invalid arguments: {line}')
+        exten, _, hostname = args[0][len('sip:') :].partition('@')
+        return CallCommand(exten, hostname)
+    if name == 'register':
+        if len(args) not in (2, 3):
+            raise LinphoneException(f'Invalid arguments: {line}')
+        uname = args[0][len('sip:') :].partition('@')[0]
+        return RegisterCommand(uname, args[2] if len(args) > 2 else '', args[1])
+    if name in _COMMANDS:
+        try:
+            return _COMMANDS[name](*args)
+        except TypeError:
+            raise LinphoneException(f'Invalid arguments: {line}')
+    raise LinphoneException(f'Unknown command: {line}')
+
+
+_COMMANDS = {
+    'answer': AnswerCommand,
+    'call-pause': HoldCommand,
+    'call-resume': ResumeCommand,
+    'call-stats': CallStatsCommand,
+    'call-status': CallStatusCommand,
+    'dtmf': DTMFCommand,
+    'quit': QuitCommand,
+    'register-status': RegisterStatusCommand,
+    'terminate': HangupCommand,
+    'transfer': TransferCommand,
+    'unregister': UnregisterCommand,
+}
@@ -1,30 +1,132 @@
-# Copyright 2019-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import collections
+import select
 import socket
 
 from . import parser
+from .events import Event, EventChannel
 from .exceptions import LinphoneConnectionError
+from .tracing import FIRST_BYTE, NULL_TRACE
 
 DEFAULT_TIMEOUT = 10
+# How long a message left incomplete by a read waits for the next fragment
+DEFAULT_SETTLE_TIME = 0.02
 StatusMessage = collections.namedtuple('Message', ['status', 'body'])
 
 
-class LinphoneClient:
+class BaseLinphoneClient:
     _BUFSIZE = 4096
-
-    def __init__(self, filename, logfile=None):
+    # The trace of the command waiting for its response
+    trace = NULL_TRACE
+
+    def __init__(
+        self,
+        filename,
+        logfile=None,
+        events=None,
+        capture=None,
+        settle_time=DEFAULT_SETTLE_TIME,
+    ):
         self._filename = filename
+        self.settle_time = settle_time
         self._logfile = logfile
-        self._sock = None
-        self._buffer = b''
+        self._capture = capture
+        self._parser = parser.StreamParser(
+            self._parser_status_callback, self._parser_event_callback
+        )
         self._status_queue = collections.deque()
+        self.events = events if events is not None else EventChannel()
 
     def _log_write(self, message):
         if self._logfile:
             self._logfile.write(message)
 
+    def _parser_status_callback(self, status, message_body):
+        message = StatusMessage(status, message_body)
+        self._status_queue.append(message)
+
+    def _parser_event_callback(self, event_type, message_body):
+        self.events.publish(Event(event_type, message_body))
+
+    def _handle_data(self, data):
+        """Parse data, return how long to wait for more before flushing.
+
+        Return None when no message is left incomplete.
+        """
+        fragmented = self._parser.in_message
+        self.trace.mark(FIRST_BYTE)
+        if self._capture:
+            self._capture.record_recv(data)
+        self._parser.feed(data)
+        if not self._parser.in_message:
+            return None
+        # Messages have no terminator: the last one is taken as complete when the
+        # daemon sends nothing more. A message already split over several reads,
+        # or not ending a line, may be sent in fragments: wait for the next one
+        if fragmented or not self._parser.at_line_end:
+            return self.settle_time
+        return 0
+
+    def _settle(self, wait):
+        if wait is not None and not self._is_pending(wait):
+            self._parser.flush()
+
+    def flush_incomplete(self):
+        # The daemon sent nothing more before a timeout, or closed the connection,
+        # e.g. on quit: return whether a message was left to take as complete
+        if not self._parser.in_message:
+            return False
+        self._parser.flush()
+        return True
+
+    def clear_status_messages(self):
+        self._status_queue.clear()
+
+    def _pop_message(self):
+        message = self._status_queue.pop()
+        self._status_queue.clear()
+        return message
+
+    def _pop_messages(self):
+        messages = list(self._status_queue)
+        self._status_queue.clear()
+        return messages
+
+    def take_status_messages(self, count=None):
+        """Return the parsed status messages without waiting for more.
+
+        Return all of them, or the first `count`; None when there are not
+        enough yet.
+        """
+        if count is None:
+            return self._pop_messages() if self._status_queue else None
+        if len(self._status_queue) < count:
+            return None
+        return [self._status_queue.popleft() for _ in range(count)]
+
+    def _encode(self, data):
+        self._log_write(f'Send data: {data}')
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self._capture:
+            self._capture.record_send(data)
+        return data
+
+
+class LinphoneClient(BaseLinphoneClient):
+    def __init__(
+        self,
+        filename,
+        logfile=None,
+        events=None,
+        capture=None,
+        settle_time=DEFAULT_SETTLE_TIME,
+    ):
+        super().__init__(filename, logfile, events, capture, settle_time)
+        self._sock = None
+
     def connect(self):
         if self._sock is None:
             self._log_write(f'Connecting Linphone client to {self._filename}')
@@ -37,13 +139,64 @@ class LinphoneClient:
 
     def parse_next_status_message(self):
         while not self._status_queue:
-            self._add_data_to_buffer()
-            self._parse_buffer()
+            self._feed_parser()
         return self._pop_message()
 
-    def _parser_status_callback(self, status, message_body):
-        message = StatusMessage(status, message_body)
-        self._status_queue.append(message)
+    def parse_next_status_messages(self):
+        while not self._status_queue:
+            self._feed_parser()
+        return self._pop_messages()
+
+    def parse_status_messages(self, count):
+        for _ in range(count):
+            while not self._status_queue:
+                self._feed_parser()
+            yield self._status_queue.popleft()
+
+    def read_events(self, timeout):
+        readable, _, _ = select.select([self._sock], [], [], timeout)
+        if not readable:
+            return False
+        self._feed_parser()
+        return True
+
+    def wait_readable(self, timeout):
+        """Wait until data can be read, without reading it.
+
+        Return True as well when the connection is closed meanwhile, e.g. by
+        another thread, the next read tells what happened.
+        """
+        sock = self._sock
+        if sock is None:
+            return True
+        try:
+            return has_pending_data(sock, timeout)
+        except (OSError, ValueError):
+            return True
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def read_available(self):
+        """Read and parse the data of a socket known to be readable, without blocking.
+
+        Return how long to wait for more data before calling `flush_incomplete`,
+        None when no message is left incomplete.
+        """
+        try:
+            data = self._recv_data_from_socket()
+        except LinphoneConnectionError:
+            if not self.flush_incomplete():
+                raise
+            return None
+        wait = self._handle_data(data)
+        if wait == 0:
+            if not self._is_pending(0):
+                self._parser.flush()
+                return None
+            # The next fragment is already there: flush unless it is read first
+            wait = self.settle_time
+        return wait
 
     def _connect_socket(self):
         try:
@@ -56,25 +209,22 @@ class LinphoneClient:
     def _disconnect_socket(self):
         self._sock.close()
         self._sock = None
-        self._buffer = b''
+        self._parser.reset()
 
-    def _add_data_to_buffer(self):
-        data = self._recv_data_from_socket()
-        self._buffer += data
-
-    def _parse_buffer(self):
-        self._buffer = parser.parse_buffer(self._buffer, self._parser_status_callback)
+    def _feed_parser(self):
+        try:
+            data = self._recv_data_from_socket()
+        except LinphoneConnectionError:
+            if not self.flush_incomplete():
+                raise
+            return
+        self._settle(self._handle_data(data))
 
-    def _pop_message(self):
-        message = self._status_queue.pop()
-        self._status_queue.clear()
-        return message
+    def _is_pending(self, timeout):
+        return has_pending_data(self._sock, timeout)
 
     def send_data(self, data):
-        self._log_write(f'Send data: {data}')
-        if isinstance(data, str):
-            data = data.encode('utf-8')
-        self._send_data_to_socket(data)
+        self._send_data_to_socket(self._encode(data))
 
     def _send_data_to_socket(self, data):
         try:
@@ -91,3 +241,8 @@ class LinphoneClient:
         if not data:
             raise LinphoneConnectionError('Connection closed from remote')
         return data
+
+
+def has_pending_data(sock, timeout=0):
+    readable, _, _ = select.select([sock], [], [], timeout)
+    return bool(readable)
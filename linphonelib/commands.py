@@ -1,16 +1,19 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from linphonelib.base_command import BaseCommand
+from linphonelib.calls import parse_call_id
 from linphonelib.exceptions import (
     ExtensionNotFoundException,
     LinphoneException,
     NoActiveCallException,
 )
+from linphonelib.responses import CallStats
 
 
 class AnswerCommand(BaseCommand):
-    command = 'answer'
+    def __init__(self, call_id=None):
+        self._call_id = call_id
 
     def handle_status_ok(self, message):
         pass
@@ -20,6 +23,10 @@ class AnswerCommand(BaseCommand):
             raise NoActiveCallException()
         raise LinphoneException(message['Reason'])
 
+    @property
+    def command(self):
+        return _with_call_id('answer', self._call_id)
+
 
 class CallCommand(BaseCommand):
     def __init__(self, exten, hostname):
@@ -27,7 +34,7 @@ class CallCommand(BaseCommand):
         self._hostname = hostname
 
     def handle_status_ok(self, message):
-        pass
+        return parse_call_id(message.get('Id'))
 
     def handle_status_error(self, message):
         if message['Reason'] == 'Call creation failed.':
@@ -56,7 +63,8 @@ class DTMFCommand(BaseCommand):
 
 
 class HangupCommand(BaseCommand):
-    command = 'terminate'
+    def __init__(self, call_id=None):
+        self._call_id = call_id
 
     def handle_status_ok(self, message):
         pass
@@ -66,9 +74,14 @@ class HangupCommand(BaseCommand):
             raise NoActiveCallException()
         raise LinphoneException(message['Reason'])
 
+    @property
+    def command(self):
+        return _with_call_id('terminate', self._call_id)
+
 
 class HoldCommand(BaseCommand):
-    command = 'call-pause'
+    def __init__(self, call_id=None):
+        self._call_id = call_id
 
     def handle_status_ok(self, message):
         pass
@@ -78,6 +91,10 @@ class HoldCommand(BaseCommand):
             raise NoActiveCallException()
         raise LinphoneException(message['Reason'])
 
+    @property
+    def command(self):
+        return _with_call_id('call-pause', self._call_id)
+
 
 class CallStatus:
     OFF = 0
@@ -85,14 +102,26 @@ class CallStatus:
     ANSWERED = 2
 
 
+CALL_STATE_STATUSES = {
+    'LinphoneCallIncomingReceived': CallStatus.RINGING,
+    'LinphoneCallStreamsRunning': CallStatus.ANSWERED,
+    'LinphoneCallEnd': CallStatus.OFF,
+    'LinphoneCallReleased': CallStatus.OFF,
+}
+
+
 class CallStatusCommand(BaseCommand):
     command = 'call-status'
 
+    def __init__(self, caller_id=None):
+        self._caller_id = caller_id
+
     def handle_status_ok(self, message):
-        if message['State'] == 'LinphoneCallStreamsRunning':
-            return CallStatus.ANSWERED
-        if message['State'] == 'LinphoneCallIncomingReceived':
-            return CallStatus.RINGING
+        if self._caller_id is not None and self._caller_id not in message.get(
+            'From', ''
+        ):
+            return None
+        return CALL_STATE_STATUSES.get(message['State'])
 
     def handle_status_error(self, message):
         if message['Reason'] == 'No current call available.':
@@ -100,14 +129,19 @@ class CallStatusCommand(BaseCommand):
 
 
 class CallStatsCommand(BaseCommand):
-    command = 'call-stats'
+    def __init__(self, call_id=None):
+        self._call_id = call_id
 
     def handle_status_ok(self, message):
-        return message
+        return CallStats.from_mapping(message)
 
     def handle_status_error(self, message):
         raise LinphoneException(message['Reason'])
 
+    @property
+    def command(self):
+        return _with_call_id('call-stats', self._call_id)
+
 
 class IsTalkingToCommand(BaseCommand):
     command = 'call-status'
@@ -154,7 +188,7 @@ class RegisterCommand(BaseCommand):
         self._hostname = hostname
 
     def handle_status_ok(self, message):
-        pass
+        return message.get('Id')
 
     def handle_status_error(self, message):
         # register command never send Status: Error
@@ -170,18 +204,67 @@ class RegisterStatus:
     FAIL = 1
 
 
+REGISTRATION_STATE_STATUSES = {
+    'LinphoneRegistrationOk': RegisterStatus.REGISTERED,
+    'LinphoneRegistrationFailed': RegisterStatus.FAIL,
+}
+
+
+# Account IDs start at 1: the daemon answers an error for this one, after the
+# statuses of all the accounts, as it answers nothing without any account
+END_OF_REGISTER_STATUSES = 'register-status 0'
+
+
 class RegisterStatusCommand(BaseCommand):
-    command = 'register-status ALL'
+    def __init__(self, proxy_id='ALL'):
+        self._proxy_id = proxy_id
+
+    @property
+    def single_response(self):
+        # The daemon sends one status per account
+        return self._proxy_id != 'ALL'
+
+    def has_all_responses(self, messages):
+        return self.single_response or messages[-1].status == 'Error'
+
+    def handle_responses(self, messages):
+        if self.single_response:
+            return super().handle_responses(messages)
+        statuses = messages[:-1]
+        return self.handle_response(statuses[-1]) if statuses else None
 
     def handle_status_ok(self, message):
-        if message['State'] == 'LinphoneRegistrationOk':
-            return RegisterStatus.REGISTERED
-        if message['State'] == 'LinphoneRegistrationFailed':
-            return RegisterStatus.FAIL
+        return REGISTRATION_STATE_STATUSES.get(message.get('State'))
 
     def handle_status_error(self, message):
         raise NotImplementedError()
 
+    @property
+    def command(self):
+        if self.single_response:
+            return f'register-status {self._proxy_id}'
+        return f'register-status ALL\n{END_OF_REGISTER_STATUSES}'
+
+
+class RegisterStatusesCommand(RegisterStatusCommand):
+    def __init__(self):
+        super().__init__('ALL')
+
+    def handle_responses(self, messages):
+        # The daemon sends one status per account, then the end error
+        statuses = {}
+        for message in messages[:-1]:
+            statuses.update(self.handle_response(message))
+        return statuses
+
+    def handle_status_ok(self, message):
+        if 'Id' not in message:
+            return {}
+        return {message['Id']: REGISTRATION_STATE_STATUSES.get(message.get('State'))}
+
+    def handle_status_error(self, message):
+        raise LinphoneException(message['Reason'])
+
 
 class ResumeCommand(BaseCommand):
     def __init__(self, call_id):
@@ -218,7 +301,8 @@ class TransferCommand(BaseCommand):
 
 
 class UnregisterCommand(BaseCommand):
-    command = 'unregister ALL'
+    def __init__(self, proxy_id='ALL'):
+        self._proxy_id = proxy_id
 
     def handle_status_ok(self, message):
         pass
@@ -227,6 +311,10 @@ class UnregisterCommand(BaseCommand):
         # unregister command never send Status: Error
         pass
 
+    @property
+    def command(self):
+        return f'unregister {self._proxy_id}'
+
 
 class QuitCommand(BaseCommand):
     command = 'quit'
@@ -237,3 +325,10 @@ class QuitCommand(BaseCommand):
     def handle_status_error(self, message):
         # quit command never send Status: Error
         pass
+
+
+def _with_call_id(command, call_id):
+    # Without call ID, the daemon uses its current call
+    if call_id is None:
+        return command
+    return f'{command} {call_id}'
@@ -0,0 +1,150 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import http.client
+import json
+import socket
+import threading
+import time
+from urllib.parse import quote
+
+from linphonelib.exceptions import LinphoneException, ServerStartException
+
+DEFAULT_DOCKER_SOCKET = '/var/run/docker.sock'
+DEFAULT_LISTING_TTL = 1
+DEFAULT_TIMEOUT = 30
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=DEFAULT_TIMEOUT):
+        super().__init__('localhost', timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class DockerEngineClient:
+    """Drive docker through the Engine API on its unix socket.
+
+    Requests share one keep-alive connection. The list of running containers is
+    fetched with a single request and reused for `listing_ttl` seconds, so one
+    client shared by all the servers of a fleet answers all their liveness checks
+    at once.
+    """
+
+    def __init__(
+        self, socket_path=DEFAULT_DOCKER_SOCKET, listing_ttl=DEFAULT_LISTING_TTL
+    ):
+        self._socket_path = socket_path
+        self._listing_ttl = listing_ttl
+        self._connection = _UnixHTTPConnection(socket_path)
+        self._lock = threading.Lock()
+        self._running_names = frozenset()
+        self._listed_at = None
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def is_running(self, name):
+        return name in self.running_names()
+
+    def running_names(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._listed_at is None or now - self._listed_at >= self._listing_ttl:
+                containers = self._request_locked('GET', '/containers/json')
+                self._running_names = frozenset(
+                    container_name.lstrip('/')
+                    for container in containers
+                    for container_name in container['Names']
+                )
+                self._listed_at = now
+            return self._running_names
+
+    def run(self, name, image, volumes):
+        body = {
+            'Image': image,
+            'HostConfig': {
+                'AutoRemove': True,
+                'Binds': [f'{source}:{dest}' for source, dest in volumes.items()],
+            },
+        }
+        try:
+            self._request('POST', f'/containers/create?name={quote(name)}', body)
+            self._request('POST', f'/containers/{quote(name)}/start')
+        except LinphoneException as e:
+            raise ServerStartException(e)
+        self._forget_listing()
+
+    def kill(self, *names):
+        for name in names:
+            self._request('POST', f'/containers/{quote(name)}/kill', ignore=(404, 409))
+        self._forget_listing()
+
+    def wait(self, name, timeout):
+        # Waiting blocks the connection until the container exits: do not hold
+        # the shared one
+        connection = _UnixHTTPConnection(self._socket_path, timeout=timeout)
+        try:
+            _request(
+                connection, 'POST', f'/containers/{quote(name)}/wait', ignore=(404,)
+            )
+        except (OSError, http.client.HTTPException, LinphoneException):
+            # Timed out, or docker is unreachable: the caller kills the container
+            return False
+        finally:
+            connection.close()
+        self._forget_listing()
+        return True
+
+    def _forget_listing(self):
+        with self._lock:
+            self._listed_at = None
+
+    def _request(self, method, url, body=None, ignore=()):
+        with self._lock:
+            return self._request_locked(method, url, body, ignore)
+
+    def _request_locked(self, method, url, body=None, ignore=()):
+        try:
+            try:
+                return _request(self._connection, method, url, body, ignore)
+            except _STALE_CONNECTION_ERRORS:
+                # The keep-alive connection was closed by docker, retry on a new one
+                self._connection.close()
+                return _request(self._connection, method, url, body, ignore)
+        except (OSError, http.client.HTTPException) as e:
+            self._connection.close()
+            raise LinphoneException(f'Docker API {method} {url}: {e}')
+
+
+def _request(connection, method, url, body=None, ignore=()):
+    headers = {}
+    payload = None
+    if body is not None:
+        payload = json.dumps(body).encode('utf-8')
+        headers['Content-Type'] = 'application/json'
+    connection.request(method, url, payload, headers)
+    response = connection.getresponse()
+    data = response.read()
+    if response.status >= 400 and response.status not in ignore:
+        raise LinphoneException(
+            f'Docker API {method} {url}: {response.status} {data.decode("utf-8", "replace")}'
+        )
+    if data and response.getheader('Content-Type', '').startswith('application/json'):
+        return json.loads(data)
+    return None
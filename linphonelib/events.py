@@ -0,0 +1,58 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import collections
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 256
+CALL_STATE_CHANGED = 'call-state-changed'
+REGISTRATION_STATE_CHANGED = 'registration-state-changed'
+Event = collections.namedtuple('Event', ['type', 'body'])
+
+
+class EventChannel:
+    """Bounded buffer of the events sent by linphone-daemon.
+
+    Subscribed callbacks are called with each event as soon as it is parsed;
+    their errors are logged.
+    Iterating over the channel consumes the buffered events, oldest first. When
+    the buffer is full, the oldest event is dropped and counted in `dropped`.
+    """
+
+    def __init__(self, size=DEFAULT_BUFFER_SIZE):
+        self._events = collections.deque(maxlen=size)
+        self._callbacks = []
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    def __iter__(self):
+        while self._events:
+            yield self._events.popleft()
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def publish(self, event):
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+        for callback in list(self._callbacks):
+            # A failing subscriber must not break the parsing nor the others
+            try:
+                callback(event)
+            except Exception:
+                logger.exception(
+                    'Error in the subscriber %r of event %s', callback, event.type
+                )
+
+    def clear(self):
+        self._events.clear()
@@ -1,4 +1,4 @@
-# Copyright 2013-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 
@@ -20,3 +20,7 @@ class LinphoneConnectionError(LinphoneException):
 
 class NoActiveCallException(LinphoneException):
     pass
+
+
+class ServerStartException(LinphoneException):
+    pass
@@ -0,0 +1,492 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import collections
+import os
+import random
+import socket
+import socketserver
+import threading
+import time
+
+from linphonelib.events import CALL_STATE_CHANGED, REGISTRATION_STATE_CHANGED
+from linphonelib.server import DEFAULT_START_TIMEOUT, BaseLinphoneServer
+
+DEFAULT_CALL_STATS = {
+    'Audio-ICE state': 'Not activated',
+    'Audio-RoundTrip delay': '0.020000',
+    'Audio-Jitter buffer size': '60',
+    'Audio-Received loss rate': '0.000000',
+    'Audio-Sent loss rate': '0.000000',
+    'Audio-Received interarrival jitter': '0.000000',
+    'Audio-Sent interarrival jitter': '0.000000',
+    'Audio-Upload bandwidth': '80.000000',
+    'Audio-Download bandwidth': '80.000000',
+}
+INJECTED_ERROR_REASON = 'Injected error.'
+_RUNNING_STATES = ('LinphoneCallConnected', 'LinphoneCallStreamsRunning')
+_SETUP_STATES = (
+    'LinphoneCallIncomingReceived',
+    'LinphoneCallOutgoingInit',
+    'LinphoneCallOutgoingProgress',
+)
+
+
+class FakeDaemon:
+    """Serve the linphone-daemon pipe protocol on a unix socket, in process.
+
+    Accounts and calls are simulated: outgoing calls are answered at once and
+    incoming calls are created with `incoming_call`. Responses and events use
+    the same framing as the daemon.
+
+    Every response is delayed by `latency` seconds plus a random part up to
+    `jitter`. With `fragment_size`, the responses are written in chunks of that
+    many bytes, `fragment_delay` seconds apart. `errors` maps command names to
+    the reason of the error they always answer, and `error_rate` is the
+    probability that any command answers an error. `seed` makes the random
+    choices reproducible. With `blank_line_after_body`, the messages with a
+    body end with a blank line, as some daemon versions write them.
+
+    Without a call ID, the commands address the current call: the call in
+    progress, else the most recent call being set up, never a paused call.
+    """
+
+    def __init__(
+        self,
+        socket_file,
+        latency=0,
+        jitter=0,
+        fragment_size=None,
+        fragment_delay=0,
+        errors=None,
+        error_rate=0,
+        seed=None,
+        registration_state='LinphoneRegistrationOk',
+        call_stats=None,
+        blank_line_after_body=False,
+    ):
+        self._socket_file = socket_file
+        self.latency = latency
+        self.jitter = jitter
+        self.fragment_size = fragment_size
+        self.fragment_delay = fragment_delay
+        self.errors = dict(errors or {})
+        self.error_rate = error_rate
+        self.registration_state = registration_state
+        self.call_stats = dict(DEFAULT_CALL_STATS if call_stats is None else call_stats)
+        self.blank_line_after_body = blank_line_after_body
+        self.received = collections.Counter()
+        self.accounts = {}
+        self.calls = {}
+        self._next_account_id = 1
+        self._next_call_id = 1
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._server = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._stopped.set()
+        self._handlers = {
+            'answer': self._answer,
+            'call': self._call,
+            'call-pause': self._call_pause,
+            'call-resume': self._call_resume,
+            'call-stats': self._call_stats,
+            'call-status': self._call_status,
+            'dtmf': self._dtmf,
+            'quit': self._quit,
+            'register': self._register,
+            'register-status': self._register_status,
+            'terminate': self._terminate,
+            'unregister': self._unregister,
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def is_serving(self):
+        return not self._stopped.is_set()
+
+    def start(self):
+        self._server = _FakeDaemonServer(self._socket_file, self)
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.01,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            if self._server is None:
+                return
+            server, self._server = self._server, None
+            connections = list(self._connections)
+        server.shutdown()
+        server.server_close()
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if os.path.exists(self._socket_file):
+            os.unlink(self._socket_file)
+        self._stopped.set()
+
+    def wait_until_stopped(self, timeout):
+        return self._stopped.wait(timeout)
+
+    def incoming_call(self, remote):
+        with self._lock:
+            call_id = self._new_call(remote, 'in', 'LinphoneCallIncomingReceived')
+            events = [self._call_event(call_id)]
+        self._broadcast(events)
+        return call_id
+
+    def end_call(self, call_id):
+        with self._lock:
+            events = self._end_call_locked(call_id)
+        self._broadcast(events)
+
+    def _add_connection(self, connection):
+        with self._lock:
+            self._connections[connection] = threading.Lock()
+
+    def _remove_connection(self, connection):
+        with self._lock:
+            self._connections.pop(connection, None)
+
+    def _handle_command(self, connection, line):
+        name, _, args = line.partition(' ')
+        with self._lock:
+            self.received[name] += 1
+            if name in self.errors:
+                responses, events = [_error(self.errors[name])], []
+            elif self.error_rate and self._random.random() < self.error_rate:
+                responses, events = [_error(INJECTED_ERROR_REASON)], []
+            elif name in self._handlers:
+                responses, events = self._handlers[name](args.split())
+            else:
+                responses, events = [_error('Unknown command.')], []
+            delay = self.latency + (
+                self._random.uniform(0, self.jitter) if self.jitter else 0
+            )
+
+        if delay:
+            time.sleep(delay)
+        # The daemon writes the events of a command after its response
+        self._send(connection, self._frame(responses + events))
+        self._broadcast(events, exclude=connection)
+
+        if name == 'quit' and name not in self.errors:
+            threading.Thread(target=self.stop, daemon=True).start()
+            return False
+        return True
+
+    def _broadcast(self, events, exclude=None):
+        if not events:
+            return
+        with self._lock:
+            connections = [c for c in self._connections if c is not exclude]
+        for connection in connections:
+            self._send(connection, self._frame(events))
+
+    def _frame(self, messages):
+        if not self.blank_line_after_body:
+            return ''.join(messages)
+        return ''.join(
+            message if message == _ok() else message + '\n' for message in messages
+        )
+
+    def _send(self, connection, data):
+        with self._lock:
+            write_lock = self._connections.get(connection)
+        if write_lock is None or not data:
+            return
+        data = data.encode('utf-8')
+        size = self.fragment_size or len(data)
+        with write_lock:
+            try:
+                for start in range(0, len(data), size):
+                    if start and self.fragment_delay:
+                        time.sleep(self.fragment_delay)
+                    connection.sendall(data[start : start + size])
+            except OSError:
+                pass
+
+    def _new_call(self, remote, direction, state):
+        call_id = self._next_call_id
+        self._next_call_id += 1
+        self.calls[call_id] = {
+            'remote': remote,
+            'direction': direction,
+            'state': state,
+            'started_at': time.monotonic(),
+        }
+        return call_id
+
+    def _find_call(self, args, states=None):
+        if args:
+            try:
+                call = self.calls.get(int(args[0]))
+            except ValueError:
+                return None
+            if call is None or (states and call['state'] not in states):
+                return None
+            return int(args[0])
+        if states:
+            matching = [i for i in self.calls if self.calls[i]['state'] in states]
+        else:
+            matching = [
+                i for i in self.calls if self.calls[i]['state'] in _RUNNING_STATES
+            ] or [i for i in self.calls if self.calls[i]['state'] in _SETUP_STATES]
+        return matching[-1] if matching else None
+
+    def _set_call_state(self, call_id, *states):
+        events = []
+        for state in states:
+            self.calls[call_id]['state'] = state
+            events.append(self._call_event(call_id))
+        return events
+
+    def _end_call_locked(self, call_id):
+        if call_id not in self.calls:
+            return []
+        events = self._set_call_state(
+            call_id, 'LinphoneCallEnd', 'LinphoneCallReleased'
+        )
+        del self.calls[call_id]
+        return events
+
+    def _call_event(self, call_id):
+        call = self.calls[call_id]
+        return _event(
+            CALL_STATE_CHANGED,
+            ('Event', call['state']),
+            ('From', call['remote']),
+            ('Id', call_id),
+        )
+
+    def _answer(self, args):
+        call_id = self._find_call(args, ('LinphoneCallIncomingReceived',))
+        if call_id is None:
+            return [_error('No call to accept.')], []
+        events = self._set_call_state(
+            call_id, 'LinphoneCallConnected', 'LinphoneCallStreamsRunning'
+        )
+        return [_ok()], events
+
+    def _call(self, args):
+        if not args:
+            return [_error('Missing parameter.')], []
+        call_id = self._new_call(args[0], 'out', 'LinphoneCallOutgoingInit')
+        events = [self._call_event(call_id)]
+        events += self._set_call_state(
+            call_id,
+            'LinphoneCallOutgoingProgress',
+            'LinphoneCallConnected',
+            'LinphoneCallStreamsRunning',
+        )
+        return [_ok(('Id', call_id))], events
+
+    def _call_pause(self, args):
+        call_id = self._find_call(args, ('LinphoneCallStreamsRunning',))
+        if call_id is None:
+            return [_error('No current call available.')], []
+        events = self._set_call_state(
+            call_id, 'LinphoneCallPausing', 'LinphoneCallPaused'
+        )
+        return [_ok()], events
+
+    def _call_resume(self, args):
+        call_id = self._find_call(args, ('LinphoneCallPaused',))
+        if call_id is None:
+            return [_error('No current call available.')], []
+        events = self._set_call_state(
+            call_id, 'LinphoneCallResuming', 'LinphoneCallStreamsRunning'
+        )
+        return [_ok()], events
+
+    def _call_stats(self, args):
+        call_id = self._find_call(args)
+        if call_id is None:
+            return [_error('No current call available.')], []
+        return [_ok(('Id', call_id), *self.call_stats.items())], []
+
+    def _call_status(self, args):
+        call_id = self._find_call(args)
+        if call_id is None:
+            return [_error('No current call available.')], []
+        call = self.calls[call_id]
+        duration = int(time.monotonic() - call['started_at'])
+        response = _ok(
+            ('State', call['state']),
+            ('From', call['remote']),
+            ('Direction', call['direction']),
+            ('Duration', duration),
+        )
+        return [response], []
+
+    def _dtmf(self, args):
+        return [_ok()], []
+
+    def _quit(self, args):
+        return [_ok()], []
+
+    def _register(self, args):
+        if not args:
+            return [_error('Missing parameter.')], []
+        account_id = self._next_account_id
+        self._next_account_id += 1
+        self.accounts[account_id] = {
+            'identity': args[0],
+            'state': self.registration_state,
+        }
+        return [_ok(('Id', account_id))], [self._registration_event(account_id)]
+
+    def _register_status(self, args):
+        account_ids = self._find_accounts(args)
+        if account_ids is None:
+            return [_error('No register with such id.')], []
+        # Like the daemon, one status per account and none without any account
+        responses = [
+            _ok(('Id', account_id), ('State', self.accounts[account_id]['state']))
+            for account_id in account_ids
+        ]
+        return responses, []
+
+    def _terminate(self, args):
+        call_id = self._find_call(args)
+        if call_id is None:
+            reason = 'No call with such id.' if args else 'No active call.'
+            return [_error(reason)], []
+        return [_ok()], self._end_call_locked(call_id)
+
+    def _unregister(self, args):
+        account_ids = self._find_accounts(args)
+        if account_ids is None:
+            return [_error('No register with such id.')], []
+        events = []
+        for account_id in account_ids:
+            self.accounts[account_id]['state'] = 'LinphoneRegistrationCleared'
+            events.append(self._registration_event(account_id))
+            del self.accounts[account_id]
+        return [_ok()], events
+
+    def _find_accounts(self, args):
+        if not args or args[0] == 'ALL':
+            return list(self.accounts)
+        try:
+            account_id = int(args[0])
+        except ValueError:
+            return None
+        if account_id not in self.accounts:
+            return None
+        return [account_id]
+
+    def _registration_event(self, account_id):
+        account = self.accounts[account_id]
+        return _event(
+            REGISTRATION_STATE_CHANGED,
+            ('Id', account_id),
+            ('Identity', account['identity']),
+            ('State', account['state']),
+        )
+
+
+class FakeLinphoneServer(BaseLinphoneServer):
+    """Serve a `FakeDaemon` in place of linphone-daemon.
+
+    The options are given to the `FakeDaemon`, e.g.
+    `Session(..., server_factory=functools.partial(FakeLinphoneServer, latency=0.001))`.
+    """
+
+    def __init__(
+        self,
+        socket_file,
+        mount_path,
+        logfile,
+        liveness=None,
+        start_timeout=DEFAULT_START_TIMEOUT,
+        **options,
+    ):
+        super().__init__(socket_file, mount_path, logfile, liveness, start_timeout)
+        self._options = options
+        self.daemon = None
+
+    def check_running(self):
+        running = self.daemon is not None and self.daemon.is_serving()
+        if running:
+            self.liveness.mark_alive()
+        return running
+
+    def start(self):
+        self._log_write('Starting fake linphone daemon...')
+        self.daemon = FakeDaemon(self._socket_file, **self._options)
+        self.daemon.start()
+        self._wait_until_ready()
+        self.liveness.mark_alive()
+        self._log_write('Fake linphone daemon ready!')
+
+    def force_stop(self):
+        self.liveness.invalidate()
+        if self.daemon is not None:
+            self.daemon.stop()
+
+    def wait_until_stopped(self, timeout):
+        self.liveness.invalidate()
+        if self.daemon is None:
+            return True
+        return self.daemon.wait_until_stopped(timeout)
+
+
+class _FakeDaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # The daemon may be stopped from a connection thread by the quit command
+    block_on_close = False
+
+    def __init__(self, socket_file, fake_daemon):
+        super().__init__(socket_file, _FakeDaemonHandler)
+        self.fake_daemon = fake_daemon
+
+
+class _FakeDaemonHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        fake_daemon = self.server.fake_daemon
+        fake_daemon._add_connection(self.request)
+        try:
+            # Like the daemon, each read holds whole commands, the last one
+            # possibly without its newline
+            while data := self.request.recv(4096):
+                for line in data.decode('utf-8', 'replace').splitlines():
+                    command = line.strip()
+                    if command and not fake_daemon._handle_command(
+                        self.request, command
+                    ):
+                        return
+        except OSError:
+            pass
+        finally:
+            fake_daemon._remove_connection(self.request)
+
+
+def _ok(*fields):
+    if not fields:
+        return 'Status: Ok\n'
+    return 'Status: Ok\n\n' + _format_fields(fields)
+
+
+def _error(reason):
+    return f'Status: Error\nReason: {reason}\n'
+
+
+def _event(event_type, *fields):
+    return f'Event-type: {event_type}\n' + _format_fields(fields)
+
+
+def _format_fields(fields):
+    return ''.join(f'{name}: {value}\n' for name, value in fields)
@@ -0,0 +1,257 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import collections
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from linphonelib.commands import RegisterStatus
+from linphonelib.exceptions import CommandTimeoutException, LinphoneException
+from linphonelib.quality import QualityReport
+from linphonelib.server import force_stop_all
+from linphonelib.session import DEFAULT_STOP_TIMEOUT
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_REGISTRATION_TIMEOUT = 10
+DEFAULT_POLL_INTERVAL = 0.1
+
+PhaseReport = collections.namedtuple(
+    'PhaseReport', ['phase', 'duration', 'timings', 'failures']
+)
+
+
+class Fleet:
+    """Create, start, register and close many sessions in parallel.
+
+    Each phase runs on at most `max_workers` sessions at a time and returns a
+    `PhaseReport` with the duration of the phase, the duration per session and
+    the exception raised per failed session. A session that failed a phase is
+    skipped by the following ones, except `close` which cleans up every session.
+    """
+
+    def __init__(self, sessions, max_workers=DEFAULT_MAX_WORKERS):
+        self.sessions = list(sessions)
+        self.failures = {}
+        self.reports = []
+        self._max_workers = max_workers
+        self._cleanup = None
+
+    @classmethod
+    def create(cls, session_factory, count, max_workers=DEFAULT_MAX_WORKERS):
+        fleet = cls([], max_workers)
+        created = {}
+
+        def create(index):
+            created[index] = session_factory(index)
+
+        fleet._run_phase('create', create, range(count))
+        fleet.sessions = [created[index] for index in sorted(created)]
+        return fleet
+
+    @property
+    def healthy_sessions(self):
+        return [session for session in self.sessions if session not in self.failures]
+
+    def __enter__(self):
+        self.start()
+        self.register()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start(self):
+        return self._run_phase('start', lambda session: session.start())
+
+    def register(self):
+        return self._run_phase('register', lambda session: session.register())
+
+    def register_and_wait(
+        self, timeout=DEFAULT_REGISTRATION_TIMEOUT, poll_interval=DEFAULT_POLL_INTERVAL
+    ):
+        """Register the sessions and wait until they are all registered.
+
+        The registration status of all the pending sessions is polled in
+        parallel every `poll_interval` seconds, so the wait lasts about one
+        registration whatever the number of sessions. The report times each
+        session until it is registered; a session that is not registered
+        before the deadline or whose registration failed is a failure.
+        """
+        deadline = time.monotonic() + timeout
+        # The sessions that failed to send their registration are failures too
+        failures = dict(self.register().failures)
+
+        start = time.monotonic()
+        timings = {}
+
+        def check(session):
+            status = session.register_status()
+            if status == RegisterStatus.REGISTERED:
+                timings[session] = time.monotonic() - start
+            elif status == RegisterStatus.FAIL:
+                failures[session] = LinphoneException('Registration failed')
+
+        pending = self.healthy_sessions
+        while pending:
+            errors = self._map(check, pending)
+            failures.update(errors)
+            pending = [s for s in pending if s not in timings and s not in failures]
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+            time.sleep(min(poll_interval, remaining))
+
+        for session in pending:
+            failures[session] = CommandTimeoutException(
+                f'Not registered after {timeout}s'
+            )
+        report = PhaseReport(
+            'registration', time.monotonic() - start, timings, failures
+        )
+        self.failures.update(failures)
+        self.reports.append(report)
+        return report
+
+    def _map(self, action, items):
+        # Run the action on every item in parallel, return the errors per item
+        items = list(items)
+        errors = {}
+
+        def run(item):
+            try:
+                action(item)
+            except Exception as e:
+                errors[item] = e
+
+        if items:
+            with ThreadPoolExecutor(min(self._max_workers, len(items))) as executor:
+                for _ in executor.map(run, items):
+                    pass
+        return errors
+
+    def unregister(self):
+        # Failed sessions may still have a registration in progress
+        return self._run_phase(
+            'unregister', lambda session: session.unregister(), self.sessions
+        )
+
+    def close(self):
+        return self._run_phase('close', lambda session: session.close(), self.sessions)
+
+    def teardown(self, stop_timeout=DEFAULT_STOP_TIMEOUT):
+        """Close all the sessions at once, faster than `close`.
+
+        Quit is sent to all the daemons in parallel and their exit is awaited
+        until a single deadline; the daemons still running then are killed
+        together. The temporary directories of the sessions are removed by a
+        background thread, see `wait_cleanup`. The report times each session
+        until its daemon stopped.
+        """
+        start = time.monotonic()
+        deadline = start + stop_timeout
+        timings = {}
+        running = []
+        stragglers = []
+
+        def send_quit(session):
+            if session.quit():
+                running.append(session)
+            else:
+                timings[session] = time.monotonic() - start
+
+        def wait(session):
+            # All the daemons were asked to quit: wait against the same deadline
+            remaining = max(0, deadline - time.monotonic())
+            if session.wait_until_stopped(remaining):
+                timings[session] = time.monotonic() - start
+            else:
+                stragglers.append(session)
+
+        failures = self._map(send_quit, self.sessions)
+        failures.update(self._map(wait, running))
+        # A session that failed to quit may still run
+        stragglers.extend(failures)
+        if stragglers:
+            try:
+                force_stop_all(session.server for session in stragglers)
+            except Exception as e:
+                failures.update((session, e) for session in stragglers)
+            for session in stragglers:
+                timings.setdefault(session, time.monotonic() - start)
+
+        paths = []
+        failures.update(
+            self._map(lambda session: paths.append(session.release()), self.sessions)
+        )
+        self._cleanup = threading.Thread(
+            target=_remove_directories, args=([path for path in paths if path],)
+        )
+        self._cleanup.start()
+
+        report = PhaseReport('teardown', time.monotonic() - start, timings, failures)
+        self.failures.update(failures)
+        self.reports.append(report)
+        return report
+
+    def wait_cleanup(self, timeout=None):
+        """Wait until the directories of a teardown are removed, return whether they are."""
+        if self._cleanup is None:
+            return True
+        self._cleanup.join(timeout)
+        return not self._cleanup.is_alive()
+
+    def collect_quality(self):
+        """Return a `QualityReport` of the call-stats of the healthy sessions."""
+        report = QualityReport(self.healthy_sessions)
+
+        def collect(index):
+            report.store(index, report.sessions[index].call_stats())
+
+        errors = self._map(collect, range(len(report.sessions)))
+        for index, error in errors.items():
+            report.failures[report.sessions[index]] = error
+        report.estimate_mos()
+        return report
+
+    def _run_phase(self, phase, action, items=None):
+        items = self.healthy_sessions if items is None else list(items)
+        timings = {}
+
+        def run(item):
+            start = time.monotonic()
+            try:
+                action(item)
+            finally:
+                timings[item] = time.monotonic() - start
+
+        start = time.monotonic()
+        failures = self._map(run, items)
+        report = PhaseReport(phase, time.monotonic() - start, timings, failures)
+
+        if phase != 'create':
+            self.failures.update(failures)
+        self.reports.append(report)
+        return report
+
+
+def _remove_directories(paths):
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+@contextmanager
+def bulk_registering(
+    sessions, timeout=DEFAULT_REGISTRATION_TIMEOUT, max_workers=DEFAULT_MAX_WORKERS
+):
+    """Register many sessions at once and unregister them all on exit.
+
+    Yield the report of `Fleet.register_and_wait`.
+    """
+    fleet = Fleet(sessions, max_workers)
+    try:
+        yield fleet.register_and_wait(timeout)
+    finally:
+        fleet.unregister()
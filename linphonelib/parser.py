@@ -1,55 +1,122 @@
-# Copyright 2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import logging
+
+from linphonelib.responses import Body
+
+logger = logging.getLogger(__name__)
+
+_MESSAGE_HEADERS = (b'Status:', b'Event-type:')
+
 
 class LinphoneParsingError(Exception):
     pass
 
 
-# NOTE: Since there are no stable delimiter to know when the message start or stop, then we guess
-# that we already have all the message in the buffer ...
-def parse_buffer(raw_buffer, status_callback):
-    unparsed_buffer = raw_buffer
-    while unparsed_buffer:
-        head, sep, unparsed_buffer = unparsed_buffer.partition(b'\nStatus')
-        if not sep:
-            unparsed_buffer = head
-            head, sep, unparsed_buffer = unparsed_buffer.partition(b'\nEvent-type')
-
-        unparsed_buffer = sep.lstrip(b'\n') + unparsed_buffer
+class StreamParser:
+    """Incremental parser of the linphone-daemon output.
+
+    Chunks are fed as they are received. A message is complete when the next
+    message starts or when the caller knows no more data is pending and calls
+    `flush`. Incomplete lines and messages are kept for the next chunk.
+    """
+
+    def __init__(self, status_callback, event_callback=None):
+        self._status_callback = status_callback
+        self._event_callback = event_callback
+        self._partial_line = []
+        self._lines = []
+        self._after_header_blank_line = False
+
+    def reset(self):
+        self._partial_line = []
+        self._lines = []
+        self._after_header_blank_line = False
+
+    @property
+    def in_message(self):
+        """Whether part of a message was fed and not emitted yet."""
+        return bool(self._lines or self._partial_line)
+
+    @property
+    def at_line_end(self):
+        """Whether the data fed ends with a line that may end a message.
+
+        A message cannot end in the middle of a line, nor on the blank line
+        between a status and its body; a blank line after the body may end it.
+        """
+        return not self._partial_line and not self._after_header_blank_line
+
+    def feed(self, chunk):
+        start = 0
+        end = chunk.find(b'\n')
+        while end != -1:
+            if self._partial_line:
+                self._partial_line.append(chunk[start:end])
+                line = b''.join(self._partial_line)
+                self._partial_line = []
+            else:
+                line = chunk[start:end]
+            self._add_line(line)
+            start = end + 1
+            end = chunk.find(b'\n', start)
+
+        if start < len(chunk):
+            self._partial_line.append(chunk[start:])
+
+    def flush(self):
+        if self._partial_line:
+            self._add_line(b''.join(self._partial_line))
+            self._partial_line = []
+        self._after_header_blank_line = False
+        self._emit()
+
+    def _add_line(self, line):
+        self._after_header_blank_line = not line and len(self._lines) == 1
+        if line.startswith(_MESSAGE_HEADERS):
+            self._emit()
+        if line:
+            self._lines.append(line)
+
+    def _emit(self):
+        if not self._lines:
+            return
+        lines, self._lines = self._lines, []
         try:
-            _parse_msg(head, status_callback)
-        except LinphoneParsingError:
-            continue
+            _parse_msg(lines, self._status_callback, self._event_callback)
+        except LinphoneParsingError as e:
+            # Usually the end of a message taken as complete too early
+            logger.warning('Dropped %s, the message before may be truncated', e)
 
-    return b''
 
+# NOTE: Since there are no stable delimiter to know when the message stop, then we guess
+# that we already have all the message in the buffer ...
+def parse_buffer(raw_buffer, status_callback):
+    stream_parser = StreamParser(status_callback)
+    stream_parser.feed(raw_buffer)
+    stream_parser.flush()
+    return b''
 
-def _parse_msg(data, status_callback):
-    data = data.replace(b'\n\n', b'\n').strip(b'\n')
-    lines = data.decode('utf8', 'replace').split('\n')
 
+def _parse_msg(lines, status_callback, event_callback=None):
     try:
         first_header, first_value = _parse_line(lines[0])
     except LinphoneParsingError:
-        raise LinphoneParsingError('unexpected data: %r' % data)
-
-    message = {}
-    message[first_header] = first_value
-    for line in lines[1:]:
-        try:
-            header, value = _parse_line(line)
-        except LinphoneParsingError:
-            continue  # ignore invalid line
-        message[header] = value
+        raise LinphoneParsingError('unexpected data: %r' % lines[0])
 
+    # The other headers are decoded when the body is read
     if first_header == 'Status':
-        status_callback(first_value, message)
+        status_callback(first_value, Body(lines))
+    elif first_header != 'Event-type':
+        raise LinphoneParsingError('unexpected data: %r' % lines[0])
+    elif event_callback:
+        event_callback(first_value, Body(lines))
 
 
 def _parse_line(line):
     try:
-        header, value = line.split(':', 1)
+        header, value = line.decode('utf8', 'replace').split(':', 1)
     except ValueError:
         raise LinphoneParsingError()
     value = value.lstrip()
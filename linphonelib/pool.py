@@ -0,0 +1,210 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import collections
+import threading
+import time
+
+from linphonelib.client import DEFAULT_SETTLE_TIME
+from linphonelib.exceptions import LinphoneException
+from linphonelib.ports import PortAllocator
+from linphonelib.server import DEFAULT_START_TIMEOUT
+from linphonelib.session import DEFAULT_STOP_TIMEOUT, _LinphoneWrapper
+
+DEFAULT_MAX_SIZE = 16
+DEFAULT_MIN_IDLE = 1
+DEFAULT_MAX_IDLE = 4
+DEFAULT_LEASE_TIMEOUT = 30
+
+
+class DaemonPool:
+    """Keep linphone-daemon containers booted ahead of demand.
+
+    `ports` yields the (sip_port, rtp_port) pairs given to new daemons, or is a
+    `PortAllocator` the daemons allocate their ports from and release them to
+    when stopped. A `Session(..., pool=pool)` leases a started daemon and gives
+    it back on close. A returned daemon is reset (calls terminated, accounts
+    unregistered) and kept for the next session, unless `max_idle` daemons are
+    already waiting or the pool is closed. Daemons that fail their health check
+    or reset are evicted and their ports reused. The other options are given to
+    each daemon, as for a `Session`.
+    """
+
+    def __init__(
+        self,
+        ports,
+        max_size=DEFAULT_MAX_SIZE,
+        min_idle=DEFAULT_MIN_IDLE,
+        max_idle=DEFAULT_MAX_IDLE,
+        logfile=None,
+        server_factory=None,
+        docker=None,
+        start_timeout=DEFAULT_START_TIMEOUT,
+        stop_timeout=DEFAULT_STOP_TIMEOUT,
+        settle_time=DEFAULT_SETTLE_TIME,
+    ):
+        if not 0 <= min_idle <= max_idle <= max_size:
+            raise ValueError('Expected 0 <= min_idle <= max_idle <= max_size')
+        if isinstance(ports, PortAllocator):
+            self._port_allocator, self._ports = ports, None
+        else:
+            self._port_allocator, self._ports = None, iter(ports)
+        self._free_ports = collections.deque()
+        self._max_size = max_size
+        self._min_idle = min_idle
+        self._max_idle = max_idle
+        self._logfile = logfile
+        self._server_factory = server_factory
+        self._docker = docker
+        self._start_timeout = start_timeout
+        self._stop_timeout = stop_timeout
+        self._settle_time = settle_time
+        self._idle = collections.deque()
+        self._leased = set()
+        self._size = 0
+        self._warming = False
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def idle_count(self):
+        return len(self._idle)
+
+    @property
+    def leased_count(self):
+        return len(self._leased)
+
+    def warm(self):
+        while True:
+            with self._condition:
+                if len(self._idle) >= self._min_idle or self._size >= self._max_size:
+                    return
+                self._size += 1
+            self._add_idle(self._create())
+
+    def lease(self, timeout=DEFAULT_LEASE_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        while True:
+            wrapper = self._take_idle_or_reserve(deadline)
+            if wrapper is None:
+                wrapper = self._create()
+            elif not self._is_healthy(wrapper):
+                self._evict(wrapper)
+                continue
+
+            with self._condition:
+                self._leased.add(wrapper)
+            self._warm_in_background()
+            return wrapper
+
+    def release(self, wrapper):
+        with self._condition:
+            if wrapper not in self._leased:
+                return
+            self._leased.remove(wrapper)
+            keep = not self._closed and len(self._idle) < self._max_idle
+
+        if not keep:
+            self._evict(wrapper)
+            return
+
+        try:
+            wrapper.reset()
+        except LinphoneException:
+            self._evict(wrapper)
+            return
+        self._add_idle(wrapper)
+
+    def close(self):
+        """Stop the idle daemons, the leased ones are stopped when released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = list(self._idle), collections.deque()
+        for wrapper in idle:
+            self._evict(wrapper)
+
+    def _take_idle_or_reserve(self, deadline):
+        # Return an idle daemon, or None after reserving room for a new one
+        with self._condition:
+            while not self._idle and self._size >= self._max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LinphoneException('No linphone daemon available in pool')
+                self._condition.wait(remaining)
+            if self._idle:
+                return self._idle.popleft()
+            self._size += 1
+            return None
+
+    def _add_idle(self, wrapper):
+        with self._condition:
+            self._idle.append(wrapper)
+            self._condition.notify()
+
+    def _create(self):
+        try:
+            wrapper = _LinphoneWrapper(
+                *self._next_ports(),
+                self._logfile,
+                persistent=True,
+                port_allocator=self._port_allocator,
+                start_timeout=self._start_timeout,
+                stop_timeout=self._stop_timeout,
+                docker=self._docker,
+                server_factory=self._server_factory,
+                settle_time=self._settle_time,
+            )
+            try:
+                wrapper.start()
+            except Exception:
+                wrapper.stop_and_clean()
+                raise
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        return wrapper
+
+    def _next_ports(self):
+        if self._port_allocator is not None:
+            return None, None  # allocated by the daemon when started
+        with self._condition:
+            if self._free_ports:
+                return self._free_ports.popleft()
+            try:
+                return next(self._ports)
+            except StopIteration:
+                raise LinphoneException('No more ports available for the pool')
+
+    def _is_healthy(self, wrapper):
+        return wrapper.is_running()
+
+    def _evict(self, wrapper):
+        try:
+            wrapper.stop_and_clean()
+        except LinphoneException as e:
+            if self._logfile:
+                self._logfile.write(str(e))
+        with self._condition:
+            self._size -= 1
+            if self._port_allocator is None:
+                self._free_ports.append(wrapper.ports)
+            self._condition.notify()
+
+    def _warm_in_background(self):
+        with self._condition:
+            if self._warming or len(self._idle) >= self._min_idle:
+                return
+            self._warming = True
+        threading.Thread(target=self._warm_and_reset_flag, daemon=True).start()
+
+    def _warm_and_reset_flag(self):
+        try:
+            self.warm()
+        except Exception as e:
+            if self._logfile:
+                self._logfile.write(str(e))
+        finally:
+            with self._condition:
+                self._warming = False
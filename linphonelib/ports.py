@@ -0,0 +1,123 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import collections
+import fcntl
+import os
+import socket
+import tempfile
+import threading
+
+from linphonelib.exceptions import LinphoneException
+
+DEFAULT_SIP_PORT_START = 15060
+DEFAULT_RTP_PORT_START = 20000
+DEFAULT_BLOCK_COUNT = 1000
+DEFAULT_LOCK_DIR = os.path.join(tempfile.gettempdir(), 'linphonelib-ports')
+
+PortBlock = collections.namedtuple('PortBlock', ['sip_port', 'rtp_port'])
+
+
+class PortAllocator:
+    """Hand out SIP and RTP ports that no other session is using.
+
+    Block `i` is made of the SIP port `sip_port_start + i` and the RTP ports
+    `rtp_port_start + 2 * i` (RTP) and the next one (RTCP). Blocks are shared
+    between processes through a lock file per block in `lock_dir`, held for as
+    long as the block is allocated and released by the system if the process
+    dies. Blocks whose ports are already bound on the host are skipped.
+
+    Iterating over the allocator allocates blocks. A DaemonPool fed from the
+    allocator releases the blocks of the daemons it stops.
+    """
+
+    def __init__(
+        self,
+        sip_port_start=DEFAULT_SIP_PORT_START,
+        rtp_port_start=DEFAULT_RTP_PORT_START,
+        count=DEFAULT_BLOCK_COUNT,
+        lock_dir=DEFAULT_LOCK_DIR,
+    ):
+        self._sip_port_start = sip_port_start
+        self._rtp_port_start = rtp_port_start
+        self._count = count
+        self._lock_dir = lock_dir
+        self._lock = threading.Lock()
+        self._lock_files = {}
+        self._rejected = set()
+        self._next_index = 0
+
+    def __iter__(self):
+        while True:
+            yield self.allocate()
+
+    def allocate(self):
+        with self._lock:
+            for offset in range(self._count):
+                index = (self._next_index + offset) % self._count
+                block = self._block(index)
+                if block in self._lock_files or block in self._rejected:
+                    continue
+                if not self._lock_block(block):
+                    continue
+                if not _is_free(block):
+                    self._unlock_block(block)
+                    continue
+                self._next_index = index + 1
+                return block
+        raise LinphoneException('No free SIP/RTP port block available')
+
+    def release(self, block):
+        with self._lock:
+            if block in self._lock_files:
+                self._unlock_block(block)
+
+    def reject(self, block):
+        # The daemon failed to use this block, never hand it out again
+        with self._lock:
+            self._rejected.add(block)
+            if block in self._lock_files:
+                self._unlock_block(block)
+
+    def _block(self, index):
+        return PortBlock(self._sip_port_start + index, self._rtp_port_start + 2 * index)
+
+    def _lock_block(self, block):
+        os.makedirs(self._lock_dir, exist_ok=True)
+        path = os.path.join(self._lock_dir, f'{block.sip_port}.lock')
+        lock_file = open(path, 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_files[block] = lock_file
+        return True
+
+    def _unlock_block(self, block):
+        lock_file = self._lock_files.pop(block)
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+
+def _is_free(block):
+    ports = (block.sip_port, block.rtp_port, block.rtp_port + 1)
+    for port in ports:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            try:
+                sock.bind(('', port))
+            except OSError:
+                return False
+    return True
+
+
+_default_allocator = None
+_default_allocator_lock = threading.Lock()
+
+
+def default_port_allocator():
+    global _default_allocator
+    with _default_allocator_lock:
+        if _default_allocator is None:
+            _default_allocator = PortAllocator()
+        return _default_allocator
@@ -0,0 +1,242 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bisect
+import heapq
+import math
+import threading
+import time
+from array import array
+
+from linphonelib.exceptions import LinphoneException
+
+DEFAULT_INTERVAL = 1
+DEFAULT_CAPACITY = 600
+MOS_THRESHOLDS = (4.0, 3.6, 3.1)
+METRICS = (
+    'round_trip_delay',
+    'received_jitter',
+    'sent_jitter',
+    'received_loss_rate',
+    'sent_loss_rate',
+    'upload_bandwidth',
+    'download_bandwidth',
+)
+
+
+class QualitySeries:
+    """Last `capacity` call-stats samples of a call, one array per metric.
+
+    The arrays are allocated once; when full, the oldest sample is overwritten.
+    A metric missing from a sample is stored as NaN and left out of the
+    summaries.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.timestamps = array('d', [0.0]) * capacity
+        self.columns = {metric: array('d', [math.nan]) * capacity for metric in METRICS}
+        self._next = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, timestamp, stats):
+        index = self._next
+        self.timestamps[index] = timestamp
+        for metric, column in self.columns.items():
+            value = getattr(stats, metric)
+            column[index] = math.nan if value is None else value
+        self._next = (index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def values(self, metric):
+        return self._chronological(self.columns[metric])
+
+    def times(self):
+        return self._chronological(self.timestamps)
+
+    def summary(self, metric):
+        return summarize(self.values(metric))
+
+    def summaries(self):
+        return {metric: self.summary(metric) for metric in METRICS}
+
+    def loss_bursts(self, metric='received_loss_rate', threshold=0):
+        """Return the length of each run of consecutive samples over the threshold."""
+        bursts = []
+        length = 0
+        for value in self.values(metric):
+            if value > threshold:
+                length += 1
+            elif length:
+                bursts.append(length)
+                length = 0
+        if length:
+            bursts.append(length)
+        return bursts
+
+    def _chronological(self, column):
+        if self.count < self.capacity:
+            return column[: self.count]
+        return column[self._next :] + column[: self._next]
+
+
+class QualitySampler:
+    """Poll the call-stats of a session at a fixed cadence.
+
+    The image runs linphone-daemon with --disable-stats-events, so the stats
+    are polled. `series` holds a `QualitySeries` per call ID. Call `sample` from
+    your own loop or `start` a background thread that samples every `interval`
+    seconds; the session can still be used meanwhile.
+    """
+
+    def __init__(self, session, interval=DEFAULT_INTERVAL, capacity=DEFAULT_CAPACITY):
+        self.series = {}
+        self._session = session
+        self._interval = interval
+        self._capacity = capacity
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def sample(self):
+        try:
+            stats = self._session.call_stats()
+        except LinphoneException:
+            return None  # no call in progress
+        series = self.series.get(stats.call_id)
+        if series is None:
+            series = self.series[stats.call_id] = QualitySeries(self._capacity)
+        series.append(time.time(), stats)
+        return stats
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        next_at = time.monotonic()
+        while not self._stopped.is_set():
+            self.sample()
+            # Keep the cadence whatever the time taken by the command
+            next_at += self._interval
+            self._stopped.wait(max(0, next_at - time.monotonic()))
+
+
+class QualityReport:
+    """Call-stats of many sessions at one instant, one array per metric.
+
+    The i-th value of each column belongs to the i-th session. Sessions without
+    call have NaN values and are counted in `failures`. `mos` is estimated for
+    each call from its round-trip delay, received jitter and loss rate.
+    """
+
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+        size = len(self.sessions)
+        self.columns = {metric: array('d', [math.nan]) * size for metric in METRICS}
+        self.mos = array('d', [math.nan]) * size
+        self.failures = {}
+
+    @property
+    def calls(self):
+        return sum(1 for mos in self.mos if not math.isnan(mos))
+
+    def store(self, index, stats):
+        for metric, column in self.columns.items():
+            value = getattr(stats, metric)
+            column[index] = math.nan if value is None else value
+
+    def estimate_mos(self):
+        self.mos = array(
+            'd',
+            map(
+                estimate_mos,
+                self.columns['round_trip_delay'],
+                self.columns['received_jitter'],
+                self.columns['received_loss_rate'],
+            ),
+        )
+
+    def summary(self, metric='mos'):
+        return summarize(self._column(metric))
+
+    def summaries(self):
+        return {metric: self.summary(metric) for metric in ('mos',) + METRICS}
+
+    def worst(self, count=10, metric='mos'):
+        """Return the (session, value) of the worst calls, lowest MOS or highest metric."""
+        column = self._column(metric)
+        indexes = [i for i, value in enumerate(column) if not math.isnan(value)]
+        select = heapq.nsmallest if metric == 'mos' else heapq.nlargest
+        worst = select(count, indexes, key=column.__getitem__)
+        return [(self.sessions[i], column[i]) for i in worst]
+
+    def share_over(self, thresholds=MOS_THRESHOLDS):
+        """Return, for each MOS threshold, the share of the calls at or over it."""
+        mos = sorted(value for value in self.mos if not math.isnan(value))
+        if not mos:
+            return {threshold: 0.0 for threshold in thresholds}
+        return {
+            threshold: (len(mos) - bisect.bisect_left(mos, threshold)) / len(mos)
+            for threshold in thresholds
+        }
+
+    def _column(self, metric):
+        return self.mos if metric == 'mos' else self.columns[metric]
+
+
+def estimate_mos(round_trip_delay, jitter, loss_rate):
+    """Estimate the MOS of a call with a simplified ITU-T G.107 E-model.
+
+    Delays are in seconds and the loss rate in percent, as sent by the daemon.
+    """
+    if math.isnan(round_trip_delay) or math.isnan(loss_rate):
+        return math.nan
+    if math.isnan(jitter):
+        jitter = 0
+    latency = round_trip_delay * 1000 / 2 + jitter * 1000 * 2 + 10
+    if latency < 160:
+        r = 93.2 - latency / 40
+    else:
+        r = 93.2 - (latency - 120) / 10
+    r -= 2.5 * loss_rate
+    if r <= 0:
+        return 1.0
+    if r >= 100:
+        return 4.5
+    return 1 + 0.035 * r + 0.000007 * r * (r - 60) * (100 - r)
+
+
+def summarize(values):
+    values = sorted(value for value in values if not math.isnan(value))
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'mean': math.fsum(values) / len(values),
+        'min': values[0],
+        'p50': percentile(values, 50),
+        'p90': percentile(values, 90),
+        'p99': percentile(values, 99),
+        'max': values[-1],
+    }
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
@@ -0,0 +1,400 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import collections
+import heapq
+import itertools
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import Future
+
+from linphonelib.base_command import PipelineCommand
+from linphonelib.client import DEFAULT_TIMEOUT
+from linphonelib.exceptions import CommandTimeoutException, LinphoneConnectionError
+from linphonelib.tracing import CONNECT, HANDLED, NULL_TRACE, PARSED, SEND
+
+
+class Reactor:
+    """Drive the commands of many `LinphoneClient` from a single thread.
+
+    `submit` queues a command for a client and returns a `Future` of its
+    result. The reactor thread sends the commands of each client one at a time,
+    waits for all the sockets with a selector and resolves the futures as the
+    responses are parsed. A command fails with `CommandTimeoutException` when
+    its response is not parsed before its deadline, `timeout` seconds after it
+    was submitted; the connection of its client is then dropped, as the
+    response may still arrive later.
+
+    The clients stay connected, so their events are published as they arrive,
+    from the reactor thread. A message left incomplete by a read is taken as
+    complete when nothing more is read within the settle time of its client,
+    without waiting on the reactor thread.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self._timeout = timeout
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+        self._selector.register(self._wakeup_reader, selectors.EVENT_READ)
+        self._channels = {}
+        self._calls = collections.deque()
+        self._deadlines = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the reactor thread, fail the pending commands and disconnect."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._wakeup()
+        self._thread.join()
+        self._thread = None
+
+    def close(self):
+        self.stop()
+        self._selector.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+    def submit(self, client, cmd, timeout=None, trace=NULL_TRACE):
+        if timeout is None:
+            timeout = self._timeout
+        request = _Request(cmd, time.monotonic() + timeout, trace)
+        try:
+            # Built by the caller thread, so an invalid command fails its future only
+            request.text = cmd.command
+        except Exception as e:
+            request.future.set_exception(e)
+        else:
+            if request.count == 0:
+                request.future.set_result([])
+            elif not self._call_soon(self._enqueue, self._channel(client), request):
+                request.future.set_exception(
+                    LinphoneConnectionError('Reactor is not running')
+                )
+        return request.future
+
+    def watch(self, client):
+        """Connect a client to receive its events, without sending a command."""
+        future = Future()
+        if not self._call_soon(self._watch, self._channel(client), future):
+            future.set_exception(LinphoneConnectionError('Reactor is not running'))
+        return future
+
+    def forget(self, client):
+        """Fail the pending commands of a client and disconnect it."""
+        future = Future()
+        if not self._call_soon(self._forget, self._channel(client), future):
+            future.set_result(None)  # stopping the reactor disconnects every client
+        return future
+
+    def wait_events(self, client, timeout):
+        """Wait until data is read from a client, as `LinphoneClient.read_events`."""
+        self.watch(client).result()
+        received = self._channel(client).received
+        if not received.wait(timeout):
+            return False
+        received.clear()
+        return True
+
+    def _channel(self, client):
+        with self._lock:
+            channel = self._channels.get(client)
+            if channel is None:
+                channel = self._channels[client] = _Channel(client)
+            return channel
+
+    def _call_soon(self, function, *args):
+        with self._lock:
+            if not self._running:
+                return False
+            self._calls.append((function, args))
+        self._wakeup()
+        return True
+
+    def _wakeup(self):
+        try:
+            self._wakeup_writer.send(b'\0')
+        except BlockingIOError:
+            pass  # the reactor already has a wake up pending
+
+    def _run(self):
+        while self._running:
+            self._poll()
+        self._run_calls()
+        self._shutdown()
+
+    def _poll(self):
+        timeout = None
+        while self._deadlines and self._deadlines[0][2].done:
+            heapq.heappop(self._deadlines)
+        if self._deadlines:
+            timeout = max(0, self._deadlines[0][0] - time.monotonic())
+
+        for key, _ in self._selector.select(timeout):
+            if key.fileobj is self._wakeup_reader:
+                self._drain_wakeup()
+            else:
+                self._read(key.data)
+        self._run_calls()
+        self._expire(time.monotonic())
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_reader.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _run_calls(self):
+        while True:
+            with self._lock:
+                if not self._calls:
+                    return
+                function, args = self._calls.popleft()
+            function(*args)
+
+    def _enqueue(self, channel, request):
+        if not request.future.set_running_or_notify_cancel():
+            return
+        request.channel = channel
+        channel.requests.append(request)
+        heapq.heappush(
+            self._deadlines, (request.deadline, next(self._sequence), request)
+        )
+        if len(channel.requests) == 1:
+            self._send_next(channel)
+
+    def _watch(self, channel, future):
+        try:
+            self._connect(channel)
+        except LinphoneConnectionError as e:
+            self._disconnect(channel)
+            future.set_exception(e)
+        else:
+            future.set_result(None)
+
+    def _forget(self, channel, future):
+        self._fail_all(channel, LinphoneConnectionError('Client forgotten'))
+        self._disconnect(channel)
+        with self._lock:
+            self._channels.pop(channel.client, None)
+        future.set_result(None)
+
+    def _connect(self, channel):
+        if not channel.connected:
+            channel.client.connect()
+            self._selector.register(channel.client, selectors.EVENT_READ, channel)
+            channel.connected = True
+
+    def _disconnect(self, channel):
+        channel.flush = None
+        if channel.connected:
+            self._selector.unregister(channel.client)
+            channel.connected = False
+        channel.client.trace = NULL_TRACE
+        channel.client.disconnect()
+
+    def _send_next(self, channel):
+        while channel.requests:
+            request = channel.requests[0]
+            try:
+                self._send(channel, request)
+                return
+            except Exception as e:
+                self._disconnect(channel)
+                channel.requests.popleft()
+                request.future.set_exception(e)
+
+    def _send(self, channel, request):
+        channel.client.clear_status_messages()
+        channel.client.trace = request.trace
+        try:
+            self._connect(channel)
+            request.trace.mark(CONNECT)
+            channel.client.send_data(request.text)
+        except LinphoneConnectionError:
+            # The connection may be stale, retry once on a new one
+            self._disconnect(channel)
+            channel.client.trace = request.trace
+            self._connect(channel)
+            channel.client.send_data(request.text)
+        request.trace.mark(SEND)
+        request.sent = True
+
+    def _read(self, channel):
+        channel.flush = None
+        try:
+            wait = channel.client.read_available()
+        except Exception as e:
+            # The connection is closed or its data cannot be parsed: start over
+            self._disconnect(channel)
+            self._fail_sent(channel, e)
+            channel.received.set()
+            self._send_next(channel)
+            return
+        channel.received.set()
+        if wait is not None:
+            channel.flush = _Flush(channel)
+            heapq.heappush(
+                self._deadlines,
+                (time.monotonic() + wait, next(self._sequence), channel.flush),
+            )
+        self._complete(channel)
+
+    def _flush(self, channel):
+        channel.flush = None
+        channel.client.flush_incomplete()
+        self._complete(channel)
+
+    def _complete(self, channel):
+        while channel.requests and channel.requests[0].sent:
+            request = channel.requests[0]
+            messages = channel.client.take_status_messages(request.count)
+            if messages is None:
+                return
+            request.messages += messages
+            if request.count is None and not request.cmd.has_all_responses(
+                request.messages
+            ):
+                return
+            channel.requests.popleft()
+            channel.client.trace = NULL_TRACE
+            request.trace.mark(PARSED)
+            try:
+                result = request.cmd.handle_responses(request.messages)
+            except Exception as e:
+                # Raised to the caller, as if the command was executed by its thread
+                request.future.set_exception(e)
+            else:
+                request.trace.mark(HANDLED)
+                request.future.set_result(result)
+            self._send_next(channel)
+
+    def _expire(self, now):
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, entry = heapq.heappop(self._deadlines)
+            if entry.done:
+                continue
+            if isinstance(entry, _Flush):
+                self._flush(entry.channel)
+                continue
+            request = entry
+            channel = request.channel
+            channel.requests.remove(request)
+            request.future.set_exception(
+                CommandTimeoutException(f'{request.name}: timed out')
+            )
+            if request.sent:
+                # Do not mix the late response with the next command
+                self._disconnect(channel)
+                self._send_next(channel)
+
+    def _fail_sent(self, channel, error):
+        if channel.requests and channel.requests[0].sent:
+            request = channel.requests.popleft()
+            request.future.set_exception(
+                CommandTimeoutException(f'{request.name}: {error}')
+            )
+
+    def _fail_all(self, channel, error):
+        while channel.requests:
+            request = channel.requests.popleft()
+            request.future.set_exception(error)
+
+    def _shutdown(self):
+        with self._lock:
+            channels = list(self._channels.values())
+            self._channels.clear()
+        for channel in channels:
+            self._fail_all(channel, LinphoneConnectionError('Reactor stopped'))
+            self._disconnect(channel)
+        self._deadlines.clear()
+
+
+class _Channel:
+    __slots__ = ('client', 'requests', 'received', 'connected', 'flush')
+
+    def __init__(self, client):
+        self.client = client
+        self.requests = collections.deque()
+        # Set by the reactor thread when data is read, for `wait_events`
+        self.received = threading.Event()
+        self.connected = False
+        # The pending flush of the message left incomplete by the last read
+        self.flush = None
+
+
+class _Flush:
+    __slots__ = ('channel',)
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    @property
+    def done(self):
+        # Replaced by the next read, or dropped with the connection
+        return self.channel.flush is not self
+
+
+class _Request:
+    __slots__ = (
+        'cmd',
+        'text',
+        'future',
+        'deadline',
+        'trace',
+        'channel',
+        'sent',
+        'count',
+        'messages',
+    )
+
+    def __init__(self, cmd, deadline, trace):
+        self.cmd = cmd
+        self.text = None
+        self.future = Future()
+        self.deadline = deadline
+        self.trace = trace
+        self.channel = None
+        self.sent = False
+        # A pipeline waits for one status per command, other commands take all
+        # the statuses of the reads until they have all their responses, as
+        # `BaseCommand.execute`
+        self.count = len(cmd) if isinstance(cmd, PipelineCommand) else None
+        self.messages = []
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    @property
+    def name(self):
+        return self.cmd.__class__.__name__
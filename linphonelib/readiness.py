@@ -0,0 +1,102 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import ctypes
+import ctypes.util
+import os
+import select
+import socket
+import time
+
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_IN_CREATE = 0x00000100
+_IN_MOVED_TO = 0x00000080
+_MIN_BACKOFF = 0.001
+_MAX_BACKOFF = 0.05
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+
+
+def wait_for_path(path, timeout):
+    """Wait until `path` exists, return False if it did not within `timeout`.
+
+    On Linux, the parent directory is watched with inotify so the wait returns as
+    soon as the file is created. Elsewhere the path is polled with a short backoff.
+    """
+    deadline = time.monotonic() + timeout
+    watch_fd = _watch_directory(os.path.dirname(path))
+    if watch_fd is None:
+        return _poll(lambda: os.path.exists(path), deadline)
+
+    try:
+        # Check after the watch is set so that a creation in between is not missed
+        while not os.path.exists(path):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([watch_fd], [], [], remaining)
+            if readable:
+                _drain(watch_fd)
+        return True
+    finally:
+        os.close(watch_fd)
+
+
+def wait_for_connectable(path, timeout):
+    """Wait until a unix socket at `path` accepts connections."""
+    deadline = time.monotonic() + timeout
+    if not wait_for_path(path, timeout):
+        return False
+    return _poll(lambda: _can_connect(path), deadline)
+
+
+def _watch_directory(directory):
+    if _libc is None:
+        return None
+    fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    if fd < 0:
+        return None
+    mask = _IN_CREATE | _IN_MOVED_TO
+    if _libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _drain(fd):
+    try:
+        while os.read(fd, 4096):
+            pass
+    except BlockingIOError:
+        pass
+
+
+def _can_connect(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def _poll(predicate, deadline):
+    backoff = _MIN_BACKOFF
+    while not predicate():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(backoff, remaining))
+        backoff = min(backoff * 2, _MAX_BACKOFF)
+    return True
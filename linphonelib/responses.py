@@ -0,0 +1,93 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from collections.abc import Mapping
+
+
+class Body(Mapping):
+    """Headers of a daemon message, decoded on first access.
+
+    The raw lines are kept until a header is read, so the messages nobody looks
+    at, e.g. the events without subscriber, are never decoded.
+    """
+
+    __slots__ = ('_lines', '_fields')
+
+    def __init__(self, lines=None, fields=None):
+        self._lines = lines
+        self._fields = fields
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        if isinstance(mapping, Body):
+            return cls(mapping._lines, mapping._fields)
+        return cls(fields=dict(mapping))
+
+    def __getitem__(self, key):
+        return self._decoded()[key]
+
+    def __iter__(self):
+        return iter(self._decoded())
+
+    def __len__(self):
+        return len(self._decoded())
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._decoded()!r})'
+
+    def _decoded(self):
+        if self._fields is None:
+            fields = {}
+            for line in self._lines:
+                header, sep, value = line.decode('utf8', 'replace').partition(':')
+                if sep:  # ignore invalid line
+                    fields[header] = value.lstrip()
+            self._fields, self._lines = fields, None
+        return self._fields
+
+
+class _Number:
+    def __init__(self, header, convert=float):
+        self._header = header
+        self._convert = convert
+
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance._numbers[self._name]
+        except KeyError:
+            pass
+        try:
+            value = self._convert(instance[self._header])
+        except (KeyError, ValueError):
+            value = None
+        instance._numbers[self._name] = value
+        return value
+
+
+class CallStats(Body):
+    """Statistics of a call, from the call-stats command.
+
+    The numeric attributes are converted from their header once, on first
+    access, and are None when the daemon did not send them.
+    """
+
+    __slots__ = ('_numbers',)
+
+    call_id = _Number('Id', int)
+    round_trip_delay = _Number('Audio-RoundTrip delay')
+    jitter_buffer_size = _Number('Audio-Jitter buffer size')
+    received_loss_rate = _Number('Audio-Received loss rate')
+    sent_loss_rate = _Number('Audio-Sent loss rate')
+    received_jitter = _Number('Audio-Received interarrival jitter')
+    sent_jitter = _Number('Audio-Sent interarrival jitter')
+    upload_bandwidth = _Number('Audio-Upload bandwidth')
+    download_bandwidth = _Number('Audio-Download bandwidth')
+
+    def __init__(self, lines=None, fields=None):
+        super().__init__(lines, fields)
+        self._numbers = {}
@@ -1,61 +1,256 @@
-# Copyright 2019-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import abc
+import collections
 import os
 import subprocess
 import time
 
+from linphonelib import readiness
+from linphonelib.exceptions import ServerStartException
 
-# NOTE: Improve using docker python library
-class LinphoneServer:
-    _DOCKER_IMG = "wazoplatform/wazo-linphone"
+DEFAULT_LIVENESS_TTL = 30
+DEFAULT_START_TIMEOUT = 5
+DEFAULT_DAEMON_PATH = 'linphone-daemon'
+
+
+class LivenessTracker:
+    """Remember that the server is alive to avoid checking it before every command.
+
+    The server is assumed alive until the TTL expires or a connection failure is
+    reported. `hits` counts the checks answered from the tracker, `misses` the
+    checks that had to ask the server for real.
+    """
+
+    def __init__(self, ttl=DEFAULT_LIVENESS_TTL):
+        self._ttl = ttl
+        self._expires_at = None
+        self.hits = 0
+        self.misses = 0
+
+    def is_alive(self):
+        if self._expires_at is not None and time.monotonic() < self._expires_at:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def mark_alive(self):
+        self._expires_at = time.monotonic() + self._ttl
+
+    def invalidate(self):
+        self._expires_at = None
+
+
+class DockerCLI:
+    """Drive docker by running its command line client."""
+
+    def is_running(self, name):
+        cmd = ['docker', 'container', 'ls', '-qf', f'name={name}']
+        result = subprocess.run(cmd, stdout=subprocess.PIPE)
+        return len(result.stdout) > 0
+
+    def run(self, name, image, volumes):
+        cmd = ['docker', 'run', '--rm', '--detach', '--name', name]
+        for source, destination in volumes.items():
+            cmd.extend(['--volume', f'{source}:{destination}'])
+        cmd.append(image)
+        subprocess.run(cmd, stdout=subprocess.DEVNULL)
 
-    def __init__(self, socket_file, mount_path, logfile):
+    def kill(self, *names):
+        if names:
+            subprocess.run(['docker', 'kill', *names])
+
+    def wait(self, name, timeout):
+        # docker wait returns as soon as the container exits, or fails at once if
+        # the container is already removed
+        cmd = ['docker', 'wait', name]
+        try:
+            subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return False
+        return True
+
+
+_DOCKER_CLI = DockerCLI()
+
+
+class BaseLinphoneServer(metaclass=abc.ABCMeta):
+    def __init__(
+        self,
+        socket_file,
+        mount_path,
+        logfile,
+        liveness=None,
+        start_timeout=DEFAULT_START_TIMEOUT,
+    ):
         self._mount_path = mount_path
         self._socket_file = socket_file
         self._logfile = logfile
-        self._docker_name = os.path.basename(self._mount_path)
+        self._start_timeout = start_timeout
+        self.liveness = liveness or LivenessTracker()
 
     def _log_write(self, message):
         if self._logfile:
             self._logfile.write(message)
 
     def is_running(self):
-        cmd = ['docker', 'container', 'ls', '-qf', f'name={self._docker_name}']
-        result = subprocess.run(cmd, stdout=subprocess.PIPE)
-        return len(result.stdout)
+        return self.liveness.is_alive() or self.check_running()
 
+    def invalidate_liveness(self):
+        self.liveness.invalidate()
+
+    def _wait_until_ready(self):
+        if not readiness.wait_for_connectable(self._socket_file, self._start_timeout):
+            raise ServerStartException('Unable to connect to socket file')
+
+    @abc.abstractmethod
+    def check_running(self):
+        pass
+
+    @abc.abstractmethod
     def start(self):
-        cmd = [
-            'docker',
-            'run',
-            '--rm',
-            '--detach',
-            '--name',
+        pass
+
+    @abc.abstractmethod
+    def force_stop(self):
+        pass
+
+    @abc.abstractmethod
+    def wait_until_stopped(self, timeout):
+        pass
+
+
+class LinphoneServer(BaseLinphoneServer):
+    _DOCKER_IMG = "wazoplatform/wazo-linphone"
+
+    def __init__(
+        self,
+        socket_file,
+        mount_path,
+        logfile,
+        liveness=None,
+        start_timeout=DEFAULT_START_TIMEOUT,
+        docker=None,
+    ):
+        super().__init__(socket_file, mount_path, logfile, liveness, start_timeout)
+        self._docker_name = os.path.basename(self._mount_path)
+        self._docker = docker or _DOCKER_CLI
+
+    def check_running(self):
+        running = self._docker.is_running(self._docker_name)
+        if running:
+            self.liveness.mark_alive()
+        return running
+
+    def start(self):
+        self._log_write('Starting linphone container...')
+        self._docker.run(
             self._docker_name,
-            '--volume',
-            f'{self._mount_path}:/tmp/linphone',
             self._DOCKER_IMG,
-        ]
-        self._log_write('Starting linphone container...')
-        subprocess.run(cmd, stdout=subprocess.DEVNULL)
+            {self._mount_path: '/tmp/linphone'},
+        )
         self._log_write('Waiting linphone container is ready...')
         self._wait_until_ready()
+        self.liveness.mark_alive()
         self._log_write('Linphone container ready!')
 
     def force_stop(self):
-        cmd = ['docker', 'kill', self._docker_name]
-        subprocess.run(cmd)
+        self.liveness.invalidate()
+        self._docker.kill(self._docker_name)
 
-    def _is_ready(self):
-        return os.path.exists(self._socket_file)
+    def wait_until_stopped(self, timeout):
+        self.liveness.invalidate()
+        return self._docker.wait(self._docker_name, timeout)
 
-    def _wait_until_ready(self):
-        tries = 10
-        interval = 0.5
-        for _ in range(tries):
-            if self._is_ready():
-                return
-            time.sleep(interval)
-
-        raise Exception('Unable to get socket file')
+
+class LinphoneProcessServer(BaseLinphoneServer):
+    """Run linphone-daemon as a child process, without container.
+
+    The daemon is launched like the docker image entrypoint does, with the
+    linphonerc and socket of the mount path.
+    """
+
+    def __init__(
+        self,
+        socket_file,
+        mount_path,
+        logfile,
+        liveness=None,
+        start_timeout=DEFAULT_START_TIMEOUT,
+        daemon_path=DEFAULT_DAEMON_PATH,
+    ):
+        super().__init__(socket_file, mount_path, logfile, liveness, start_timeout)
+        self._config_file = os.path.join(self._mount_path, 'linphonerc')
+        self._daemon_path = daemon_path
+        self._process = None
+
+    def check_running(self):
+        running = self._process is not None and self._process.poll() is None
+        if running:
+            self.liveness.mark_alive()
+        return running
+
+    def start(self):
+        cmd = [
+            self._daemon_path,
+            '--disable-stats-events',
+            '--config',
+            self._config_file,
+            '--pipe',
+            self._socket_file,
+        ]
+        self._log_write('Starting linphone daemon process...')
+        try:
+            self._process = subprocess.Popen(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            raise ServerStartException(f'Unable to run {self._daemon_path}: {e}')
+        self._log_write('Waiting linphone daemon is ready...')
+        try:
+            self._wait_until_ready()
+        except ServerStartException:
+            self.force_stop()
+            raise
+        self.liveness.mark_alive()
+        self._log_write('Linphone daemon ready!')
+
+    def force_stop(self):
+        self.liveness.invalidate()
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+
+    def wait_until_stopped(self, timeout):
+        self.liveness.invalidate()
+        if self._process is None:
+            return True
+        try:
+            self._process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            return False
+        return True
+
+
+def force_stop_all(servers):
+    """Kill many servers at once.
+
+    The containers are killed with one call per docker client, the other
+    servers one by one.
+    """
+    containers = collections.defaultdict(list)
+    for server in servers:
+        if isinstance(server, LinphoneServer):
+            server.liveness.invalidate()
+            containers[server._docker].append(server._docker_name)
+        else:
+            server.force_stop()
+    for docker, names in containers.items():
+        docker.kill(*names)
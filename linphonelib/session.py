@@ -1,18 +1,26 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import os
 import shutil
 import tempfile
+import threading
 import time
+from concurrent.futures import Future
 from contextlib import contextmanager
 from functools import wraps
 
-from linphonelib.client import LinphoneClient
+from linphonelib.account import Account
+from linphonelib.base_command import PipelineCommand
+from linphonelib.calls import CallRegistry, call_id_of
+from linphonelib.client import DEFAULT_SETTLE_TIME, LinphoneClient
 from linphonelib.commands import (
+    CALL_STATE_STATUSES,
+    REGISTRATION_STATE_STATUSES,
     AnswerCommand,
     CallCommand,
     CallStatsCommand,
+    CallStatus,
     CallStatusCommand,
     DTMFCommand,
     HangupCommand,
@@ -22,68 +30,210 @@ from linphonelib.commands import (
     QuitCommand,
     RegisterCommand,
     RegisterStatusCommand,
+    RegisterStatusesCommand,
     ResumeCommand,
     TransferCommand,
     UnregisterCommand,
 )
-from linphonelib.exceptions import LinphoneException
-from linphonelib.server import LinphoneServer
+from linphonelib.events import (
+    CALL_STATE_CHANGED,
+    DEFAULT_BUFFER_SIZE,
+    REGISTRATION_STATE_CHANGED,
+    EventChannel,
+)
+from linphonelib.exceptions import (
+    CommandTimeoutException,
+    LinphoneConnectionError,
+    LinphoneException,
+    NoActiveCallException,
+    ServerStartException,
+)
+from linphonelib.ports import default_port_allocator
+from linphonelib.server import (
+    DEFAULT_LIVENESS_TTL,
+    DEFAULT_START_TIMEOUT,
+    LinphoneServer,
+    LivenessTracker,
+)
+from linphonelib.tracing import CONNECT, LIVENESS, NULL_TRACE, NULL_TRACER
+
+DEFAULT_WAIT_TIMEOUT = 10
+DEFAULT_STOP_TIMEOUT = 5
 
 
 def _execute(f):
     @wraps(f)
-    def func(self, *args):
-        return self._linphone_wrapper.execute(f(self, *args))
+    def func(self, *args, **kwargs):
+        return self._linphone_wrapper.execute(f(self, *args, **kwargs))
 
     return func
 
 
 class Session:
     def __init__(
-        self, uname, secret, hostname, local_sip_port, local_rtp_port, logfile=None
+        self,
+        uname,
+        secret,
+        hostname,
+        local_sip_port=None,
+        local_rtp_port=None,
+        logfile=None,
+        persistent=False,
+        liveness_ttl=DEFAULT_LIVENESS_TTL,
+        event_buffer_size=DEFAULT_BUFFER_SIZE,
+        pool=None,
+        port_allocator=None,
+        start_timeout=DEFAULT_START_TIMEOUT,
+        stop_timeout=DEFAULT_STOP_TIMEOUT,
+        docker=None,
+        server_factory=None,
+        tracer=None,
+        capture=None,
+        reactor=None,
+        command_timeout=None,
+        settle_time=DEFAULT_SETTLE_TIME,
     ):
         self._uname = uname
         self._secret = secret
         self._hostname = hostname
-        self._linphone_wrapper = _LinphoneWrapper(
-            local_sip_port, local_rtp_port, logfile
-        )
+        self._pool = pool
+        if pool is not None:
+            if reactor is not None:
+                raise ValueError('A pooled session cannot use a reactor')
+            self._linphone_wrapper = pool.lease()
+        else:
+            port_allocator = _port_allocator_for(
+                local_sip_port, local_rtp_port, port_allocator
+            )
+            self._linphone_wrapper = _LinphoneWrapper(
+                local_sip_port,
+                local_rtp_port,
+                logfile,
+                persistent=persistent,
+                liveness_ttl=liveness_ttl,
+                event_buffer_size=event_buffer_size,
+                port_allocator=port_allocator,
+                start_timeout=start_timeout,
+                stop_timeout=stop_timeout,
+                docker=docker,
+                server_factory=server_factory,
+                capture=capture,
+                reactor=reactor,
+                command_timeout=command_timeout,
+                settle_time=settle_time,
+            )
+        self._linphone_wrapper.tracer = tracer or NULL_TRACER
+        self.calls = CallRegistry()
+        self.events.subscribe(self.calls.on_event)
         self._call_id = None
 
     def __str__(self):
         return 'Session %(_uname)s@%(_hostname)s' % self.__dict__
 
+    @property
+    def liveness(self):
+        return self._linphone_wrapper.liveness
+
+    @property
+    def events(self):
+        return self._linphone_wrapper.events
+
+    @property
+    def tracer(self):
+        return self._linphone_wrapper.tracer
+
+    def latencies(self):
+        return self._linphone_wrapper.tracer.summary()
+
+    def read_events(self, timeout):
+        return self._linphone_wrapper.read_events(timeout)
+
+    def start(self):
+        self._linphone_wrapper.start()
+
     def close(self):
-        self._linphone_wrapper.stop_and_clean()
+        self.events.unsubscribe(self.calls.on_event)
+        if self._pool is not None:
+            self._linphone_wrapper.tracer = NULL_TRACER
+            self._pool.release(self._linphone_wrapper)
+        else:
+            self._linphone_wrapper.stop_and_clean()
+
+    def quit(self):
+        """Ask the daemon to exit without waiting, see `Fleet.teardown`.
+
+        Return whether the daemon was running. The daemon of a pooled session
+        belongs to the pool and is left running.
+        """
+        if self._pool is not None:
+            return False
+        return self._linphone_wrapper.send_quit()
+
+    def wait_until_stopped(self, timeout):
+        if self._pool is not None:
+            return True
+        return self._linphone_wrapper.wait_until_stopped(timeout)
+
+    @property
+    def server(self):
+        return self._linphone_wrapper.server
+
+    def release(self):
+        """Close a session whose daemon was quit, except for its temporary files.
+
+        Return the directory left to remove, if any.
+        """
+        if self._pool is not None:
+            self.close()
+            return None
+        self.events.unsubscribe(self.calls.on_event)
+        return self._linphone_wrapper.release()
+
+    def pipeline(self):
+        return _Pipeline(self)
+
+    def deferred(self, timeout=None):
+        return _Deferred(self, timeout)
 
     @_execute
-    def answer(self):
-        return AnswerCommand()
+    def answer(self, call=None):
+        return AnswerCommand(call_id_of(call))
 
     @_execute
     def call(self, exten):
-        return CallCommand(exten, self._hostname)
+        return _SessionCallCommand(self, exten)
 
     @_execute
     def send_dtmf(self, digit):
         return DTMFCommand(digit)
 
     @_execute
-    def hangup(self):
-        return HangupCommand()
+    def hangup(self, call=None):
+        return HangupCommand(call_id_of(call))
 
-    @_execute
-    def hold(self):
-        self._call_id = self.call_stats()['Id']
-        return HoldCommand()
+    def _hold_command(self, call=None):
+        call_id = call_id_of(call)
+        if call_id is None and self._linphone_wrapper.tracks_events:
+            current = self.calls.current()
+            call_id = current.call_id if current else None
+        return _SessionHoldCommand(self, call_id)
+
+    def hold(self, call=None):
+        if call is None and not self._linphone_wrapper.tracks_events:
+            # The calls may have changed unseen between commands: ask the daemon
+            call = self.call_stats().call_id
+        return self._linphone_wrapper.execute(self._hold_command(call))
+
+    # Pipelines and deferred commands queue the command without the lookup
+    hold.__wrapped__ = _hold_command
 
     @_execute
     def call_status(self):
         return CallStatusCommand()
 
     @_execute
-    def call_stats(self):
-        return CallStatsCommand()
+    def call_stats(self, call=None):
+        return CallStatsCommand(call_id_of(call))
 
     @_execute
     def register(self):
@@ -94,8 +244,17 @@ class Session:
         return RegisterStatusCommand()
 
     @_execute
-    def resume(self):
-        id_to_resume = self._call_id
+    def register_statuses(self):
+        return RegisterStatusesCommand()
+
+    def add_account(self, uname, secret, hostname=None):
+        return Account(
+            self._linphone_wrapper, uname, secret, hostname or self._hostname
+        )
+
+    @_execute
+    def resume(self, call=None):
+        id_to_resume = self._call_id if call is None else call_id_of(call)
         self._call_id = None
         return ResumeCommand(id_to_resume)
 
@@ -115,8 +274,167 @@ class Session:
     def unregister(self):
         return UnregisterCommand()
 
+    def wait_for_call_status(
+        self, status, caller_id=None, timeout=DEFAULT_WAIT_TIMEOUT
+    ):
+        def check():
+            if self._linphone_wrapper.execute(CallStatusCommand(caller_id)) == status:
+                return status
+
+        return self._wait_for(check, _call_status_matcher(status, caller_id), timeout)
+
+    def wait_for_ringing(self, caller_id=None, timeout=DEFAULT_WAIT_TIMEOUT):
+        return self.wait_for_call_status(CallStatus.RINGING, caller_id, timeout)
+
+    def wait_for_answered(self, caller_id=None, timeout=DEFAULT_WAIT_TIMEOUT):
+        return self.wait_for_call_status(CallStatus.ANSWERED, caller_id, timeout)
+
+    def wait_for_hangup(self, timeout=DEFAULT_WAIT_TIMEOUT):
+        return self.wait_for_call_status(CallStatus.OFF, timeout=timeout)
+
+    def wait_for_registration(self, timeout=DEFAULT_WAIT_TIMEOUT):
+        return self._wait_for(self.register_status, _registration_matcher, timeout)
+
+    def _wait_for(self, check, match, timeout):
+        # Events are matched from the moment the current state is checked, on
+        # the same connection, so a change happening after the check is not missed
+        deadline = time.monotonic() + timeout
+        results = []
+
+        def on_event(event):
+            result = match(event)
+            if result is not None:
+                results.append(result)
+
+        self.events.subscribe(on_event)
+        try:
+            with self._linphone_wrapper.holding_connection():
+                result = check()
+                if result is not None:
+                    return result
+                while not results:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise CommandTimeoutException(
+                            f'No matching state after {timeout}s'
+                        )
+                    self.read_events(remaining)
+                return results[0]
+        finally:
+            self.events.unsubscribe(on_event)
+
+
+class _SessionCallCommand(CallCommand):
+    """Call command adding the call it creates to the calls of the session."""
+
+    def __init__(self, session, exten):
+        super().__init__(exten, session._hostname)
+        self._calls = session.calls
+
+    def handle_status_ok(self, message):
+        call_id = super().handle_status_ok(message)
+        if call_id is None:
+            return None
+        return self._calls.add(call_id, f'sip:{self._exten}@{self._hostname}')
+
+
+class _SessionHoldCommand(HoldCommand):
+    """Hold command remembering the held call for `Session.resume`."""
+
+    def __init__(self, session, call_id=None):
+        super().__init__(call_id)
+        self._session = session
+
+    def handle_status_ok(self, message):
+        self._session._call_id = self._call_id
+
+
+class _Pipeline:
+    """Queue session commands and send them in a single write.
+
+    Any command method of the session can be called on the pipeline, e.g.
+    `session.pipeline().call('1001').call_status().execute()`. The commands
+    answered by several responses, as `register_status`, cannot be queued.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._commands = []
+
+    def __getattr__(self, name):
+        build_command = getattr(getattr(type(self._session), name), '__wrapped__', None)
+        if build_command is None:
+            raise AttributeError(f'{name} is not a command')
+
+        def queue(*args, **kwargs):
+            self._commands.append(build_command(self._session, *args, **kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        pipeline, self._commands = PipelineCommand(self._commands), []
+        return self._session._linphone_wrapper.execute(pipeline)
+
+
+class _Deferred:
+    """Send session commands without waiting for their response.
+
+    Any command method of the session can be called, e.g.
+    `session.deferred(timeout=2).call_status()`, and returns a future of its
+    result. With a reactor, the response is awaited by the reactor thread and
+    the deadline is `timeout` seconds from now; without one, the command is
+    executed before returning.
+    """
+
+    def __init__(self, session, timeout):
+        self._session = session
+        self._timeout = timeout
+
+    def __getattr__(self, name):
+        build_command = getattr(getattr(type(self._session), name), '__wrapped__', None)
+        if build_command is None:
+            raise AttributeError(f'{name} is not a command')
+
+        def submit(*args, **kwargs):
+            cmd = build_command(self._session, *args, **kwargs)
+            return self._session._linphone_wrapper.submit(cmd, self._timeout)
+
+        return submit
+
+
+def _port_allocator_for(sip_port, rtp_port, port_allocator):
+    # Ports are allocated only when none are given
+    if sip_port is None and rtp_port is None:
+        return port_allocator or default_port_allocator()
+    if sip_port is None or rtp_port is None:
+        raise ValueError('Give both the SIP and RTP ports, or none of them')
+    if port_allocator is not None:
+        raise ValueError('Explicit ports cannot be allocated')
+    return None
+
+
+def _call_status_matcher(status, caller_id=None):
+    def match(event):
+        if event.type != CALL_STATE_CHANGED:
+            return None
+        if caller_id is not None and caller_id not in event.body.get('From', ''):
+            return None
+        if CALL_STATE_STATUSES.get(event.body.get('Event')) == status:
+            return status
+
+    return match
+
+
+def _registration_matcher(event):
+    if event.type == REGISTRATION_STATE_CHANGED:
+        return REGISTRATION_STATE_STATUSES.get(event.body.get('State'))
+
 
 class _LinphoneWrapper:
+    _client_class = LinphoneClient
+    _MAX_CALLS_TO_RESET = 16
+    _MAX_START_ATTEMPTS = 3
     _CONFIG_FILE_CONTENT = '''\
 [sip]
 sip_port={sip_port}
@@ -127,59 +445,322 @@ use_ipv6=0
 audio_rtp_port={rtp_port}
 '''
 
-    def __init__(self, sip_port, rtp_port, logfile=None):
+    def __init__(
+        self,
+        sip_port,
+        rtp_port,
+        logfile=None,
+        persistent=False,
+        liveness_ttl=DEFAULT_LIVENESS_TTL,
+        event_buffer_size=DEFAULT_BUFFER_SIZE,
+        port_allocator=None,
+        start_timeout=DEFAULT_START_TIMEOUT,
+        stop_timeout=DEFAULT_STOP_TIMEOUT,
+        docker=None,
+        server_factory=None,
+        tracer=None,
+        capture=None,
+        reactor=None,
+        command_timeout=None,
+        settle_time=DEFAULT_SETTLE_TIME,
+    ):
         self._sip_port = sip_port
         self._rtp_port = rtp_port
+        self._port_allocator = port_allocator
+        self._port_block = None
         self._logfile = logfile
+        self._persistent = persistent
+        self._start_timeout = start_timeout
+        self._stop_timeout = stop_timeout
+        self._docker = docker
+        self._server_factory = server_factory
+        self.tracer = tracer or NULL_TRACER
+        self._capture = capture
+        self._reactor = reactor
+        self._command_timeout = command_timeout
+        self._settle_time = settle_time
+        self.liveness = LivenessTracker(liveness_ttl)
+        self.events = EventChannel(event_buffer_size)
         self._mount_path = ''
         self._config_file = ''
         self._socket_file = ''
         self._client = None
         self._server = None
         self._configured = False
+        # Commands may come from several threads, e.g. a quality sampler
+        self._lock = threading.RLock()
+        self._connection_holds = 0
 
     def _log_write(self, message):
         if self._logfile:
             self._logfile.write(message)
 
     def stop_and_clean(self):
-        if self._server.is_running():
-            try:
-                self.execute(QuitCommand())
-            except LinphoneException as e:
-                self._log_write(str(e))
+        if not self._configured:
+            return
 
+        if self.send_quit():
             self._log_write('Stopping Linphone container...')
             self._wait_until_server_stopped()
 
+        self.release()
+        self._remove_files()
+
+    def send_quit(self):
+        """Ask the daemon to exit without waiting, return whether it was running."""
+        if not self._configured or not self._server.is_running():
+            return False
+        try:
+            self.execute(QuitCommand())
+        except LinphoneException as e:
+            self._log_write(str(e))
+        return True
+
+    def wait_until_stopped(self, timeout):
+        if not self._configured:
+            return True
+        return self._server.wait_until_stopped(timeout)
+
+    @property
+    def server(self):
+        return self._server
+
+    @property
+    def tracks_events(self):
+        """Whether the events are received between commands too."""
+        return self._persistent or self._reactor is not None
+
+    def release(self):
+        """Disconnect and free the ports, return the mount path left to remove."""
+        if not self._configured:
+            return None
+        if self._reactor is not None:
+            self._reactor.forget(self._client).result()
+        self._client.disconnect()
+        self._release_ports()
+        return self._mount_path
+
+    def _clean(self):
+        self._release_ports()
+        self._remove_files()
+
+    def _release_ports(self):
+        if self._port_block is not None:
+            self._port_allocator.release(self._port_block)
+            self._port_block = None
+
+    def _remove_files(self):
         if os.path.exists(self._mount_path):
             if os.path.exists(self._config_file):
                 os.unlink(self._config_file)
             shutil.rmtree(self._mount_path)
 
     def _configure(self):
+        if self._port_allocator is not None:
+            self._allocate_ports()
         self._mount_path = tempfile.mkdtemp()
         self._config_file = self._create_config_file(self._mount_path)
         self._socket_file = os.path.join(self._mount_path, 'socket')
 
-        self._server = LinphoneServer(
-            self._socket_file, self._mount_path, self._logfile
+        if self._server_factory is None:
+            self._server = LinphoneServer(
+                self._socket_file,
+                self._mount_path,
+                self._logfile,
+                self.liveness,
+                start_timeout=self._start_timeout,
+                docker=self._docker,
+            )
+        else:
+            self._server = self._server_factory(
+                self._socket_file,
+                self._mount_path,
+                self._logfile,
+                self.liveness,
+                start_timeout=self._start_timeout,
+            )
+        self._client = self._client_class(
+            self._socket_file,
+            self._logfile,
+            self.events,
+            capture=self._capture,
+            settle_time=self._settle_time,
         )
-        self._client = LinphoneClient(self._socket_file, self._logfile)
 
         self._configured = True
 
-    def execute(self, cmd):
+    @property
+    def ports(self):
+        return self._sip_port, self._rtp_port
+
+    def start(self):
+        self._ensure_started()
+
+    def is_running(self):
+        return self._configured and self._server.is_running()
+
+    def reset(self):
+        # Terminate the calls one at a time until the daemon has no more call
+        for _ in range(self._MAX_CALLS_TO_RESET):
+            try:
+                self.execute(HangupCommand())
+            except NoActiveCallException:
+                break
+        self.execute(UnregisterCommand())
+        self._client.clear_status_messages()
+        self.events.clear()
+
+    def _ensure_started(self):
         if not self._configured:
             self._configure()
         if not self._server.is_running():
-            self._server.start()
+            self._start_server()
+
+    def _start_server(self):
+        for attempt in range(1, self._MAX_START_ATTEMPTS + 1):
+            try:
+                return self._server.start()
+            except ServerStartException as e:
+                if self._port_allocator is None or attempt == self._MAX_START_ATTEMPTS:
+                    raise
+                # The daemon may have failed to bind its ports, try the next ones
+                self._log_write(f'{e}: retrying with other ports')
+                self._server.force_stop()
+                self._port_allocator.reject(self._port_block)
+                self._allocate_ports()
+                self._create_config_file(self._mount_path)
+
+    def _allocate_ports(self):
+        self._port_block = self._port_allocator.allocate()
+        self._sip_port, self._rtp_port = self._port_block
+
+    def execute(self, cmd):
+        if self._reactor is not None:
+            return self.submit(cmd).result()
+
+        with self._lock:
+            trace = self.tracer.trace(cmd)
+            self._ensure_started()
+            trace.mark(LIVENESS)
+
+            self._client.trace = trace
+            try:
+                if self._persistent:
+                    return self._execute_persistent(cmd, trace)
+                return self._execute_once(cmd, trace)
+            except (LinphoneConnectionError, CommandTimeoutException):
+                self._server.invalidate_liveness()
+                raise
+            finally:
+                self._client.trace = NULL_TRACE
+
+    def submit(self, cmd, timeout=None):
+        """Return a future of the result of a command.
+
+        With a reactor, the command is queued to the reactor thread, which
+        fails it when its response is not parsed within `timeout` seconds, or
+        the command timeout of the session.
+        """
+        if self._reactor is None:
+            future = Future()
+            try:
+                future.set_result(self.execute(cmd))
+            except (LinphoneException, NotImplementedError) as e:
+                future.set_exception(e)
+            return future
+
+        trace = self.tracer.trace(cmd)
+        with self._lock:
+            self._ensure_started()
+        trace.mark(LIVENESS)
+        if timeout is None:
+            timeout = self._command_timeout
+        future = self._reactor.submit(self._client, cmd, timeout, trace)
+        future.add_done_callback(self._check_reactor_result)
+        return future
+
+    def _check_reactor_result(self, future):
+        if not future.cancelled() and isinstance(
+            future.exception(), (LinphoneConnectionError, CommandTimeoutException)
+        ):
+            self._server.invalidate_liveness()
+
+    @contextmanager
+    def holding_connection(self):
+        """Keep the client connected between commands, even when not persistent.
+
+        The events sent by the daemon while no client is connected are lost:
+        holding the connection lets a state be checked and then waited for.
+        """
+        if self._reactor is not None:
+            yield
+            return
+
+        with self._lock:
+            self._ensure_started()
+            self._client.connect()
+            self._connection_holds += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._connection_holds -= 1
+                if not self._persistent and not self._connection_holds:
+                    self._client.disconnect()
+
+    def read_events(self, timeout):
+        if self._reactor is not None:
+            with self._lock:
+                self._ensure_started()
+            try:
+                return self._reactor.wait_events(self._client, timeout)
+            except LinphoneConnectionError:
+                self._server.invalidate_liveness()
+                raise
 
+        try:
+            with self.holding_connection():
+                # Wait without the lock, the commands of other threads, e.g. a
+                # quality sampler, are executed meanwhile
+                if not self._client.wait_readable(timeout):
+                    return False
+                with self._lock:
+                    self._client.connect()
+                    return self._client.read_events(0)
+        except LinphoneConnectionError:
+            with self._lock:
+                self._server.invalidate_liveness()
+                self._client.disconnect()
+            raise
+
+    def _execute_once(self, cmd, trace):
         try:
             self._client.connect()
-            return cmd.execute(self._client)
+            trace.mark(CONNECT)
+            return cmd.execute(self._client, trace)
+        except CommandTimeoutException:
+            # The response may still arrive later, do not mix it with the next command
+            self._client.disconnect()
+            raise
         finally:
+            if not self._connection_holds:
+                self._client.disconnect()
+
+    def _execute_persistent(self, cmd, trace):
+        try:
+            self._client.connect()
+            trace.mark(CONNECT)
+            return cmd.execute(self._client, trace)
+        except LinphoneConnectionError as e:
+            # The command was not sent: the connection is stale, retry on a new one
+            self._log_write(f'Reconnecting Linphone client: {e}')
+            self._client.disconnect()
+            self._client.connect()
+            return cmd.execute(self._client, trace)
+        except CommandTimeoutException:
+            # The response may still arrive later, do not mix it with the next command
             self._client.disconnect()
+            raise
 
     def _create_config_file(self, path):
         content = self._CONFIG_FILE_CONTENT.format(
@@ -192,13 +773,8 @@ audio_rtp_port={rtp_port}
         return config_file
 
     def _wait_until_server_stopped(self):
-        tries = 10
-        interval = 0.5
-        for _ in range(tries):
-            if not self._server.is_running():
-                return
-            time.sleep(interval)
-        self._server.force_stop()
+        if not self._server.wait_until_stopped(self._stop_timeout):
+            self._server.force_stop()
 
 
 @contextmanager
@@ -0,0 +1,43 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, calling, equal_to, none, raises
+
+from ..account import Account
+from ..exceptions import LinphoneException
+
+
+class TestAccount(unittest.TestCase):
+    def setUp(self):
+        self.wrapper = Mock()
+        self.account = Account(self.wrapper, 'bob', 'secret', 'localhost')
+
+    def test_when_register_then_proxy_id_kept(self):
+        self.wrapper.execute.return_value = '3'
+
+        self.account.register()
+
+        assert_that(self.account.proxy_id, equal_to('3'))
+
+    def test_given_registered_when_register_status_then_addressed_to_proxy(self):
+        self.account.proxy_id = '3'
+
+        self.account.register_status()
+
+        cmd = self.wrapper.execute.call_args.args[0]
+        assert_that(cmd.command, equal_to('register-status 3'))
+
+    def test_given_registered_when_unregister_then_addressed_to_proxy(self):
+        self.account.proxy_id = '3'
+
+        self.account.unregister()
+
+        cmd = self.wrapper.execute.call_args.args[0]
+        assert_that(cmd.command, equal_to('unregister 3'))
+        assert_that(self.account.proxy_id, none())
+
+    def test_given_not_registered_when_unregister_then_raise(self):
+        assert_that(calling(self.account.unregister), raises(LinphoneException))
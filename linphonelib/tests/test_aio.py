@@ -0,0 +1,246 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_exactly, equal_to, has_properties
+
+from ..aio import AsyncLinphoneClient, AsyncSession
+from ..commands import CallStatus, CallStatusCommand, HangupCommand, RegisterStatus
+from ..exceptions import CommandTimeoutException, NoActiveCallException
+from ..fake_daemon import FakeLinphoneServer
+
+
+class TestAsyncLinphoneClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'socket')
+        self.responses = {}
+        self.server = await asyncio.start_unix_server(self._handle, self.filename)
+        self.client = AsyncLinphoneClient(self.filename, timeout=0.5)
+        await self.client.connect()
+
+    async def asyncTearDown(self):
+        await self.client.disconnect()
+        self.server.close()
+        await self.server.wait_closed()
+        shutil.rmtree(self.tmp_dir)
+
+    async def _handle(self, reader, writer):
+        while data := await reader.read(4096):
+            response = self.responses.get(data.decode())
+            if response:
+                writer.write(response)
+                await writer.drain()
+        writer.close()
+
+    async def test_given_status_ok_when_execute_async_then_handled(self):
+        self.responses[
+            'call-status'
+        ] = b'Status: Ok\n\nState: LinphoneCallStreamsRunning\nFrom: sip:bob@x\n'
+
+        result = await CallStatusCommand().execute_async(self.client)
+
+        assert_that(result, equal_to(CallStatus.ANSWERED))
+
+    async def test_given_response_without_final_newline_when_execute_async_then_handled(
+        self,
+    ):
+        self.responses['terminate'] = b'Status: Ok'
+        self.responses[
+            'call-status'
+        ] = b'Status: Ok\n\nState: LinphoneCallStreamsRunning\nFrom: sip:bob@x\n\n'
+
+        assert_that(await HangupCommand().execute_async(self.client), equal_to(None))
+        result = await CallStatusCommand().execute_async(self.client)
+
+        assert_that(result, equal_to(CallStatus.ANSWERED))
+
+    async def test_given_status_error_when_execute_async_then_raise(self):
+        self.responses['terminate'] = b'Status: Error\nReason: No active call.\n'
+
+        with self.assertRaises(NoActiveCallException):
+            await HangupCommand().execute_async(self.client)
+
+    async def test_given_no_response_when_execute_async_then_timeout(self):
+        with self.assertRaises(CommandTimeoutException):
+            await HangupCommand().execute_async(self.client)
+
+    async def test_given_event_when_read_events_then_published(self):
+        self.responses['call-status'] = (
+            b'Event-type: call-state-changed\nEvent: LinphoneCallEnd\n'
+            b'Status: Error\nReason: No current call available.\n'
+        )
+
+        result = await CallStatusCommand().execute_async(self.client)
+
+        assert_that(result, equal_to(CallStatus.OFF))
+        assert_that(
+            list(self.client.events),
+            contains_exactly(has_properties(type='call-state-changed')),
+        )
+
+    async def test_given_nothing_sent_when_read_events_then_false(self):
+        assert_that(await self.client.read_events(0.01), equal_to(False))
+
+
+class TestAsyncSession(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.session = self._session()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+
+    def _session(self, persistent=False):
+        return AsyncSession(
+            'alice',
+            'secret',
+            'example.com',
+            5060,
+            7078,
+            persistent=persistent,
+            server_factory=FakeLinphoneServer,
+        )
+
+    def _daemon(self):
+        return self.session._linphone_wrapper.server.daemon
+
+    async def test_when_register_then_registered(self):
+        await self.session.register()
+
+        assert_that(
+            await self.session.register_status(), equal_to(RegisterStatus.REGISTERED)
+        )
+
+    async def test_when_call_then_call_registered(self):
+        call = await self.session.call('1001')
+
+        assert_that(call.call_id, equal_to(1))
+        assert_that(self.session.calls.get(1), equal_to(call))
+        assert_that(await self.session.call_status(), equal_to(CallStatus.ANSWERED))
+
+    async def test_given_incoming_call_when_wait_for_ringing_then_ringing(self):
+        for persistent in (False, True):
+            session = self._session(persistent)
+            await session.call_status()
+            daemon = session._linphone_wrapper.server.daemon
+            asyncio.get_running_loop().call_later(
+                0.05, daemon.incoming_call, 'sip:bob@example.com'
+            )
+
+            result = await session.wait_for_ringing('bob', timeout=1)
+
+            assert_that(result, equal_to(CallStatus.RINGING))
+            await session.close()
+
+    async def test_when_close_then_daemon_stopped(self):
+        await self.session.register()
+        daemon = self._daemon()
+
+        await self.session.close()
+
+        assert_that(daemon.is_serving(), equal_to(False))
+        assert_that(daemon.received['quit'], equal_to(1))
+
+    async def test_when_concurrent_commands_then_all_answered(self):
+        for persistent in (False, True):
+            session = self._session(persistent)
+            await session.register()
+
+            results = await asyncio.gather(
+                session.call_status(), session.register_status(), session.send_dtmf('1')
+            )
+
+            assert_that(
+                results, equal_to([CallStatus.OFF, RegisterStatus.REGISTERED, None])
+            )
+            await session.close()
+
+    async def test_when_command_while_wait_for_ringing_then_both_answered(self):
+        for persistent in (False, True):
+            session = self._session(persistent)
+            await session.call_status()
+            daemon = session._linphone_wrapper.server.daemon
+            wait = asyncio.ensure_future(session.wait_for_ringing('bob', timeout=1))
+            await asyncio.sleep(0.05)
+
+            assert_that(await session.call_status(), equal_to(CallStatus.OFF))
+            daemon.incoming_call('sip:bob@example.com')
+
+            assert_that(await wait, equal_to(CallStatus.RINGING))
+            await session.close()
+
+    async def test_given_no_ports_when_command_then_ports_allocated_and_released(self):
+        allocator = Mock()
+        allocator.allocate.return_value = (5070, 5071)
+        session = AsyncSession(
+            'alice',
+            'secret',
+            'example.com',
+            server_factory=FakeLinphoneServer,
+            port_allocator=allocator,
+        )
+
+        await session.call_status()
+        await session.close()
+
+        assert_that(session._linphone_wrapper.ports, equal_to((5070, 5071)))
+        allocator.release.assert_called_once_with((5070, 5071))
+
+    def test_given_one_port_then_value_error(self):
+        with self.assertRaises(ValueError):
+            AsyncSession('alice', 'secret', 'example.com', 5060)
+
+
+class TestAsyncLinphoneWrapper(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.session = AsyncSession(
+            'alice',
+            'secret',
+            'example.com',
+            5060,
+            7078,
+            server_factory=FakeLinphoneServer,
+        )
+        self.wrapper = self.session._linphone_wrapper
+        self.addAsyncCleanup(self.session.close)
+
+    async def test_when_start_then_daemon_running(self):
+        await self.wrapper.start()
+
+        assert_that(self.wrapper.server.daemon.is_serving(), equal_to(True))
+
+    async def test_when_reset_then_calls_ended_and_unregistered(self):
+        await self.session.register()
+        await self.session.call('1001')
+
+        await self.wrapper.reset()
+
+        assert_that(await self.session.call_status(), equal_to(CallStatus.OFF))
+        assert_that(self.wrapper.server.daemon.received['unregister'], equal_to(1))
+
+    async def test_when_send_quit_then_stopped_and_released(self):
+        await self.wrapper.start()
+
+        assert_that(await self.wrapper.send_quit(), equal_to(True))
+        assert_that(await self.wrapper.wait_until_stopped(1), equal_to(True))
+        mount_path = await self.wrapper.release()
+
+        assert_that(os.path.isdir(mount_path), equal_to(True))
+
+    async def test_when_submit_then_task_of_result(self):
+        result = await self.wrapper.submit(CallStatusCommand(), timeout=1)
+
+        assert_that(result, equal_to(CallStatus.OFF))
+
+    async def test_given_slow_daemon_when_submit_with_timeout_then_timeout(self):
+        await self.wrapper.start()
+        self.wrapper.server.daemon.latency = 0.5
+
+        with self.assertRaises(CommandTimeoutException):
+            await self.wrapper.submit(CallStatusCommand(), timeout=0.05)
@@ -0,0 +1,168 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import socket
+import threading
+import unittest
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    empty,
+    equal_to,
+    has_entries,
+    has_length,
+    instance_of,
+    none,
+    raises,
+)
+
+from ..base_command import PipelineCommand
+from ..client import LinphoneClient
+from ..commands import (
+    CallStatus,
+    CallStatusCommand,
+    HangupCommand,
+    HoldCommand,
+    RegisterStatus,
+    RegisterStatusCommand,
+    RegisterStatusesCommand,
+)
+from ..exceptions import (
+    CommandTimeoutException,
+    LinphoneException,
+    NoActiveCallException,
+)
+
+
+class TestBaseCommand(unittest.TestCase):
+    def setUp(self):
+        self.client = LinphoneClient('socket.sock')
+        self.client._sock, self.daemon = socket.socketpair()
+
+    def tearDown(self):
+        self.client.disconnect()
+        self.daemon.close()
+
+    def test_given_several_statuses_when_execute_then_last_one_handled(self):
+        self.daemon.sendall(
+            b'Status: Ok\n\nState: LinphoneCallIncomingReceived\n'
+            b'Status: Ok\n\nState: LinphoneCallStreamsRunning\n'
+        )
+
+        result = CallStatusCommand().execute(self.client)
+
+        assert_that(result, equal_to(CallStatus.ANSWERED))
+
+    def test_given_one_status_per_account_when_register_statuses_then_all_handled(
+        self,
+    ):
+        self.daemon.sendall(
+            b'Status: Ok\n\nId: 1\nState: LinphoneRegistrationOk\n'
+            b'Status: Ok\n\nId: 2\nState: LinphoneRegistrationFailed\n'
+            b'Status: Error\nReason: No register with such id.\n'
+        )
+
+        result = RegisterStatusesCommand().execute(self.client)
+
+        assert_that(
+            result,
+            has_entries({'1': RegisterStatus.REGISTERED, '2': RegisterStatus.FAIL}),
+        )
+
+    def test_given_no_account_when_register_statuses_then_ended_by_marker(self):
+        self.daemon.sendall(b'Status: Error\nReason: No register with such id.\n')
+
+        assert_that(RegisterStatusesCommand().execute(self.client), equal_to({}))
+        assert_that(
+            self.daemon.recv(4096),
+            equal_to(b'register-status ALL\nregister-status 0'),
+        )
+
+    def test_given_statuses_in_several_reads_when_register_status_then_last_handled(
+        self,
+    ):
+        self.daemon.sendall(b'Status: Ok\n\nId: 1\nState: LinphoneRegistrationFailed\n')
+        threading.Timer(
+            0.05,
+            self.daemon.sendall,
+            [
+                b'Status: Ok\n\nId: 2\nState: LinphoneRegistrationOk\n'
+                b'Status: Error\nReason: No register with such id.\n'
+            ],
+        ).start()
+
+        result = RegisterStatusCommand().execute(self.client)
+
+        assert_that(result, equal_to(RegisterStatus.REGISTERED))
+
+    def test_given_status_without_state_when_register_status_then_none(self):
+        self.daemon.sendall(b'Status: Ok\n')
+
+        result = RegisterStatusCommand(1).execute(self.client)
+
+        assert_that(result, none())
+
+
+class TestPipelineCommand(unittest.TestCase):
+    def setUp(self):
+        self.client = LinphoneClient('socket.sock')
+        self.client._sock, self.daemon = socket.socketpair()
+        self.daemon.settimeout(1)
+
+    def tearDown(self):
+        self.client.disconnect()
+        self.daemon.close()
+
+    def test_when_execute_then_commands_sent_in_one_write(self):
+        self.daemon.sendall(b'Status: Ok\nStatus: Ok\n')
+
+        PipelineCommand([HoldCommand(), HangupCommand()]).execute(self.client)
+
+        assert_that(self.daemon.recv(4096), equal_to(b'call-pause\nterminate'))
+
+    def test_when_execute_then_responses_matched_in_order(self):
+        self.daemon.sendall(
+            b'Status: Ok\n\nState: LinphoneCallIncomingReceived\n'
+            b'Status: Error\nReason: No active call.\n'
+            b'Status: Ok\n\nState: LinphoneCallStreamsRunning\n'
+        )
+        commands = [CallStatusCommand(), HangupCommand(), CallStatusCommand()]
+
+        results = PipelineCommand(commands).execute(self.client)
+
+        assert_that(
+            results,
+            contains_exactly(
+                CallStatus.RINGING,
+                instance_of(NoActiveCallException),
+                CallStatus.ANSWERED,
+            ),
+        )
+
+    def test_given_connection_closed_when_execute_then_raise(self):
+        self.daemon.sendall(b'Status: Ok\n')
+        self.daemon.shutdown(socket.SHUT_WR)
+
+        assert_that(
+            calling(PipelineCommand([HoldCommand(), HoldCommand()]).execute).with_args(
+                self.client
+            ),
+            raises(CommandTimeoutException),
+        )
+
+    def test_given_command_with_several_responses_when_create_then_refused(self):
+        for cmd in (RegisterStatusCommand(), RegisterStatusesCommand()):
+            assert_that(
+                calling(PipelineCommand).with_args([CallStatusCommand(), cmd]),
+                raises(LinphoneException),
+            )
+
+        assert_that(
+            PipelineCommand([RegisterStatusCommand(1), CallStatusCommand()]),
+            has_length(2),
+        )
+
+    def test_given_no_command_when_execute_then_nothing_sent(self):
+        assert_that(PipelineCommand([]).execute(self.client), empty())
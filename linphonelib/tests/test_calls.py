@@ -0,0 +1,144 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    equal_to,
+    has_properties,
+    none,
+    raises,
+)
+
+from ..calls import CallRegistry
+from ..commands import (
+    AnswerCommand,
+    CallStatsCommand,
+    CallStatus,
+    HangupCommand,
+    HoldCommand,
+)
+from ..events import CALL_STATE_CHANGED, Event
+from ..exceptions import NoActiveCallException
+from ..fake_daemon import FakeLinphoneServer
+from ..session import Session
+
+
+def _event(call_id, state, remote='sip:bob@host'):
+    return Event(CALL_STATE_CHANGED, {'Event': state, 'Id': call_id, 'From': remote})
+
+
+class TestCallRegistry(unittest.TestCase):
+    def setUp(self):
+        self.calls = CallRegistry()
+
+    def test_when_call_state_changed_then_call_added_and_updated(self):
+        self.calls.on_event(_event('1', 'LinphoneCallIncomingReceived'))
+        self.calls.on_event(_event('1', 'LinphoneCallStreamsRunning'))
+
+        assert_that(
+            list(self.calls),
+            contains_exactly(
+                has_properties(
+                    call_id=1, remote='sip:bob@host', state='LinphoneCallStreamsRunning'
+                )
+            ),
+        )
+
+    def test_when_call_released_then_call_removed(self):
+        self.calls.add(1)
+
+        self.calls.on_event(_event('1', 'LinphoneCallReleased'))
+
+        assert_that(len(self.calls), equal_to(0))
+
+    def test_when_current_then_most_recent_call_in_progress(self):
+        self.calls.add(1, state='LinphoneCallStreamsRunning')
+        self.calls.add(2, state='LinphoneCallPaused')
+        self.calls.add(3, state='LinphoneCallIncomingReceived')
+        self.calls.add(4, state='LinphoneCallOutgoingInit')
+        self.calls.add(5)
+
+        assert_that(self.calls.current().call_id, equal_to(1))
+
+    def test_given_no_call_when_current_then_none(self):
+        assert_that(self.calls.current(), none())
+
+
+class TestCallIdCommands(unittest.TestCase):
+    def test_given_call_id_then_command_addresses_call(self):
+        commands = [
+            AnswerCommand(2),
+            HangupCommand(2),
+            HoldCommand(2),
+            CallStatsCommand(2),
+        ]
+
+        assert_that(
+            [cmd.command for cmd in commands],
+            contains_exactly('answer 2', 'terminate 2', 'call-pause 2', 'call-stats 2'),
+        )
+
+    def test_given_no_call_id_then_current_call(self):
+        assert_that(HangupCommand().command, equal_to('terminate'))
+
+
+class TestSessionCalls(unittest.TestCase):
+    def setUp(self):
+        self.session = Session(
+            'alice',
+            'secret',
+            'example.com',
+            5060,
+            7078,
+            persistent=True,
+            server_factory=FakeLinphoneServer,
+        )
+        self.addCleanup(self.session.close)
+
+    def _daemon(self):
+        return self.session._linphone_wrapper._server.daemon
+
+    def test_when_call_then_call_handle_registered(self):
+        call = self.session.call('1001')
+
+        assert_that(call, has_properties(call_id=1, remote='sip:1001@example.com'))
+        assert_that(self.session.calls.get(1), equal_to(call))
+
+    def test_when_hold_known_call_then_no_call_stats(self):
+        self.session.call('1001')
+
+        self.session.hold()
+        self.session.resume()
+
+        assert_that(self._daemon().received['call-stats'], equal_to(0))
+        assert_that(self.session.call_status(), equal_to(CallStatus.ANSWERED))
+
+    def test_given_many_calls_when_commands_by_handle_then_each_call_addressed(self):
+        first = self.session.call('1001')
+        second = self.session.call('1002')
+
+        self.session.hold(first)
+        stats = self.session.call_stats(first)
+        self.session.hangup(second)
+        self.session.resume(first)
+        self.session.hangup(call=first)
+
+        assert_that(stats.call_id, equal_to(1))
+        assert_that(list(self.session.calls), equal_to([]))
+        assert_that(calling(self.session.hangup), raises(NoActiveCallException))
+
+    def test_given_incoming_calls_when_answer_by_handle_then_answered(self):
+        self.session.call_status()
+        self._daemon().incoming_call('sip:bob@example.com')
+        self._daemon().incoming_call('sip:carol@example.com')
+        while len(self.session.calls) < 2 and self.session.read_events(1):
+            pass
+
+        carol = [call for call in self.session.calls if 'carol' in call.remote][0]
+        self.session.answer(carol)
+
+        assert_that(self.session.is_talking_to('carol'), equal_to(True))
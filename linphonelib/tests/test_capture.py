@@ -0,0 +1,197 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import io
+import unittest
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    equal_to,
+    has_properties,
+    instance_of,
+    raises,
+)
+
+from ..capture import (
+    RECV,
+    SEND,
+    CaptureWriter,
+    Chunk,
+    ReplayClient,
+    command_from_text,
+    read_capture,
+    replay,
+)
+from ..commands import (
+    CallStatus,
+    CallStatusCommand,
+    RegisterStatus,
+    RegisterStatusCommand,
+)
+from ..events import CALL_STATE_CHANGED
+from ..exceptions import (
+    LinphoneConnectionError,
+    LinphoneException,
+    NoActiveCallException,
+)
+from ..fake_daemon import FakeLinphoneServer
+from ..session import Session
+
+
+class _UnclosedBytesIO(io.BytesIO):
+    def close(self):
+        pass
+
+
+class TestCapture(unittest.TestCase):
+    def test_when_write_chunks_then_read_back(self):
+        f = _UnclosedBytesIO()
+        with CaptureWriter(f) as capture:
+            capture.record_send(b'call-status')
+            capture.record_recv(b'Status: Ok\n')
+
+        chunks = list(read_capture(io.BytesIO(f.getvalue())))
+
+        assert_that(
+            chunks,
+            contains_exactly(
+                has_properties(direction=SEND, data=b'call-status'),
+                has_properties(direction=RECV, data=b'Status: Ok\n'),
+            ),
+        )
+        assert_that(chunks[0].timestamp <= chunks[1].timestamp, equal_to(True))
+
+    def test_given_truncated_capture_when_read_then_raise(self):
+        f = _UnclosedBytesIO()
+        with CaptureWriter(f) as capture:
+            capture.record_recv(b'Status: Ok\n')
+
+        truncated = io.BytesIO(f.getvalue()[:-1])
+
+        assert_that(
+            calling(list).with_args(read_capture(truncated)),
+            raises(LinphoneException),
+        )
+
+    def test_given_not_a_capture_when_read_then_raise(self):
+        f = io.BytesIO(b'Status: Ok\nReason: not a capture\n')
+
+        assert_that(calling(list).with_args(read_capture(f)), raises(LinphoneException))
+
+
+class TestReplayClient(unittest.TestCase):
+    def test_given_response_in_chunks_when_execute_then_parsed(self):
+        chunks = [
+            Chunk(SEND, 0, b'call-status'),
+            Chunk(RECV, 0, b'Status: Ok\n\nState: LinphoneCall'),
+            Chunk(RECV, 0, b'StreamsRunning\nFrom: sip:bob@host\n'),
+        ]
+        client = ReplayClient(chunks)
+        client._BUFSIZE = 16
+
+        result = CallStatusCommand().execute(client)
+
+        assert_that(result, equal_to(CallStatus.ANSWERED))
+
+    def test_given_events_before_command_when_execute_then_published(self):
+        chunks = [
+            Chunk(RECV, 0, b'Event-type: call-state-changed\nEvent: LinphoneCallEnd\n'),
+            Chunk(SEND, 0, b'call-status'),
+            Chunk(RECV, 0, b'Status: Error\nReason: No current call available.\n'),
+        ]
+        client = ReplayClient(chunks)
+
+        CallStatusCommand().execute(client)
+
+        event = next(iter(client.events))
+        assert_that(event.type, equal_to(CALL_STATE_CHANGED))
+
+    def test_given_end_of_capture_when_send_then_connection_error(self):
+        client = ReplayClient([])
+
+        assert_that(
+            calling(client.send_data).with_args('call-status'),
+            raises(LinphoneConnectionError),
+        )
+
+
+class TestCommandFromText(unittest.TestCase):
+    def test_given_known_command_when_parse_then_command(self):
+        cmd = command_from_text('register sip:alice@example.com example.com secret')
+
+        assert_that(
+            cmd.command,
+            equal_to('register sip:alice@example.com example.com secret'),
+        )
+
+    def test_given_register_statuses_when_parse_then_one_command(self):
+        cmd = command_from_text(RegisterStatusCommand().command)
+
+        assert_that(cmd, instance_of(RegisterStatusCommand))
+        assert_that(cmd.command, equal_to(RegisterStatusCommand().command))
+
+    def test_given_invalid_arguments_when_parse_then_raise(self):
+        for text in ('call', 'register sip:alice@example.com', 'dtmf', 'answer 1 2'):
+            assert_that(
+                calling(command_from_text).with_args(text), raises(LinphoneException)
+            )
+
+    def test_given_unknown_command_when_parse_then_raise(self):
+        assert_that(
+            calling(command_from_text).with_args('unknown'), raises(LinphoneException)
+        )
+
+
+class TestReplaySession(unittest.TestCase):
+    def test_given_session_capture_when_replay_then_same_results(self):
+        f = _UnclosedBytesIO()
+        capture = CaptureWriter(f)
+        session = Session(
+            'alice',
+            'secret',
+            'example.com',
+            5060,
+            7078,
+            persistent=True,
+            server_factory=FakeLinphoneServer,
+            capture=capture,
+        )
+        try:
+            session.register()
+            session.register_status()
+            session.call('1001')
+            session.pipeline().call_status().send_dtmf('1').execute()
+            session.hangup()
+            assert_that(calling(session.hangup), raises(NoActiveCallException))
+        finally:
+            session.close()
+            capture.close()
+
+        texts, results = zip(*replay(read_capture(io.BytesIO(f.getvalue()))))
+
+        assert_that(
+            texts,
+            contains_exactly(
+                'register sip:alice@example.com example.com secret',
+                'register-status ALL\nregister-status 0',
+                'call sip:1001@example.com',
+                'call-status\ndtmf 1',
+                'terminate',
+                'terminate',
+                'quit',
+            ),
+        )
+        assert_that(
+            results,
+            contains_exactly(
+                '1',
+                RegisterStatus.REGISTERED,
+                1,
+                [CallStatus.ANSWERED, None],
+                None,
+                instance_of(NoActiveCallException),
+                None,
+            ),
+        )
@@ -1,11 +1,23 @@
-# Copyright 2019-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import socket
+import time
 import unittest
 from unittest.mock import Mock, patch
 
-from hamcrest import assert_that, has_properties, instance_of
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    ends_with,
+    equal_to,
+    has_entries,
+    has_length,
+    has_properties,
+    instance_of,
+    less_than,
+    none,
+)
 
 from ..client import LinphoneClient
 from ..exceptions import LinphoneConnectionError
@@ -17,6 +29,10 @@ class TestLinphoneClient(unittest.TestCase):
         self.socket = Mock()
         self.client = LinphoneClient(self.filename)
         self.client._sock = self.socket
+        # Nothing more is pending on the socket after each read
+        patcher = patch('select.select', return_value=([], [], []))
+        self.select = patcher.start()
+        self.addCleanup(patcher.stop)
 
     @patch('socket.socket')
     def test_when_connect_socket_then_socket_created(self, mock_socket_constructor):
@@ -88,8 +104,77 @@ class TestLinphoneClient(unittest.TestCase):
     def test_given_remaining_message_when_parse_next_message_then_return_messages_queue(
         self,
     ):
-        self.client._buffer = b'Status: '
-        self.socket.recv.return_value = b'Ok\nId: 42'
+        self.client._parser.feed(b'Status: ')
+        self.socket.recv.return_value = b'Ok\nId: 42\n'
+
+        message = self.client.parse_next_status_message()
+
+        assert_that(message, has_properties(status='Ok'))
+
+    def test_given_message_split_on_full_reads_when_parse_next_message_then_complete(
+        self,
+    ):
+        first_chunk = b'Status: Ok\n\nId: 42\nFrom: ' + b'x' * LinphoneClient._BUFSIZE
+        first_chunk = first_chunk[: LinphoneClient._BUFSIZE]
+        self.socket.recv.side_effect = [first_chunk, b'yz\nState: Paused\n']
+        self.select.side_effect = [([self.socket], [], []), ([], [], [])]
+
+        message = self.client.parse_next_status_message()
+
+        assert_that(
+            message.body,
+            has_entries(Id='42', From=ends_with('xyz'), State='Paused'),
+        )
+
+    def test_given_short_read_inside_line_when_parse_next_message_then_wait_rest(
+        self,
+    ):
+        self.socket.recv.side_effect = [b'Status: ', b'Ok\n\nId: 4', b'2\n']
+        self.select.side_effect = [([self.socket], [], [])] * 2 + [([], [], [])]
+
+        message = self.client.parse_next_status_message()
+
+        assert_that(message, has_properties(status='Ok', body=has_entries(Id='42')))
+
+    def test_given_message_ending_on_full_read_when_parse_next_message_then_complete(
+        self,
+    ):
+        data = b'Status: Ok\n\nFrom: ' + b'x' * LinphoneClient._BUFSIZE
+        data = data[: LinphoneClient._BUFSIZE - 1] + b'\n'
+        self.socket.recv.return_value = data
+
+        message = self.client.parse_next_status_message()
+
+        assert_that(message, has_properties(status='Ok'))
+        self.socket.recv.assert_called_once()
+
+    def test_given_unterminated_line_and_nothing_more_when_parse_next_message_then_complete(
+        self,
+    ):
+        self.socket.recv.return_value = b'Status: Ok'
+
+        message = self.client.parse_next_status_message()
+
+        assert_that(message, has_properties(status='Ok'))
+        self.select.assert_called_once_with(
+            [self.socket], [], [], self.client.settle_time
+        )
+
+    def test_given_body_ending_with_blank_line_when_parse_next_message_then_complete(
+        self,
+    ):
+        self.socket.recv.return_value = b'Status: Ok\n\nState: Paused\nFrom: x\n\n'
+
+        message = self.client.parse_next_status_message()
+
+        assert_that(message.body, has_entries(State='Paused', From='x'))
+        self.select.assert_called_once_with([self.socket], [], [], 0)
+
+    def test_given_read_timeout_inside_message_when_parse_next_message_then_complete(
+        self,
+    ):
+        self.socket.recv.side_effect = [b'Status: Ok\n\n', socket.timeout()]
+        self.select.return_value = ([self.socket], [], [])
 
         message = self.client.parse_next_status_message()
 
@@ -121,3 +206,90 @@ class TestLinphoneClient(unittest.TestCase):
         self.assertRaises(
             LinphoneConnectionError, self.client.parse_next_status_message
         )
+
+
+class TestLinphoneClientEvents(unittest.TestCase):
+    def setUp(self):
+        self.client = LinphoneClient('socket.sock')
+        self.client._sock, self.daemon = socket.socketpair()
+
+    def tearDown(self):
+        self.client.disconnect()
+        self.daemon.close()
+
+    def test_given_event_sent_when_read_events_then_event_published(self):
+        self.daemon.sendall(b'Event-type: call-state-changed\nEvent: LinphoneCallEnd\n')
+
+        assert_that(self.client.read_events(timeout=1), equal_to(True))
+
+        assert_that(
+            list(self.client.events),
+            contains_exactly(
+                has_properties(
+                    type='call-state-changed', body=has_entries(Event='LinphoneCallEnd')
+                )
+            ),
+        )
+
+    def test_given_closed_after_status_when_parse_next_message_then_status(self):
+        self.daemon.sendall(b'Status: Ok\n')
+        self.daemon.close()
+
+        message = self.client.parse_next_status_message()
+
+        assert_that(message, has_properties(status='Ok'))
+        self.assertRaises(
+            LinphoneConnectionError, self.client.parse_next_status_message
+        )
+
+    def test_given_messages_without_final_newline_when_parse_then_complete(self):
+        for data in (b'Status: Ok\n\nState: Paused\nFrom: x\n\n', b'Status: Ok'):
+            self.daemon.sendall(data)
+
+            message = self.client.parse_next_status_message()
+
+            assert_that(message, has_properties(status='Ok'))
+
+    def test_given_closed_inside_line_when_parse_next_message_then_status(self):
+        self.daemon.sendall(b'Status: Ok\n\nId: 1')
+        self.daemon.close()
+
+        message = self.client.parse_next_status_message()
+
+        assert_that(message.body, has_entries(Id='1'))
+
+    def test_given_message_left_incomplete_when_read_available_then_wait_returned(
+        self,
+    ):
+        self.client.settle_time = 0.5
+        self.daemon.sendall(b'Status: Ok\n\nId: 1')
+        started_at = time.monotonic()
+
+        wait = self.client.read_available()
+
+        assert_that(time.monotonic() - started_at, less_than(0.1))
+        assert_that(wait, equal_to(0.5))
+        assert_that(self.client.take_status_messages(), none())
+        assert_that(self.client.flush_incomplete(), equal_to(True))
+        assert_that(self.client.take_status_messages(), has_length(1))
+
+    def test_given_message_ending_a_line_when_read_available_then_flushed(self):
+        self.daemon.sendall(b'Status: Ok\n\nId: 1\n')
+
+        assert_that(self.client.read_available(), none())
+        assert_that(self.client.take_status_messages(), has_length(1))
+
+    def test_given_nothing_sent_when_read_events_then_false(self):
+        assert_that(self.client.read_events(timeout=0), equal_to(False))
+
+    def test_given_event_before_status_when_parse_next_message_then_both_dispatched(
+        self,
+    ):
+        self.daemon.sendall(
+            b'Event-type: call-state-changed\nEvent: LinphoneCallEnd\nStatus: Ok\n'
+        )
+
+        message = self.client.parse_next_status_message()
+
+        assert_that(message, has_properties(status='Ok'))
+        assert_that(len(self.client.events), equal_to(1))
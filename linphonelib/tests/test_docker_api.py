@@ -0,0 +1,165 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import http.server
+import json
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import unittest
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    equal_to,
+    has_entries,
+    raises,
+)
+
+from ..docker_api import DockerEngineClient
+from ..exceptions import LinphoneException, ServerStartException
+
+
+class _DockerStandIn(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, _DockerStandInHandler)
+        self.connections = 0
+        self.requests = []
+        self.containers = []
+        self.errors = {}
+
+
+class _DockerStandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.server.requests.append((self.command, self.path, body))
+
+        path = self.path.split('?')[0]
+        status = self.server.errors.get(path)
+        if status:
+            self._reply(status, {'message': 'error'})
+        elif path == '/containers/json':
+            names = [{'Names': [f'/{name}']} for name in self.server.containers]
+            self._reply(200, names)
+        elif path == '/containers/create':
+            self._reply(201, {'Id': '1234'})
+        elif path.endswith('/wait'):
+            self._reply(200, {'StatusCode': 0})
+        else:
+            self._reply(204)
+
+    def _reply(self, status, body=None):
+        data = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        if data:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class TestDockerEngineClient(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(self.tmp_dir, 'docker.sock')
+        self.docker = _DockerStandIn(path)
+        self.thread = threading.Thread(target=self.docker.serve_forever, args=(0.01,))
+        self.thread.start()
+        self.client = DockerEngineClient(path, listing_ttl=60)
+
+    def tearDown(self):
+        self.client.close()
+        self.docker.shutdown()
+        self.docker.server_close()
+        self.thread.join()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_when_is_running_for_many_names_then_one_listing_request(self):
+        self.docker.containers = ['a', 'b']
+
+        running = [self.client.is_running(name) for name in ('a', 'b', 'c')]
+
+        assert_that(running, contains_exactly(True, True, False))
+        assert_that(len(self.docker.requests), equal_to(1))
+
+    def test_when_several_requests_then_connection_reused(self):
+        self.client.run('a', 'image', {'/tmp/a': '/tmp/linphone'})
+        self.client.kill('a')
+        self.client.running_names()
+
+        assert_that(len(self.docker.requests), equal_to(4))
+        assert_that(self.docker.connections, equal_to(1))
+
+    def test_when_run_then_container_created_and_started(self):
+        self.client.run('a', 'image', {'/tmp/a': '/tmp/linphone'})
+
+        create, start = self.docker.requests
+        assert_that(create[1], equal_to('/containers/create?name=a'))
+        assert_that(
+            create[2],
+            has_entries(
+                Image='image',
+                HostConfig=has_entries(AutoRemove=True, Binds=['/tmp/a:/tmp/linphone']),
+            ),
+        )
+        assert_that(start[1], equal_to('/containers/a/start'))
+
+    def test_given_create_error_when_run_then_server_start_exception(self):
+        self.docker.errors['/containers/create'] = 404
+
+        assert_that(
+            calling(self.client.run).with_args('a', 'image', {}),
+            raises(ServerStartException),
+        )
+
+    def test_given_container_gone_when_kill_then_no_error(self):
+        self.docker.errors['/containers/a/kill'] = 404
+
+        self.client.kill('a')
+
+    def test_given_run_when_is_running_then_listing_refreshed(self):
+        self.client.running_names()
+        self.docker.containers = ['a']
+
+        self.client.run('a', 'image', {})
+
+        assert_that(self.client.is_running('a'), equal_to(True))
+
+    def test_when_wait_then_true(self):
+        assert_that(self.client.wait('a', timeout=5), equal_to(True))
+
+    def test_given_wait_error_when_wait_then_false(self):
+        self.docker.errors['/containers/a/wait'] = 500
+
+        assert_that(self.client.wait('a', timeout=5), equal_to(False))
+
+    def test_given_docker_unreachable_when_wait_then_false(self):
+        client = DockerEngineClient(os.path.join(self.tmp_dir, 'missing.sock'))
+
+        assert_that(client.wait('a', timeout=5), equal_to(False))
+
+    def test_given_docker_unreachable_when_request_then_linphone_exception(self):
+        client = DockerEngineClient(os.path.join(self.tmp_dir, 'missing.sock'))
+
+        assert_that(calling(client.running_names), raises(LinphoneException))
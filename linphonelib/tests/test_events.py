@@ -0,0 +1,59 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_exactly, empty, equal_to
+
+from ..events import Event, EventChannel
+
+
+class TestEventChannel(unittest.TestCase):
+    def setUp(self):
+        self.channel = EventChannel(size=2)
+
+    def test_given_subscribed_callback_when_publish_then_callback_called(self):
+        callback = self.channel.subscribe(Mock())
+        event = Event('call-state-changed', {})
+
+        self.channel.publish(event)
+
+        callback.assert_called_once_with(event)
+
+    def test_given_failing_callback_when_publish_then_error_logged_and_others_called(
+        self,
+    ):
+        self.channel.subscribe(Mock(side_effect=KeyError('State')))
+        callback = self.channel.subscribe(Mock())
+        event = Event('call-state-changed', {})
+
+        with self.assertLogs('linphonelib.events', 'ERROR'):
+            self.channel.publish(event)
+
+        callback.assert_called_once_with(event)
+        assert_that(list(self.channel), contains_exactly(event))
+
+    def test_given_unsubscribed_callback_when_publish_then_not_called(self):
+        callback = self.channel.subscribe(Mock())
+        self.channel.unsubscribe(callback)
+
+        self.channel.publish(Event('call-state-changed', {}))
+
+        callback.assert_not_called()
+
+    def test_when_iterate_then_events_consumed_oldest_first(self):
+        first, second = Event('a', {}), Event('b', {})
+        self.channel.publish(first)
+        self.channel.publish(second)
+
+        assert_that(list(self.channel), contains_exactly(first, second))
+        assert_that(list(self.channel), empty())
+
+    def test_given_full_buffer_when_publish_then_oldest_dropped(self):
+        events = [Event(str(i), {}) for i in range(3)]
+        for event in events:
+            self.channel.publish(event)
+
+        assert_that(list(self.channel), contains_exactly(*events[1:]))
+        assert_that(self.channel.dropped, equal_to(1))
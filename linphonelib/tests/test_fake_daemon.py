@@ -0,0 +1,351 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import functools
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    greater_than,
+    greater_than_or_equal_to,
+    has_entries,
+    less_than,
+    raises,
+)
+
+from ..client import DEFAULT_SETTLE_TIME, LinphoneClient
+from ..commands import CallStatus, RegisterStatus
+from ..exceptions import ExtensionNotFoundException, LinphoneException
+from ..fake_daemon import INJECTED_ERROR_REASON, FakeDaemon, FakeLinphoneServer
+from ..parser import parse_buffer
+from ..session import Session
+
+
+class TestFakeDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_file = os.path.join(self.tmp_dir, 'socket')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _send(self, daemon, command):
+        client = LinphoneClient(self.socket_file)
+        client.connect()
+        try:
+            client.send_data(f'{command}\n')
+            return client.parse_next_status_message()
+        finally:
+            client.disconnect()
+
+    def test_when_register_status_all_then_one_status_per_account(self):
+        with FakeDaemon(self.socket_file) as daemon:
+            self._send(daemon, 'register sip:a@host host a')
+            self._send(daemon, 'register sip:b@host host b')
+
+            client = LinphoneClient(self.socket_file)
+            client.connect()
+            client.send_data('register-status ALL\n')
+            messages = client.parse_next_status_messages()
+            client.disconnect()
+
+        assert_that(len(messages), equal_to(2))
+        assert_that(
+            messages[1].body, has_entries(Id='2', State='LinphoneRegistrationOk')
+        )
+
+    def test_given_held_call_and_incoming_call_when_call_status_then_ringing_call(
+        self,
+    ):
+        with FakeDaemon(self.socket_file) as daemon:
+            self._send(daemon, 'call sip:1001@host')
+            self._send(daemon, 'call-pause')
+            daemon.incoming_call('sip:bob@host')
+            message = self._send(daemon, 'call-status')
+
+        assert_that(message.body, has_entries(State='LinphoneCallIncomingReceived'))
+
+    def test_given_blank_line_after_body_when_command_then_body_ends_with_blank_line(
+        self,
+    ):
+        with FakeDaemon(self.socket_file, blank_line_after_body=True):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.socket_file)
+            sock.sendall(b'register sip:a@host host a\n')
+            expected = b'Status: Ok\n\nId: 1\n\n'
+            data = b''
+            while len(data) < len(expected):
+                data += sock.recv(4096)
+            sock.close()
+
+        assert_that(data[: len(expected)], equal_to(expected))
+
+    def test_given_latency_when_command_then_response_delayed(self):
+        with FakeDaemon(self.socket_file, latency=0.05) as daemon:
+            start = time.monotonic()
+            self._send(daemon, 'dtmf 1')
+
+            assert_that(time.monotonic() - start, greater_than_or_equal_to(0.05))
+
+    def test_given_fragment_size_when_command_then_response_split(self):
+        with FakeDaemon(self.socket_file, fragment_size=4, fragment_delay=0.01):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.socket_file)
+            sock.sendall(b'register sip:a@host host a\n')
+            expected = b'Status: Ok\n\nId: 1\n'
+            chunks = []
+            while sum(len(chunk) for chunk in chunks) < len(expected):
+                chunks.append(sock.recv(4096))
+            sock.close()
+
+        messages = []
+        parse_buffer(b''.join(chunks), lambda status, body: messages.append(body))
+        assert_that(messages, equal_to([{'Status': 'Ok', 'Id': '1'}]))
+        assert_that(len(chunks), greater_than(1))
+
+    def test_given_errors_when_command_then_error_reason(self):
+        errors = {'answer': 'Busy.'}
+        with FakeDaemon(self.socket_file, errors=errors) as daemon:
+            message = self._send(daemon, 'answer')
+
+        assert_that(message.body, has_entries(Status='Error', Reason='Busy.'))
+
+    def test_given_error_rate_when_command_then_injected_error(self):
+        with FakeDaemon(self.socket_file, error_rate=1) as daemon:
+            message = self._send(daemon, 'dtmf 1')
+
+        assert_that(message.body, has_entries(Reason=INJECTED_ERROR_REASON))
+
+    def test_when_quit_then_daemon_stopped(self):
+        daemon = FakeDaemon(self.socket_file)
+        daemon.start()
+
+        self._send(daemon, 'quit')
+
+        assert_that(daemon.wait_until_stopped(5), equal_to(True))
+        assert_that(os.path.exists(self.socket_file), equal_to(False))
+
+
+class TestSessionOnFakeDaemon(unittest.TestCase):
+    def _session(self, persistent=True, settle_time=DEFAULT_SETTLE_TIME, **options):
+        server_factory = functools.partial(FakeLinphoneServer, **options)
+        session = Session(
+            'alice',
+            'secret',
+            'example.com',
+            5060,
+            7078,
+            persistent=persistent,
+            server_factory=server_factory,
+            settle_time=settle_time,
+        )
+        self.addCleanup(session.close)
+        return session
+
+    def _daemon(self, session):
+        return session._linphone_wrapper._server.daemon
+
+    def test_when_register_then_registered(self):
+        session = self._session()
+
+        session.register()
+
+        assert_that(session.register_status(), equal_to(RegisterStatus.REGISTERED))
+        assert_that(
+            session.wait_for_registration(timeout=1),
+            equal_to(RegisterStatus.REGISTERED),
+        )
+
+    def test_when_call_hold_resume_hangup_then_states_follow(self):
+        session = self._session()
+
+        session.call('1001')
+        assert_that(session.call_status(), equal_to(CallStatus.ANSWERED))
+        session.hold()
+        session.resume()
+        assert_that(session.call_status(), equal_to(CallStatus.ANSWERED))
+        session.hangup()
+
+        assert_that(session.call_status(), equal_to(CallStatus.OFF))
+
+    def test_given_ringing_call_when_hold_then_call_in_progress_held(self):
+        for persistent in (True, False):
+            session = self._session(persistent=persistent)
+            session.call('1001')
+            daemon = self._daemon(session)
+            daemon.incoming_call('sip:bob@example.com')
+            session.call_status()
+
+            session.hold()
+
+            assert_that(daemon.calls[1]['state'], equal_to('LinphoneCallPaused'))
+            assert_that(
+                daemon.calls[2]['state'], equal_to('LinphoneCallIncomingReceived')
+            )
+
+    def test_given_no_account_when_register_status_then_none(self):
+        session = self._session()
+
+        assert_that(session.register_status(), equal_to(None))
+        assert_that(session.register_statuses(), equal_to({}))
+
+    def test_given_ended_call_when_hold_without_persistent_then_current_call_held(
+        self,
+    ):
+        session = self._session(persistent=False)
+        session.call('1001')
+        daemon = self._daemon(session)
+        daemon.end_call(1)
+        daemon.incoming_call('sip:bob@example.com')
+        session.answer()
+
+        session.hold()
+
+        assert_that(daemon.calls[2]['state'], equal_to('LinphoneCallPaused'))
+
+    def test_when_pipeline_call_and_hold_then_executed_in_one_batch(self):
+        session = self._session()
+        session.register()
+        daemon = self._daemon(session)
+
+        pipeline = session.pipeline().call('1001').hold()
+        assert_that(len(session.calls), equal_to(0))
+        call, _ = pipeline.execute()
+
+        assert_that(call.call_id, equal_to(1))
+        assert_that(session.calls.get(1), equal_to(call))
+        assert_that(daemon.received['call-stats'], equal_to(0))
+        assert_that(daemon.calls[1]['state'], equal_to('LinphoneCallPaused'))
+
+    def test_when_deferred_call_then_call_registered(self):
+        session = self._session()
+
+        call = session.deferred().call('1001').result(timeout=1)
+
+        assert_that(call.call_id, equal_to(1))
+        assert_that(session.calls.get(1), equal_to(call))
+
+    def test_given_incoming_call_when_wait_for_ringing_then_answer(self):
+        session = self._session()
+        session.start()
+        session.call_status()
+        self._daemon(session).incoming_call('sip:bob@example.com')
+
+        result = session.wait_for_ringing('bob', timeout=1)
+        session.answer()
+
+        assert_that(result, equal_to(CallStatus.RINGING))
+        assert_that(session.is_talking_to('bob'), equal_to(True))
+
+    def test_given_call_after_check_when_wait_for_ringing_without_persistent_then_ringing(
+        self,
+    ):
+        session = self._session(persistent=False)
+        session.call_status()
+        daemon = self._daemon(session)
+        read_events = session.read_events
+
+        def incoming_call_then_read_events(timeout):
+            if not daemon.calls:
+                daemon.incoming_call('sip:bob@example.com')
+            return read_events(timeout)
+
+        session.read_events = incoming_call_then_read_events
+
+        result = session.wait_for_ringing('bob', timeout=1)
+
+        assert_that(result, equal_to(CallStatus.RINGING))
+
+    def test_given_read_events_waiting_when_command_from_other_thread_then_not_blocked(
+        self,
+    ):
+        for persistent in (True, False):
+            session = self._session(persistent=persistent)
+            session.call_status()
+            reader = threading.Thread(target=session.read_events, args=(1,))
+            reader.start()
+            self.addCleanup(reader.join)
+            time.sleep(0.05)
+
+            started_at = time.monotonic()
+            session.call_status()
+
+            assert_that(time.monotonic() - started_at, less_than(0.5))
+
+    def test_given_fragmented_responses_when_commands_then_parsed_whole(self):
+        session = self._session(fragment_size=8, fragment_delay=0.005)
+
+        session.register()
+        call = session.call('1001')
+        stats = session.call_stats()
+
+        assert_that(call.call_id, equal_to(1))
+        assert_that(stats.call_id, equal_to(1))
+        assert_that(stats.round_trip_delay, equal_to(0.02))
+        assert_that(session.call_status(), equal_to(CallStatus.ANSWERED))
+        assert_that(session.register_status(), equal_to(RegisterStatus.REGISTERED))
+
+    def test_given_blank_line_after_body_when_commands_then_parsed(self):
+        session = self._session(blank_line_after_body=True, fragment_size=8)
+
+        session.register()
+        call = session.call('1001')
+        stats = session.call_stats()
+        session.hold()
+        session.resume()
+
+        assert_that(call.call_id, equal_to(1))
+        assert_that(stats.round_trip_delay, equal_to(0.02))
+        assert_that(session.call_status(), equal_to(CallStatus.ANSWERED))
+        assert_that(session.register_status(), equal_to(RegisterStatus.REGISTERED))
+
+    def test_given_slow_fragments_and_settle_time_when_call_stats_then_parsed_whole(
+        self,
+    ):
+        session = self._session(settle_time=0.1, fragment_size=64, fragment_delay=0.03)
+        session.call('1001')
+
+        stats = session.call_stats()
+
+        assert_that(stats.download_bandwidth, equal_to(80.0))
+
+    def test_given_fragments_slower_than_settle_time_when_call_stats_then_logged(self):
+        session = self._session(
+            settle_time=0.005, fragment_size=64, fragment_delay=0.03
+        )
+        session.call('1001')
+
+        with self.assertLogs('linphonelib.parser', 'WARNING'):
+            session.call_stats()
+            session.read_events(0.5)
+
+    def test_given_call_error_when_call_then_extension_not_found(self):
+        session = self._session(errors={'call': 'Call creation failed.'})
+
+        assert_that(
+            calling(session.call).with_args('1001'),
+            raises(ExtensionNotFoundException),
+        )
+
+    def test_given_call_stats_error_when_call_stats_then_raise(self):
+        session = self._session()
+
+        assert_that(calling(session.call_stats), raises(LinphoneException))
+
+    def test_when_close_then_daemon_stopped(self):
+        session = self._session()
+        session.register()
+        daemon = self._daemon(session)
+
+        session.close()
+
+        assert_that(daemon.is_serving(), equal_to(False))
+        assert_that(daemon.received['quit'], equal_to(1))
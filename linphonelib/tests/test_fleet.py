@@ -0,0 +1,236 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    has_entries,
+    has_key,
+    has_length,
+    has_properties,
+    instance_of,
+    is_not,
+    only_contains,
+)
+
+from ..commands import RegisterStatus
+from ..exceptions import CommandTimeoutException, LinphoneException
+from ..fake_daemon import FakeLinphoneServer
+from ..fleet import Fleet, bulk_registering
+from ..session import Session
+
+
+class TestFleet(unittest.TestCase):
+    def setUp(self):
+        self.sessions = [Mock(name=f'session-{i}') for i in range(3)]
+        self.fleet = Fleet(self.sessions, max_workers=2)
+
+    def test_when_create_then_sessions_created_in_order(self):
+        fleet = Fleet.create(lambda index: f'session-{index}', 3)
+
+        assert_that(
+            fleet.sessions, contains_exactly('session-0', 'session-1', 'session-2')
+        )
+        assert_that(fleet.reports[0].timings, has_length(3))
+
+    def test_given_failed_session_when_start_then_other_sessions_started(self):
+        error = LinphoneException()
+        self.sessions[1].start.side_effect = error
+
+        report = self.fleet.start()
+
+        for session in self.sessions:
+            session.start.assert_called_once_with()
+        assert_that(report.failures, has_entries({self.sessions[1]: error}))
+        assert_that(report.timings, has_length(3))
+
+    def test_given_failed_session_when_register_then_session_skipped(self):
+        self.sessions[1].start.side_effect = LinphoneException()
+        self.fleet.start()
+
+        report = self.fleet.register()
+
+        self.sessions[1].register.assert_not_called()
+        assert_that(report.timings, is_not(has_key(self.sessions[1])))
+
+    def test_given_failed_session_when_close_then_session_closed(self):
+        self.sessions[1].start.side_effect = LinphoneException()
+
+        with self.fleet:
+            pass
+
+        for session in self.sessions:
+            session.close.assert_called_once_with()
+        assert_that(
+            [report.phase for report in self.fleet.reports],
+            contains_exactly('start', 'register', 'close'),
+        )
+        assert_that(self.fleet.reports[0].duration, instance_of(float))
+        assert_that(self.fleet.healthy_sessions, has_length(2))
+        assert_that(self.fleet.failures, has_length(equal_to(1)))
+
+    def test_given_daemon_still_running_when_teardown_then_killed(self):
+        paths = [tempfile.mkdtemp() for _ in self.sessions]
+        for session, path in zip(self.sessions, paths):
+            session.quit.return_value = True
+            session.wait_until_stopped.return_value = True
+            session.release.return_value = path
+        self.sessions[1].wait_until_stopped.return_value = False
+
+        report = self.fleet.teardown(stop_timeout=1)
+
+        self.sessions[0].server.force_stop.assert_not_called()
+        self.sessions[1].server.force_stop.assert_called_once_with()
+        for session in self.sessions:
+            session.release.assert_called_once_with()
+        assert_that(report, has_properties(phase='teardown', failures={}))
+        assert_that(report.timings, has_length(3))
+        assert_that(self.fleet.wait_cleanup(5), equal_to(True))
+        assert_that([os.path.exists(path) for path in paths], only_contains(False))
+
+    def test_when_teardown_then_all_daemons_asked_to_quit_before_waiting(self):
+        actions = []
+        for session in self.sessions:
+            session.quit.side_effect = lambda: actions.append('quit') or True
+            session.wait_until_stopped.side_effect = (
+                lambda timeout: actions.append('wait') or True
+            )
+            session.release.return_value = None
+
+        self.fleet.teardown(stop_timeout=1)
+
+        assert_that(actions, contains_exactly(*['quit'] * 3, *['wait'] * 3))
+
+    def test_given_quit_failure_when_teardown_then_killed_and_released(self):
+        error = LinphoneException()
+        self.sessions[1].quit.side_effect = error
+        for session in self.sessions:
+            session.release.return_value = None
+
+        report = self.fleet.teardown()
+
+        self.sessions[1].server.force_stop.assert_called_once_with()
+        self.sessions[1].release.assert_called_once_with()
+        assert_that(report.failures, equal_to({self.sessions[1]: error}))
+
+    def test_when_collect_quality_then_columns_per_session(self):
+        for i, session in enumerate(self.sessions):
+            session.call_stats.return_value = Mock(
+                round_trip_delay=0.02 * (i + 1),
+                received_jitter=0.001,
+                sent_jitter=0.001,
+                received_loss_rate=float(i),
+                sent_loss_rate=0.0,
+                upload_bandwidth=80.0,
+                download_bandwidth=80.0,
+            )
+        self.sessions[1].call_stats.side_effect = LinphoneException()
+
+        report = self.fleet.collect_quality()
+
+        assert_that(report.calls, equal_to(2))
+        assert_that(report.failures, has_key(self.sessions[1]))
+        assert_that(
+            report.worst(1), contains_exactly((self.sessions[2], report.mos[2]))
+        )
+        assert_that(report.summary('round_trip_delay'), has_entries(count=2, max=0.06))
+        assert_that(self.fleet.failures, equal_to({}))
+
+    def test_when_register_and_wait_then_polled_until_registered(self):
+        self.sessions[0].register_status.side_effect = [None, RegisterStatus.REGISTERED]
+        self.sessions[1].register_status.return_value = RegisterStatus.FAIL
+        self.sessions[2].register_status.return_value = None
+
+        report = self.fleet.register_and_wait(timeout=0.05, poll_interval=0.01)
+
+        assert_that(report.timings, has_key(self.sessions[0]))
+        assert_that(report.failures, is_not(has_key(self.sessions[0])))
+        assert_that(report.failures[self.sessions[1]], instance_of(LinphoneException))
+        assert_that(
+            report.failures[self.sessions[2]], instance_of(CommandTimeoutException)
+        )
+
+    def test_given_register_failure_when_register_and_wait_then_failure_reported(
+        self,
+    ):
+        error = LinphoneException()
+        self.sessions[1].register.side_effect = error
+        for session in self.sessions:
+            session.register_status.return_value = RegisterStatus.REGISTERED
+
+        report = self.fleet.register_and_wait(timeout=0.05, poll_interval=0.01)
+
+        self.sessions[1].register_status.assert_not_called()
+        assert_that(report.failures, equal_to({self.sessions[1]: error}))
+        assert_that(report.timings, has_length(2))
+
+    def test_given_failed_registration_when_unregister_then_all_sessions(self):
+        self.sessions[1].register.side_effect = LinphoneException()
+        self.fleet.register()
+
+        self.fleet.unregister()
+
+        for session in self.sessions:
+            session.unregister.assert_called_once_with()
+
+
+class TestBulkRegistering(unittest.TestCase):
+    def test_when_bulk_registering_then_registered_and_unregistered_on_exit(self):
+        sessions = [
+            Session(
+                f'user{i}',
+                'secret',
+                'example.com',
+                5060 + i,
+                7078 + i,
+                persistent=True,
+                server_factory=FakeLinphoneServer,
+            )
+            for i in range(3)
+        ]
+        for session in sessions:
+            self.addCleanup(session.close)
+
+        with bulk_registering(sessions, timeout=1) as report:
+            statuses = [session.register_status() for session in sessions]
+
+        assert_that(report.timings, has_length(3))
+        assert_that(report.failures, equal_to({}))
+        assert_that(statuses, only_contains(RegisterStatus.REGISTERED))
+        for session in sessions:
+            assert_that(session.register_statuses(), equal_to({}))
+
+
+class TestFleetTeardown(unittest.TestCase):
+    def test_when_teardown_then_daemons_stopped_and_files_removed(self):
+        sessions = [
+            Session(
+                f'user{i}',
+                'secret',
+                'example.com',
+                5060 + i,
+                7078 + i,
+                persistent=True,
+                server_factory=FakeLinphoneServer,
+            )
+            for i in range(3)
+        ]
+        fleet = Fleet(sessions)
+        fleet.start()
+        servers = [session.server for session in sessions]
+        paths = [session._linphone_wrapper._mount_path for session in sessions]
+
+        report = fleet.teardown(stop_timeout=1)
+
+        assert_that(report.failures, equal_to({}))
+        assert_that(
+            [server.check_running() for server in servers], only_contains(False)
+        )
+        assert_that(fleet.wait_cleanup(5), equal_to(True))
+        assert_that([os.path.exists(path) for path in paths], only_contains(False))
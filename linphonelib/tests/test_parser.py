@@ -1,12 +1,12 @@
-# Copyright 2019-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
 from unittest.mock import Mock
 
-from hamcrest import assert_that, empty
+from hamcrest import assert_that, empty, equal_to
 
-from ..parser import parse_buffer
+from ..parser import StreamParser, parse_buffer
 
 MESSAGE_DELIMITER = b'\r\n\r\n'
 EVENT_DELIMITER = b'Event: '
@@ -73,3 +73,66 @@ class TestParser(unittest.TestCase):
 
         assert_that(unparsed_buffer, empty())
         self.status_callback.assert_any_call('Ok', {'Status': 'Ok'})
+
+
+class TestStreamParser(unittest.TestCase):
+    def setUp(self):
+        self.status_callback = Mock()
+        self.event_callback = Mock()
+        self.parser = StreamParser(self.status_callback, self.event_callback)
+
+    def test_given_incomplete_line_then_kept_for_next_chunk(self):
+        self.parser.feed(b'Status: O')
+        self.parser.feed(b'k\nId: 4')
+        self.parser.feed(b'2\n')
+        self.parser.flush()
+
+        self.status_callback.assert_called_once_with('Ok', {'Status': 'Ok', 'Id': '42'})
+
+    def test_given_message_followed_by_next_message_then_emitted_without_flush(self):
+        self.parser.feed(b'Status: Ok\n\nId: 1\nStatus: Error\n')
+
+        self.status_callback.assert_called_once_with('Ok', {'Status': 'Ok', 'Id': '1'})
+
+    def test_given_trailing_message_then_emitted_once_on_flush(self):
+        self.parser.feed(b'Status: Ok\n')
+
+        self.parser.flush()
+        self.parser.flush()
+
+        self.status_callback.assert_called_once_with('Ok', {'Status': 'Ok'})
+
+    def test_given_event_then_event_callback(self):
+        self.parser.feed(b'Event-type: call-state-changed\nEvent: LinphoneCallEnd\n')
+        self.parser.flush()
+
+        self.event_callback.assert_called_once_with(
+            'call-state-changed',
+            {'Event-type': 'call-state-changed', 'Event': 'LinphoneCallEnd'},
+        )
+        self.status_callback.assert_not_called()
+
+    def test_given_reset_then_pending_data_dropped(self):
+        self.parser.feed(b'Status: Ok\nId: 1')
+
+        self.parser.reset()
+        self.parser.flush()
+
+        self.status_callback.assert_not_called()
+
+    def test_given_blank_line_after_status_then_not_at_line_end(self):
+        self.parser.feed(b'Status: Ok\n\n')
+
+        assert_that(self.parser.at_line_end, equal_to(False))
+
+    def test_given_blank_line_after_body_then_at_line_end(self):
+        self.parser.feed(b'Status: Ok\n\nState: Paused\n\n')
+
+        assert_that(self.parser.at_line_end, equal_to(True))
+
+    def test_given_data_outside_of_message_then_warning_logged(self):
+        with self.assertLogs('linphonelib.parser', 'WARNING'):
+            self.parser.feed(b'ndwidth: 80.000000\n')
+            self.parser.flush()
+
+        self.status_callback.assert_not_called()
@@ -0,0 +1,190 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import itertools
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch, sentinel
+
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    has_entries,
+    is_not,
+    raises,
+    same_instance,
+)
+
+from ..exceptions import LinphoneException
+from ..fake_daemon import FakeLinphoneServer
+from ..pool import DaemonPool
+from ..ports import PortAllocator
+
+
+def _ports():
+    return ((5060 + i, 7078 + 2 * i) for i in itertools.count())
+
+
+@patch('linphonelib.pool._LinphoneWrapper')
+class TestDaemonPool(unittest.TestCase):
+    def _pool(self, **kwargs):
+        kwargs.setdefault('min_idle', 0)
+        return DaemonPool(_ports(), **kwargs)
+
+    def _wrapper_factory(self, wrapper_class):
+        def create(sip_port, rtp_port, *args, **kwargs):
+            wrapper = Mock(ports=(sip_port, rtp_port))
+            wrapper.is_running.return_value = True
+            return wrapper
+
+        wrapper_class.side_effect = create
+
+    def test_when_warm_then_min_idle_daemons_started(self, wrapper_class):
+        self._wrapper_factory(wrapper_class)
+        pool = self._pool(min_idle=2, max_idle=2)
+
+        pool.warm()
+
+        assert_that(pool.idle_count, equal_to(2))
+        assert_that(wrapper_class.call_count, equal_to(2))
+
+    def test_given_released_daemon_when_lease_then_reset_and_reused(
+        self, wrapper_class
+    ):
+        self._wrapper_factory(wrapper_class)
+        pool = self._pool()
+        wrapper = pool.lease()
+
+        pool.release(wrapper)
+
+        wrapper.reset.assert_called_once_with()
+        wrapper.stop_and_clean.assert_not_called()
+        assert_that(pool.lease(), same_instance(wrapper))
+
+    def test_given_max_idle_reached_when_release_then_daemon_stopped(
+        self, wrapper_class
+    ):
+        self._wrapper_factory(wrapper_class)
+        pool = self._pool(max_idle=0)
+        wrapper = pool.lease()
+
+        pool.release(wrapper)
+
+        wrapper.stop_and_clean.assert_called_once_with()
+        assert_that(pool.idle_count, equal_to(0))
+
+    def test_given_unhealthy_idle_daemon_when_lease_then_evicted(self, wrapper_class):
+        self._wrapper_factory(wrapper_class)
+        pool = self._pool()
+        unhealthy = pool.lease()
+        pool.release(unhealthy)
+        unhealthy.is_running.return_value = False
+
+        wrapper = pool.lease()
+
+        unhealthy.stop_and_clean.assert_called_once_with()
+        assert_that(wrapper, is_not(same_instance(unhealthy)))
+        assert_that(wrapper.ports, equal_to(unhealthy.ports))
+
+    def test_given_reset_fails_when_release_then_evicted(self, wrapper_class):
+        self._wrapper_factory(wrapper_class)
+        pool = self._pool()
+        wrapper = pool.lease()
+        wrapper.reset.side_effect = LinphoneException()
+
+        pool.release(wrapper)
+
+        wrapper.stop_and_clean.assert_called_once_with()
+        assert_that(pool.idle_count, equal_to(0))
+
+    def test_when_lease_then_daemon_created_with_pool_options(self, wrapper_class):
+        self._wrapper_factory(wrapper_class)
+        pool = self._pool(
+            server_factory=sentinel.server_factory,
+            docker=sentinel.docker,
+            start_timeout=1,
+            stop_timeout=2,
+        )
+
+        pool.lease()
+
+        wrapper_class.assert_called_once()
+        assert_that(
+            wrapper_class.call_args.kwargs,
+            has_entries(
+                server_factory=sentinel.server_factory,
+                docker=sentinel.docker,
+                start_timeout=1,
+                stop_timeout=2,
+                port_allocator=None,
+            ),
+        )
+
+    def test_given_port_allocator_when_evicted_then_ports_left_to_allocator(
+        self, wrapper_class
+    ):
+        self._wrapper_factory(wrapper_class)
+        allocator = Mock(spec=PortAllocator)
+        pool = DaemonPool(allocator, min_idle=0, max_idle=0)
+
+        pool.release(pool.lease())
+        pool.lease()
+
+        assert_that(wrapper_class.call_count, equal_to(2))
+        for call in wrapper_class.call_args_list:
+            assert_that(call.args[:2], equal_to((None, None)))
+            assert_that(call.kwargs['port_allocator'], same_instance(allocator))
+
+    def test_given_closed_pool_when_release_then_daemon_stopped(self, wrapper_class):
+        self._wrapper_factory(wrapper_class)
+        pool = self._pool()
+        wrapper = pool.lease()
+        pool.close()
+
+        pool.release(wrapper)
+
+        wrapper.stop_and_clean.assert_called_once_with()
+        assert_that(pool.idle_count, equal_to(0))
+
+    def test_given_pool_full_when_lease_then_raise_after_timeout(self, wrapper_class):
+        self._wrapper_factory(wrapper_class)
+        pool = self._pool(max_size=1, max_idle=1)
+        pool.lease()
+
+        assert_that(
+            calling(pool.lease).with_args(timeout=0.01), raises(LinphoneException)
+        )
+
+
+class TestDaemonPoolOnFakeDaemon(unittest.TestCase):
+    def setUp(self):
+        self.lock_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.lock_dir)
+        # A single block: it is allocated again only once released
+        self.allocator = PortAllocator(25060, 26000, count=1, lock_dir=self.lock_dir)
+
+    def _pool(self, **kwargs):
+        pool = DaemonPool(
+            self.allocator, min_idle=0, server_factory=FakeLinphoneServer, **kwargs
+        )
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_given_port_allocator_when_daemon_evicted_then_block_released(self):
+        pool = self._pool(max_idle=0)
+        wrapper = pool.lease()
+        assert_that(wrapper.ports, equal_to((25060, 26000)))
+
+        pool.release(wrapper)
+
+        assert_that(self.allocator.allocate(), equal_to((25060, 26000)))
+
+    def test_given_port_allocator_when_close_then_idle_blocks_released(self):
+        pool = self._pool()
+        pool.release(pool.lease())
+
+        pool.close()
+
+        assert_that(self.allocator.allocate(), equal_to((25060, 26000)))
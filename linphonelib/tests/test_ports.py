@@ -0,0 +1,89 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import shutil
+import socket
+import tempfile
+import unittest
+
+from hamcrest import assert_that, calling, equal_to, is_not, raises
+
+from ..exceptions import LinphoneException
+from ..ports import PortAllocator, PortBlock
+
+
+class TestPortAllocator(unittest.TestCase):
+    def setUp(self):
+        self.lock_dir = tempfile.mkdtemp()
+        self.sip_port_start = self._free_udp_port_range()
+
+    def tearDown(self):
+        shutil.rmtree(self.lock_dir)
+
+    def _free_udp_port_range(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.bind(('', 0))
+            return sock.getsockname()[1]
+
+    def _allocator(self, count=4):
+        return PortAllocator(
+            self.sip_port_start,
+            self.sip_port_start + 1000,
+            count=count,
+            lock_dir=self.lock_dir,
+        )
+
+    def test_when_allocate_twice_then_blocks_do_not_overlap(self):
+        allocator = self._allocator()
+
+        first, second = allocator.allocate(), allocator.allocate()
+
+        assert_that(first, is_not(equal_to(second)))
+        assert_that(abs(first.rtp_port - second.rtp_port) >= 2, equal_to(True))
+
+    def test_given_block_locked_by_other_allocator_when_allocate_then_skipped(self):
+        other_allocator = self._allocator()
+        first = other_allocator.allocate()
+
+        second = self._allocator().allocate()
+
+        assert_that(second, is_not(equal_to(first)))
+
+    def test_given_block_released_when_allocate_from_other_allocator_then_reused(
+        self,
+    ):
+        allocator = self._allocator(count=1)
+        block = allocator.allocate()
+        allocator.release(block)
+
+        assert_that(self._allocator(count=1).allocate(), equal_to(block))
+
+    def test_given_port_in_use_when_allocate_then_block_skipped(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.bind(('', self.sip_port_start))
+
+            block = self._allocator().allocate()
+
+        assert_that(block.sip_port, is_not(equal_to(self.sip_port_start)))
+
+    def test_given_rejected_block_when_allocate_then_never_reused(self):
+        allocator = self._allocator(count=2)
+        block = allocator.allocate()
+        allocator.reject(block)
+        allocator.release(allocator.allocate())
+
+        assert_that(allocator.allocate(), is_not(equal_to(block)))
+
+    def test_given_all_blocks_used_when_allocate_then_raise(self):
+        allocator = self._allocator(count=1)
+        allocator.allocate()
+
+        assert_that(calling(allocator.allocate), raises(LinphoneException))
+
+    def test_when_iterate_then_blocks_allocated(self):
+        allocator = self._allocator()
+
+        assert_that(
+            next(iter(allocator)),
+            equal_to(PortBlock(self.sip_port_start, self.sip_port_start + 1000)),
+        )
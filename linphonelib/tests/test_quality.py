@@ -0,0 +1,146 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import math
+import time
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    calling,
+    close_to,
+    contains_exactly,
+    equal_to,
+    greater_than_or_equal_to,
+    has_entries,
+    has_key,
+    none,
+    raises,
+)
+
+from ..exceptions import NoActiveCallException
+from ..fake_daemon import FakeLinphoneServer
+from ..quality import QualityReport, QualitySampler, QualitySeries, estimate_mos
+from ..session import Session
+
+
+def _stats(received_loss_rate=0.0, round_trip_delay=0.02):
+    return Mock(
+        round_trip_delay=round_trip_delay,
+        received_jitter=0.001,
+        sent_jitter=None,
+        received_loss_rate=received_loss_rate,
+        sent_loss_rate=0.0,
+        upload_bandwidth=80.0,
+        download_bandwidth=80.0,
+        call_id=1,
+    )
+
+
+class TestQualitySeries(unittest.TestCase):
+    def test_given_full_when_append_then_oldest_overwritten(self):
+        series = QualitySeries(capacity=3)
+
+        for i in range(5):
+            series.append(i, _stats(round_trip_delay=i))
+
+        assert_that(list(series.values('round_trip_delay')), equal_to([2, 3, 4]))
+        assert_that(list(series.times()), equal_to([2, 3, 4]))
+        assert_that(len(series), equal_to(3))
+
+    def test_when_summary_then_statistics_of_samples(self):
+        series = QualitySeries(capacity=10)
+        for delay in (0.04, 0.01, 0.02, 0.03):
+            series.append(0, _stats(round_trip_delay=delay))
+
+        summary = series.summary('round_trip_delay')
+
+        assert_that(summary, has_entries(count=4, min=0.01, max=0.04, p50=0.03))
+
+    def test_given_missing_metric_when_summary_then_no_samples(self):
+        series = QualitySeries(capacity=10)
+        series.append(0, _stats())
+
+        assert_that(series.summary('sent_jitter'), equal_to({'count': 0}))
+
+    def test_when_loss_bursts_then_runs_over_threshold(self):
+        series = QualitySeries(capacity=10)
+        for loss in (0, 5, 6, 0, 0, 2, 0, 3, 4, 1):
+            series.append(0, _stats(received_loss_rate=loss))
+
+        assert_that(series.loss_bursts(), contains_exactly(2, 1, 3))
+        assert_that(series.loss_bursts(threshold=2), contains_exactly(2, 2))
+
+
+class TestQualityReport(unittest.TestCase):
+    def setUp(self):
+        self.sessions = ['good', 'lossy', 'idle', 'late']
+        self.report = QualityReport(self.sessions)
+        self.report.store(0, _stats())
+        self.report.store(1, _stats(received_loss_rate=10))
+        self.report.store(3, _stats(round_trip_delay=0.6))
+        self.report.estimate_mos()
+
+    def test_when_estimate_mos_then_nan_without_stats(self):
+        assert_that(self.report.calls, equal_to(3))
+        assert_that(math.isnan(self.report.mos[2]), equal_to(True))
+
+    def test_when_worst_then_lowest_mos_first(self):
+        worst = [session for session, _ in self.report.worst(2)]
+
+        assert_that(worst, contains_exactly('lossy', 'late'))
+
+    def test_when_worst_by_metric_then_highest_first(self):
+        worst = self.report.worst(1, 'round_trip_delay')
+
+        assert_that(worst, contains_exactly(('late', 0.6)))
+
+    def test_when_share_over_then_share_of_calls_at_or_over_threshold(self):
+        share = self.report.share_over((4.0, 1.0))
+
+        assert_that(share, equal_to({4.0: 1 / 3, 1.0: 1.0}))
+
+    def test_when_estimate_mos_then_bounded(self):
+        assert_that(estimate_mos(0.02, 0.0, 0.0), close_to(4.4, 0.01))
+        assert_that(estimate_mos(0.02, 0.0, 50.0), equal_to(1.0))
+
+
+class TestQualitySampler(unittest.TestCase):
+    def setUp(self):
+        self.session = Session(
+            'alice',
+            'secret',
+            'example.com',
+            5060,
+            7078,
+            persistent=True,
+            server_factory=FakeLinphoneServer,
+        )
+        self.addCleanup(self.session.close)
+
+    def test_given_no_call_when_sample_then_nothing_stored(self):
+        sampler = QualitySampler(self.session)
+
+        assert_that(sampler.sample(), none())
+        assert_that(sampler.series, equal_to({}))
+
+    def test_given_call_when_sample_then_stored_per_call(self):
+        sampler = QualitySampler(self.session)
+        self.session.call('1001')
+
+        sampler.sample()
+        sampler.sample()
+
+        assert_that(sampler.series, has_key(1))
+        assert_that(sampler.series[1].summary('round_trip_delay'), has_entries(count=2))
+
+    def test_when_started_then_samples_while_session_used(self):
+        self.session.call('1001')
+
+        with QualitySampler(self.session, interval=0.005) as sampler:
+            time.sleep(0.05)
+            self.session.hangup()
+
+        assert_that(len(sampler.series[1]), greater_than_or_equal_to(2))
+        assert_that(calling(self.session.hangup), raises(NoActiveCallException))
@@ -0,0 +1,213 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import functools
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    equal_to,
+    has_entries,
+    instance_of,
+    less_than,
+    raises,
+)
+
+from ..base_command import PipelineCommand
+from ..client import LinphoneClient
+from ..commands import (
+    CallStatus,
+    CallStatusCommand,
+    RegisterCommand,
+    RegisterStatus,
+    RegisterStatusCommand,
+)
+from ..exceptions import (
+    CommandTimeoutException,
+    LinphoneConnectionError,
+    LinphoneException,
+)
+from ..fake_daemon import FakeDaemon, FakeLinphoneServer
+from ..reactor import Reactor
+from ..session import Session
+from ..tracing import TOTAL, Tracer
+
+
+class TestReactor(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.reactor = Reactor(timeout=2)
+        self.reactor.start()
+        self.addCleanup(self.reactor.close)
+
+    def _daemon(self, name='socket', **options):
+        daemon = FakeDaemon(os.path.join(self.tmp_dir, name), **options)
+        daemon.start()
+        self.addCleanup(daemon.stop)
+        return daemon, LinphoneClient(daemon._socket_file)
+
+    def test_given_many_clients_when_submit_then_all_answered(self):
+        clients = []
+        for i in range(5):
+            daemon, client = self._daemon(f'socket-{i}')
+            daemon.incoming_call('sip:bob@host')
+            clients.append(client)
+
+        futures = [
+            self.reactor.submit(client, CallStatusCommand()) for client in clients
+        ]
+
+        results = [future.result(timeout=2) for future in futures]
+        assert_that(results, equal_to([CallStatus.RINGING] * 5))
+
+    def test_given_slow_fragments_when_submit_then_other_clients_not_stalled(self):
+        slow_daemon, _ = self._daemon('slow', fragment_size=40, fragment_delay=0.3)
+        slow_daemon.incoming_call('sip:bob@host')
+        slow_client = LinphoneClient(slow_daemon._socket_file, settle_time=0.5)
+        _, client = self._daemon()
+
+        slow = self.reactor.submit(slow_client, CallStatusCommand(), timeout=5)
+        time.sleep(0.05)
+        started_at = time.monotonic()
+        result = self.reactor.submit(client, CallStatusCommand()).result(timeout=2)
+
+        assert_that(time.monotonic() - started_at, less_than(0.2))
+        assert_that(result, equal_to(CallStatus.OFF))
+        assert_that(slow.result(timeout=5), equal_to(CallStatus.RINGING))
+
+    def test_when_submit_many_commands_to_one_client_then_sent_in_order(self):
+        _, client = self._daemon()
+
+        register = self.reactor.submit(
+            client, RegisterCommand('alice', 'secret', 'host')
+        )
+        status = self.reactor.submit(client, RegisterStatusCommand())
+
+        assert_that(register.result(timeout=2), equal_to('1'))
+        assert_that(status.result(timeout=2), equal_to(RegisterStatus.REGISTERED))
+
+    def test_when_submit_pipeline_then_one_result_per_command(self):
+        _, client = self._daemon()
+        pipeline = PipelineCommand(
+            [RegisterCommand('alice', 'secret', 'host'), CallStatusCommand()]
+        )
+
+        results = self.reactor.submit(client, pipeline).result(timeout=2)
+
+        assert_that(results, contains_exactly('1', CallStatus.OFF))
+
+    def test_given_slow_daemon_when_deadline_passed_then_timeout(self):
+        daemon, client = self._daemon(latency=0.5)
+        started_at = time.monotonic()
+
+        future = self.reactor.submit(client, CallStatusCommand(), timeout=0.05)
+
+        assert_that(
+            calling(future.result).with_args(timeout=2),
+            raises(CommandTimeoutException),
+        )
+        assert_that(time.monotonic() - started_at, less_than(0.4))
+
+        daemon.latency = 0
+        result = self.reactor.submit(client, CallStatusCommand()).result(timeout=2)
+        assert_that(result, equal_to(CallStatus.OFF))
+
+    def test_given_no_daemon_when_submit_then_connection_error(self):
+        client = LinphoneClient(os.path.join(self.tmp_dir, 'missing'))
+
+        future = self.reactor.submit(client, CallStatusCommand())
+
+        assert_that(
+            calling(future.result).with_args(timeout=2),
+            raises(LinphoneConnectionError),
+        )
+
+    def test_given_stopped_reactor_when_submit_then_connection_error(self):
+        _, client = self._daemon()
+        self.reactor.stop()
+
+        future = self.reactor.submit(client, CallStatusCommand())
+
+        assert_that(future.exception(timeout=0), instance_of(LinphoneConnectionError))
+
+    def test_when_wait_events_then_events_published(self):
+        daemon, client = self._daemon()
+        events = []
+        client.events.subscribe(events.append)
+        self.reactor.watch(client).result(timeout=2)
+        # The daemon knows the connection once it answered on it
+        self.reactor.submit(client, CallStatusCommand()).result(timeout=2)
+
+        daemon.incoming_call('sip:bob@host')
+
+        assert_that(self.reactor.wait_events(client, 2), equal_to(True))
+        assert_that(
+            events[0].body, has_entries(Event='LinphoneCallIncomingReceived', Id='1')
+        )
+
+
+class TestSessionWithReactor(unittest.TestCase):
+    def setUp(self):
+        self.reactor = Reactor()
+        self.reactor.start()
+        self.addCleanup(self.reactor.close)
+        self.tracer = Tracer()
+        self.session = self._session()
+
+    def _session(self, **options):
+        session = Session(
+            'alice',
+            'secret',
+            'example.com',
+            5060,
+            7078,
+            server_factory=functools.partial(FakeLinphoneServer, **options),
+            reactor=self.reactor,
+            tracer=self.tracer,
+        )
+        self.addCleanup(session.close)
+        return session
+
+    def test_when_command_then_blocking_result(self):
+        self.session.register()
+
+        assert_that(self.session.register_status(), equal_to(RegisterStatus.REGISTERED))
+        histogram = self.tracer.histogram(RegisterStatusCommand, TOTAL)
+        assert_that(histogram.count, equal_to(1))
+
+    def test_when_deferred_then_future_of_result(self):
+        sessions = [self.session, self._session(), self._session()]
+
+        futures = [session.deferred().call_status() for session in sessions]
+
+        results = [future.result(timeout=2) for future in futures]
+        assert_that(results, equal_to([CallStatus.OFF] * 3))
+
+    def test_given_invalid_command_when_execute_then_raised_and_reactor_running(self):
+        assert_that(calling(self.session.resume), raises(LinphoneException))
+
+        assert_that(self.session.call_status(), equal_to(CallStatus.OFF))
+
+    def test_given_slow_daemon_when_deferred_with_timeout_then_timeout(self):
+        session = self._session(latency=0.5)
+        session.start()
+
+        future = session.deferred(timeout=0.05).call_status()
+
+        assert_that(future.exception(timeout=2), instance_of(CommandTimeoutException))
+
+    def test_when_wait_for_ringing_then_events_read_by_reactor(self):
+        self.session.call_status()
+        self.session._linphone_wrapper._server.daemon.incoming_call('sip:bob@host')
+
+        status = self.session.wait_for_ringing(timeout=2)
+
+        assert_that(status, equal_to(CallStatus.RINGING))
+        assert_that(len(self.session.calls), equal_to(1))
@@ -0,0 +1,54 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from hamcrest import assert_that, equal_to
+
+from ..readiness import wait_for_connectable, wait_for_path
+
+
+class TestReadiness(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'socket')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _later(self, action):
+        timer = threading.Timer(0.05, action)
+        timer.start()
+        self.addCleanup(timer.join)
+
+    def test_given_path_created_later_when_wait_for_path_then_true(self):
+        self._later(lambda: open(self.path, 'w').close())
+
+        assert_that(wait_for_path(self.path, timeout=5), equal_to(True))
+
+    def test_given_path_never_created_when_wait_for_path_then_false(self):
+        assert_that(wait_for_path(self.path, timeout=0.05), equal_to(False))
+
+    def test_given_socket_listening_later_when_wait_for_connectable_then_true(self):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+
+        def listen():
+            server.bind(self.path)
+            server.listen()
+
+        self._later(listen)
+
+        assert_that(wait_for_connectable(self.path, timeout=5), equal_to(True))
+
+    def test_given_socket_not_listening_when_wait_for_connectable_then_false(self):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+        server.bind(self.path)
+
+        assert_that(wait_for_connectable(self.path, timeout=0.05), equal_to(False))
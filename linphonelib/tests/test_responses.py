@@ -0,0 +1,64 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, equal_to, has_entries, instance_of, none
+
+from ..commands import CallStatsCommand
+from ..responses import Body, CallStats
+
+CALL_STATS_LINES = [
+    b'Status: Ok',
+    b'Id: 3',
+    b'Audio-RoundTrip delay: 0.025000',
+    b'Audio-Received loss rate: 1.500000',
+    b'Audio-Sent interarrival jitter: invalid',
+]
+
+
+class TestBody(unittest.TestCase):
+    def test_when_read_then_lines_decoded(self):
+        body = Body([b'Status: Ok', b'invalid line', b'Reason:  No call.'])
+
+        assert_that(body, equal_to({'Status': 'Ok', 'Reason': 'No call.'}))
+        assert_that(body.get('Id'), none())
+
+    def test_given_not_read_then_lines_kept_raw(self):
+        body = Body([b'Status: Ok'])
+
+        assert_that(body._fields, none())
+
+    def test_when_same_header_twice_then_last_value(self):
+        body = Body([b'Status: Ok', b'Status: Error'])
+
+        assert_that(body['Status'], equal_to('Error'))
+
+
+class TestCallStats(unittest.TestCase):
+    def test_when_read_numbers_then_converted(self):
+        stats = CallStats(CALL_STATS_LINES)
+
+        assert_that(stats.call_id, equal_to(3))
+        assert_that(stats.round_trip_delay, equal_to(0.025))
+        assert_that(stats.received_loss_rate, equal_to(1.5))
+
+    def test_given_missing_or_invalid_header_then_none(self):
+        stats = CallStats(CALL_STATS_LINES)
+
+        assert_that(stats.upload_bandwidth, none())
+        assert_that(stats.sent_jitter, none())
+
+    def test_when_read_number_twice_then_converted_once(self):
+        stats = CallStats(CALL_STATS_LINES)
+        stats.round_trip_delay
+        stats._fields['Audio-RoundTrip delay'] = '1.0'
+
+        assert_that(stats.round_trip_delay, equal_to(0.025))
+
+    def test_when_call_stats_command_then_call_stats(self):
+        result = CallStatsCommand().handle_status_ok(Body(CALL_STATS_LINES))
+
+        assert_that(result, instance_of(CallStats))
+        assert_that(result, has_entries(Id='3'))
+        assert_that(result.call_id, equal_to(3))
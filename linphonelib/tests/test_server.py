@@ -0,0 +1,190 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from hamcrest import assert_that, calling, equal_to, has_properties, raises
+
+from ..exceptions import ServerStartException
+from ..server import (
+    LinphoneProcessServer,
+    LinphoneServer,
+    LivenessTracker,
+    force_stop_all,
+)
+
+FAKE_DAEMON = f'''#!{sys.executable}
+import socket, sys, time
+args = sys.argv[1:]
+if '--exit' in open(args[args.index('--config') + 1]).read():
+    sys.exit(1)
+sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+sock.bind(args[args.index('--pipe') + 1])
+sock.listen()
+time.sleep(60)
+'''
+
+
+class TestLivenessTracker(unittest.TestCase):
+    def test_given_never_marked_when_is_alive_then_miss(self):
+        tracker = LivenessTracker()
+
+        assert_that(tracker.is_alive(), equal_to(False))
+        assert_that(tracker, has_properties(hits=0, misses=1))
+
+    def test_given_marked_alive_when_is_alive_then_hit(self):
+        tracker = LivenessTracker()
+        tracker.mark_alive()
+
+        assert_that(tracker.is_alive(), equal_to(True))
+        assert_that(tracker, has_properties(hits=1, misses=0))
+
+    def test_given_ttl_expired_when_is_alive_then_miss(self):
+        tracker = LivenessTracker(ttl=0)
+        tracker.mark_alive()
+
+        assert_that(tracker.is_alive(), equal_to(False))
+
+    def test_given_invalidated_when_is_alive_then_miss(self):
+        tracker = LivenessTracker()
+        tracker.mark_alive()
+        tracker.invalidate()
+
+        assert_that(tracker.is_alive(), equal_to(False))
+
+
+@patch('linphonelib.server.subprocess.run')
+class TestLinphoneServerDocker(unittest.TestCase):
+    def setUp(self):
+        self.server = LinphoneServer('/tmp/abc/socket', '/tmp/abc', None)
+
+    def test_given_container_listed_when_is_running_twice_then_docker_called_once(
+        self, run
+    ):
+        run.return_value = Mock(stdout=b'1234\n')
+
+        assert_that(self.server.is_running(), equal_to(True))
+        assert_that(self.server.is_running(), equal_to(True))
+
+        run.assert_called_once()
+        assert_that(self.server.liveness, has_properties(hits=1, misses=1))
+
+    def test_given_container_not_listed_when_is_running_then_not_cached(self, run):
+        run.return_value = Mock(stdout=b'')
+
+        assert_that(self.server.is_running(), equal_to(False))
+        assert_that(self.server.is_running(), equal_to(False))
+
+        assert_that(run.call_count, equal_to(2))
+
+    def test_given_liveness_invalidated_when_is_running_then_docker_called(self, run):
+        run.return_value = Mock(stdout=b'1234\n')
+        self.server.is_running()
+
+        self.server.invalidate_liveness()
+        self.server.is_running()
+
+        assert_that(run.call_count, equal_to(2))
+
+    def test_given_container_exits_when_wait_until_stopped_then_true(self, run):
+        assert_that(self.server.wait_until_stopped(5), equal_to(True))
+
+        run.assert_called_once()
+        assert_that(run.call_args.args[0], equal_to(['docker', 'wait', 'abc']))
+
+    def test_given_container_still_running_when_wait_until_stopped_then_false(
+        self, run
+    ):
+        run.side_effect = subprocess.TimeoutExpired('docker', 5)
+
+        assert_that(self.server.wait_until_stopped(5), equal_to(False))
+
+
+class TestForceStopAll(unittest.TestCase):
+    def test_given_containers_when_force_stop_all_then_one_kill_per_docker(self):
+        docker, other_docker = Mock(), Mock()
+        servers = [
+            LinphoneServer(f'/tmp/{name}/socket', f'/tmp/{name}', None, docker=docker)
+            for name in ('a', 'b')
+        ]
+        servers.append(
+            LinphoneServer('/tmp/c/socket', '/tmp/c', None, docker=other_docker)
+        )
+        process_server = Mock()
+
+        force_stop_all(servers + [process_server])
+
+        docker.kill.assert_called_once_with('a', 'b')
+        other_docker.kill.assert_called_once_with('c')
+        process_server.force_stop.assert_called_once_with()
+
+    @patch('subprocess.run')
+    def test_given_default_docker_when_force_stop_all_then_single_command(self, run):
+        servers = [
+            LinphoneServer(f'/tmp/{name}/socket', f'/tmp/{name}', None)
+            for name in ('a', 'b')
+        ]
+
+        force_stop_all(servers)
+
+        run.assert_called_once_with(['docker', 'kill', 'a', 'b'])
+
+
+class TestLinphoneProcessServer(unittest.TestCase):
+    def setUp(self):
+        self.mount_path = tempfile.mkdtemp()
+        self.daemon_path = os.path.join(self.mount_path, 'linphone-daemon')
+        with open(self.daemon_path, 'w') as f:
+            f.write(FAKE_DAEMON)
+        os.chmod(self.daemon_path, stat.S_IRWXU)
+        self.config_file = os.path.join(self.mount_path, 'linphonerc')
+        open(self.config_file, 'w').close()
+        self.server = self._server()
+
+    def tearDown(self):
+        self.server.force_stop()
+        shutil.rmtree(self.mount_path)
+
+    def _server(self, daemon_path=None):
+        return LinphoneProcessServer(
+            os.path.join(self.mount_path, 'socket'),
+            self.mount_path,
+            None,
+            start_timeout=5,
+            daemon_path=daemon_path or self.daemon_path,
+        )
+
+    def test_when_start_then_running_until_force_stop(self):
+        self.server.start()
+
+        assert_that(self.server.check_running(), equal_to(True))
+
+        self.server.force_stop()
+
+        assert_that(self.server.check_running(), equal_to(False))
+
+    def test_given_running_when_wait_until_stopped_then_false_after_timeout(self):
+        self.server.start()
+
+        assert_that(self.server.wait_until_stopped(0.01), equal_to(False))
+
+    def test_given_daemon_exits_when_start_then_raise(self):
+        with open(self.config_file, 'w') as f:
+            f.write('--exit')
+        self.server = self._server()
+        self.server._start_timeout = 0.2
+
+        assert_that(calling(self.server.start), raises(ServerStartException))
+        assert_that(self.server.wait_until_stopped(0), equal_to(True))
+
+    def test_given_missing_daemon_when_start_then_raise(self):
+        self.server = self._server(os.path.join(self.mount_path, 'missing'))
+
+        assert_that(calling(self.server.start), raises(ServerStartException))
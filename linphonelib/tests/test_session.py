@@ -0,0 +1,228 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import MagicMock, Mock, sentinel
+
+from hamcrest import assert_that, calling, equal_to, raises
+
+from ..commands import CallStatus, RegisterStatus
+from ..events import Event, EventChannel
+from ..exceptions import (
+    CommandTimeoutException,
+    LinphoneConnectionError,
+    ServerStartException,
+)
+from ..session import Session, _LinphoneWrapper
+
+
+class TestLinphoneWrapper(unittest.TestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.server = Mock()
+        self.cmd = Mock()
+        self.cmd.execute.return_value = sentinel.result
+
+    def _wrapper(self, **kwargs):
+        wrapper = _LinphoneWrapper(5060, 7078, **kwargs)
+        wrapper._client = self.client
+        wrapper._server = self.server
+        wrapper._configured = True
+        return wrapper
+
+    def test_given_default_mode_when_execute_then_disconnect_after_command(self):
+        wrapper = self._wrapper()
+
+        result = wrapper.execute(self.cmd)
+
+        assert_that(result, equal_to(sentinel.result))
+        self.client.connect.assert_called_once_with()
+        self.client.disconnect.assert_called_once_with()
+
+    def test_given_persistent_mode_when_execute_twice_then_never_disconnect(self):
+        wrapper = self._wrapper(persistent=True)
+
+        wrapper.execute(self.cmd)
+        wrapper.execute(self.cmd)
+
+        self.client.disconnect.assert_not_called()
+
+    def test_given_persistent_mode_when_connection_error_then_reconnect_and_retry(self):
+        wrapper = self._wrapper(persistent=True)
+        self.cmd.execute.side_effect = [LinphoneConnectionError(), sentinel.result]
+
+        result = wrapper.execute(self.cmd)
+
+        assert_that(result, equal_to(sentinel.result))
+        self.client.disconnect.assert_called_once_with()
+        assert_that(self.client.connect.call_count, equal_to(2))
+
+    def test_given_persistent_mode_when_timeout_then_disconnect_and_raise(self):
+        wrapper = self._wrapper(persistent=True)
+        self.cmd.execute.side_effect = CommandTimeoutException()
+
+        assert_that(
+            calling(wrapper.execute).with_args(self.cmd),
+            raises(CommandTimeoutException),
+        )
+        self.client.disconnect.assert_called_once_with()
+
+    def test_when_connection_lost_then_liveness_invalidated(self):
+        wrapper = self._wrapper()
+        self.cmd.execute.side_effect = CommandTimeoutException()
+
+        assert_that(
+            calling(wrapper.execute).with_args(self.cmd),
+            raises(CommandTimeoutException),
+        )
+        self.server.invalidate_liveness.assert_called_once_with()
+
+    def test_given_persistent_mode_when_stop_and_clean_then_disconnect(self):
+        wrapper = self._wrapper(persistent=True)
+        self.server.is_running.return_value = False
+
+        wrapper.stop_and_clean()
+
+        self.client.disconnect.assert_called_once_with()
+
+    def test_given_start_failure_when_execute_then_retried_with_other_ports(self):
+        allocator = Mock()
+        allocator.allocate.return_value = (5062, 7082)
+        wrapper = self._wrapper(port_allocator=allocator)
+        wrapper._port_block = (5060, 7078)
+        wrapper._create_config_file = Mock()
+        self.server.is_running.return_value = False
+        self.server.start.side_effect = [ServerStartException(), None]
+
+        wrapper.execute(self.cmd)
+
+        allocator.reject.assert_called_once_with((5060, 7078))
+        assert_that(wrapper.ports, equal_to((5062, 7082)))
+
+    def test_given_allocated_ports_when_stop_and_clean_then_ports_released(self):
+        allocator = Mock()
+        wrapper = self._wrapper(port_allocator=allocator)
+        wrapper._port_block = (5060, 7078)
+        self.server.is_running.return_value = False
+
+        wrapper.stop_and_clean()
+
+        allocator.release.assert_called_once_with((5060, 7078))
+
+    def test_given_not_configured_when_stop_and_clean_then_nothing_done(self):
+        wrapper = _LinphoneWrapper(5060, 7078)
+
+        wrapper.stop_and_clean()
+
+
+class TestSessionWaitFor(unittest.TestCase):
+    def setUp(self):
+        self.session = Session('alice', 'secret', 'localhost', 5060, 7078)
+        self.wrapper = self.session._linphone_wrapper = MagicMock()
+        self.wrapper.holding_connection.return_value.__exit__.return_value = False
+        self.wrapper.events = EventChannel()
+        self.wrapper.execute.return_value = None
+
+    def _on_read_events(self, *events):
+        def read_events(timeout):
+            for event in events:
+                self.wrapper.events.publish(event)
+            return True
+
+        self.wrapper.read_events.side_effect = read_events
+
+    def test_given_already_ringing_when_wait_for_ringing_then_no_event_read(self):
+        self.wrapper.execute.return_value = CallStatus.RINGING
+
+        result = self.session.wait_for_ringing()
+
+        assert_that(result, equal_to(CallStatus.RINGING))
+        self.wrapper.read_events.assert_not_called()
+
+    def test_given_ringing_event_from_caller_when_wait_for_ringing_then_ringing(self):
+        self._on_read_events(
+            Event(
+                'call-state-changed',
+                {'Event': 'LinphoneCallIncomingReceived', 'From': 'sip:bob@x'},
+            ),
+        )
+
+        result = self.session.wait_for_ringing('bob', timeout=1)
+
+        assert_that(result, equal_to(CallStatus.RINGING))
+
+    def test_given_ringing_event_from_other_caller_when_wait_for_ringing_then_timeout(
+        self,
+    ):
+        self._on_read_events(
+            Event(
+                'call-state-changed',
+                {'Event': 'LinphoneCallIncomingReceived', 'From': 'sip:eve@x'},
+            ),
+        )
+
+        assert_that(
+            calling(self.session.wait_for_ringing).with_args('bob', timeout=0.01),
+            raises(CommandTimeoutException),
+        )
+
+    def test_given_registration_event_when_wait_for_registration_then_registered(self):
+        self._on_read_events(
+            Event('registration-state-changed', {'State': 'LinphoneRegistrationOk'}),
+        )
+
+        result = self.session.wait_for_registration(timeout=1)
+
+        assert_that(result, equal_to(RegisterStatus.REGISTERED))
+        assert_that(self.wrapper.events._callbacks, equal_to([]))
+
+
+class TestSessionPipeline(unittest.TestCase):
+    def setUp(self):
+        self.session = Session('alice', 'secret', 'localhost', 5060, 7078)
+        self.wrapper = self.session._linphone_wrapper = Mock()
+
+    def test_when_execute_pipeline_then_commands_executed_in_one_batch(self):
+        self.session.pipeline().call_status().send_dtmf('1').execute()
+
+        pipeline = self.wrapper.execute.call_args.args[0]
+        assert_that(pipeline.command, equal_to('call-status\ndtmf 1'))
+
+    def test_given_not_a_command_when_queued_then_attribute_error(self):
+        assert_that(
+            calling(getattr).with_args(self.session.pipeline(), 'close'),
+            raises(AttributeError),
+        )
+
+
+class TestSessionPool(unittest.TestCase):
+    def test_given_pool_when_close_then_daemon_released_to_pool(self):
+        pool = Mock()
+
+        session = Session('alice', 'secret', 'localhost', pool=pool)
+        session.close()
+
+        pool.release.assert_called_once_with(pool.lease.return_value)
+
+
+class TestSessionPorts(unittest.TestCase):
+    def test_given_no_ports_then_ports_not_allocated_before_start(self):
+        allocator = Mock()
+
+        Session('alice', 'secret', 'localhost', port_allocator=allocator)
+
+        allocator.allocate.assert_not_called()
+
+    def test_given_one_port_then_value_error(self):
+        assert_that(
+            calling(Session).with_args('alice', 'secret', 'localhost', 5060),
+            raises(ValueError),
+        )
+
+    def test_given_ports_and_allocator_then_value_error(self):
+        assert_that(
+            calling(Session).with_args(
+                'alice', 'secret', 'localhost', 5060, 7078, port_allocator=Mock()
+            ),
+            raises(ValueError),
+        )
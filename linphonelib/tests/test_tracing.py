@@ -0,0 +1,125 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    has_entries,
+    has_key,
+    less_than_or_equal_to,
+    none,
+)
+
+from ..commands import CallCommand, CallStatusCommand, HoldCommand
+from ..fake_daemon import FakeLinphoneServer
+from ..session import Session
+from ..tracing import FIRST_BYTE, HANDLED, PHASES, SEND, TOTAL, Histogram, Tracer
+
+
+class TestHistogram(unittest.TestCase):
+    def test_when_add_then_percentiles_bounded_by_bucket(self):
+        histogram = Histogram()
+        for _ in range(90):
+            histogram.add(0.000010)
+        for _ in range(10):
+            histogram.add(0.001)
+
+        assert_that(histogram.percentile(50), equal_to(0.000016))
+        assert_that(histogram.percentile(99), equal_to(0.001))
+        assert_that(
+            histogram.summary(), has_entries(count=100, min=0.000010, max=0.001)
+        )
+
+    def test_given_empty_when_percentile_then_none(self):
+        assert_that(Histogram().percentile(50), none())
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer()
+
+    def test_when_mark_then_phase_recorded_per_command_class(self):
+        trace = self.tracer.trace(CallStatusCommand())
+
+        trace.mark(SEND)
+        trace.mark(HANDLED)
+
+        assert_that(self.tracer.histogram(CallStatusCommand, SEND).count, equal_to(1))
+        assert_that(self.tracer.histogram('CallStatusCommand').count, equal_to(1))
+        assert_that(
+            self.tracer.histogram(CallStatusCommand, HANDLED).max,
+            less_than_or_equal_to(self.tracer.histogram(CallStatusCommand).max),
+        )
+
+    def test_when_mark_twice_then_first_mark_only(self):
+        trace = self.tracer.trace(CallStatusCommand())
+
+        trace.mark(FIRST_BYTE)
+        trace.mark(FIRST_BYTE)
+
+        assert_that(
+            self.tracer.histogram(CallStatusCommand, FIRST_BYTE).count, equal_to(1)
+        )
+
+    def test_given_hook_when_mark_then_hook_called(self):
+        hook = self.tracer.add_hook(Mock())
+
+        self.tracer.trace(CallStatusCommand()).mark(SEND)
+
+        name, phase, _ = hook.call_args[0]
+        assert_that((name, phase), equal_to(('CallStatusCommand', SEND)))
+
+
+class TestSessionLatencies(unittest.TestCase):
+    def _session(self, tracer=None):
+        session = Session(
+            'alice',
+            'secret',
+            'example.com',
+            5060,
+            7078,
+            persistent=True,
+            server_factory=FakeLinphoneServer,
+            tracer=tracer,
+        )
+        self.addCleanup(session.close)
+        return session
+
+    def test_given_tracer_when_command_then_every_phase_recorded(self):
+        session = self._session(Tracer())
+
+        session.call_status()
+        session.call_status()
+
+        phases = session.latencies()['CallStatusCommand']
+        assert_that(list(phases), contains_exactly(*PHASES))
+        assert_that(phases[TOTAL], has_entries(count=2))
+
+    def test_when_call_and_hold_then_recorded_as_public_commands(self):
+        tracer = Tracer()
+        session = self._session(tracer)
+
+        session.call('1001')
+        session.hold()
+
+        assert_that(tracer.histogram(CallCommand).count, equal_to(1))
+        assert_that(tracer.histogram(HoldCommand).count, equal_to(1))
+        assert_that(session.latencies(), has_key('CallCommand'))
+
+    def test_given_pipeline_when_execute_then_recorded_as_pipeline(self):
+        session = self._session(Tracer())
+
+        session.pipeline().call_status().send_dtmf('1').execute()
+
+        assert_that(session.latencies(), has_key('PipelineCommand'))
+
+    def test_given_no_tracer_when_command_then_nothing_recorded(self):
+        session = self._session()
+
+        session.call_status()
+
+        assert_that(session.latencies(), equal_to({}))
@@ -0,0 +1,166 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import math
+import threading
+import time
+
+LIVENESS = 'liveness'
+CONNECT = 'connect'
+SEND = 'send'
+FIRST_BYTE = 'first_byte'
+PARSED = 'parsed'
+HANDLED = 'handled'
+TOTAL = 'total'
+PHASES = (LIVENESS, CONNECT, SEND, FIRST_BYTE, PARSED, HANDLED, TOTAL)
+
+_BUCKETS = 32
+
+
+class Histogram:
+    """Latencies in buckets of powers of two microseconds.
+
+    Percentiles are the upper bound of the bucket they fall in, capped by the
+    largest latency seen.
+    """
+
+    def __init__(self):
+        self.buckets = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, duration):
+        _, exponent = math.frexp(duration * 1e6)
+        self.buckets[min(max(exponent, 0), _BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += duration
+        if self.min is None or duration < self.min:
+            self.min = duration
+        if self.max is None or duration > self.max:
+            self.max = duration
+
+    def percentile(self, p):
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for exponent, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(math.ldexp(1, exponent) / 1e6, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class Tracer:
+    """Collect the latency of each phase of the commands, per command class.
+
+    A phase lasts from the end of the previous phase: `send` is the time to
+    write the command, `first_byte` the wait for the daemon, `parsed` the time
+    to read and parse the rest of the response... `total` lasts from the
+    liveness check until the response is handled. Hooks are called with the
+    command class name, the phase and its duration after each phase.
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+
+    def trace(self, cmd):
+        return _Trace(self, _command_name(cmd))
+
+    def record(self, name, phase, duration):
+        with self._lock:
+            histogram = self._histograms.get((name, phase))
+            if histogram is None:
+                histogram = self._histograms[name, phase] = Histogram()
+            histogram.add(duration)
+        for hook in self._hooks:
+            hook(name, phase, duration)
+
+    def histogram(self, command, phase=TOTAL):
+        name = command if isinstance(command, str) else command.__name__
+        return self._histograms.get((name, phase))
+
+    def summary(self):
+        with self._lock:
+            histograms = list(self._histograms.items())
+        summary = {}
+        for (name, phase), histogram in histograms:
+            summary.setdefault(name, {})[phase] = histogram.summary()
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+class _Trace:
+    __slots__ = ('_tracer', '_name', '_started_at', '_last_at', '_marked')
+
+    def __init__(self, tracer, name):
+        self._tracer = tracer
+        self._name = name
+        self._started_at = self._last_at = time.perf_counter()
+        self._marked = set()
+
+    def mark(self, phase):
+        # A phase is measured once, e.g. the first of the chunks of a response
+        if phase in self._marked:
+            return
+        now = time.perf_counter()
+        self._marked.add(phase)
+        self._tracer.record(self._name, phase, now - self._last_at)
+        self._last_at = now
+        if phase == HANDLED:
+            self._tracer.record(self._name, TOTAL, now - self._started_at)
+
+
+class _NullTrace:
+    __slots__ = ()
+
+    def mark(self, phase):
+        pass
+
+
+class _NullTracer:
+    def trace(self, cmd):
+        return NULL_TRACE
+
+    def histogram(self, command, phase=TOTAL):
+        return None
+
+    def summary(self):
+        return {}
+
+
+NULL_TRACE = _NullTrace()
+NULL_TRACER = _NullTracer()
+
+
+def _command_name(cmd):
+    # Private subclasses, e.g. of a session, are recorded as their public command
+    for cls in type(cmd).__mro__:
+        if not cls.__name__.startswith('_'):
+            return cls.__name__
+    return type(cmd).__name__